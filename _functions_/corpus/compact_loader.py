@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from text_store import TextBlob, TextBlobWriter
+
+# === CONFIGURATION ===
+TEXT_COLUMNS = ("text", "summary")
+# String columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+CHUNK_SIZE = 20_000
+
+
+def optimise_dtypes(df: pd.DataFrame, category_ratio: float = CATEGORY_RATIO) -> pd.DataFrame:
+    """
+    Downcasts the columns of a DataFrame to compact dtypes.
+
+    Low-cardinality strings become categoricals, whole-number columns (also
+    floats that only hold NaN and integers, such as `year`) become the smallest
+    nullable integer type, and the remaining floats become float32.
+
+    Parameters:
+        df (pd.DataFrame): The frame to downcast (not modified).
+        category_ratio (float): Maximum distinct/total ratio for categoricals.
+
+    Returns:
+        pd.DataFrame: The downcast frame.
+    """
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == object or pd.api.types.is_string_dtype(values):
+            strings = values.dropna()
+            if len(strings) and strings.map(type).eq(str).all() \
+                    and values.nunique() <= category_ratio * len(values):
+                df[column] = values.astype("category")
+        elif pd.api.types.is_bool_dtype(values):
+            continue
+        elif pd.api.types.is_numeric_dtype(values):
+            present = values.dropna()
+            if len(present) and (present == np.floor(present)).all():
+                smallest = pd.to_numeric(present, downcast="integer").dtype
+                df[column] = values.astype(pd.api.types.pandas_dtype(smallest.name.capitalize()))
+            elif pd.api.types.is_float_dtype(values):
+                df[column] = values.astype(np.float32)
+    return df
+
+
+def _iter_frames(path: str, columns: Optional[list[str]], chunksize: int) -> Iterator[pd.DataFrame]:
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def _source_columns(path: str) -> list[str]:
+    if path.endswith(".parquet"):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def load_compact_corpus(
+    path: str = "scraped_articles_enriched_full.csv",
+    text_columns: tuple = TEXT_COLUMNS,
+    blob_dir: Optional[str] = None,
+    chunksize: int = CHUNK_SIZE,
+    report: bool = True
+) -> tuple[pd.DataFrame, dict[str, TextBlob]]:
+    """
+    Loads the corpus with compact dtypes and the long text columns kept out of the frame.
+
+    The file is streamed in chunks. Text columns are written to memory-mapped
+    blobs (`<name>.<column>.blob`, rebuilt only when the source is newer) and
+    fetched lazily by row position: `texts["text"][i]` or
+    `texts["text"].take(df.index)` for a filtered frame.
+
+    Parameters:
+        path (str): Enriched CSV or Parquet corpus.
+        text_columns (tuple): Columns moved out of the frame (default is text and summary).
+        blob_dir (str, optional): Directory for the blobs (default is next to the source).
+        chunksize (int): Rows per streamed chunk.
+        report (bool): Print the before/after memory footprint.
+
+    Returns:
+        tuple: The compact DataFrame and a dict column -> TextBlob.
+    """
+    source_columns = _source_columns(path)
+    text_columns = [c for c in text_columns if c in source_columns]
+    blob_dir = Path(blob_dir or Path(path).parent)
+    blob_paths = {c: str(blob_dir / f"{Path(path).stem}.{c}.blob") for c in text_columns}
+    stale = [c for c in text_columns if not TextBlob.is_fresh(blob_paths[c], path)]
+
+    # Text columns with a fresh blob are not read from the source at all
+    columns = [c for c in source_columns if c not in text_columns or c in stale]
+    writers = {c: TextBlobWriter(blob_paths[c]) for c in stale}
+    frames, before_bytes = [], 0
+    try:
+        for chunk in _iter_frames(path, columns, chunksize):
+            before_bytes += int(chunk.memory_usage(deep=True).sum())
+            for column, writer in writers.items():
+                writer.append(chunk[column])
+            frames.append(chunk.drop(columns=stale))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    texts = {c: TextBlob(blob_paths[c]) for c in text_columns}
+    df = optimise_dtypes(df)
+
+    if report:
+        if not stale:
+            # Text was not read this time; count it as pandas would have held it
+            before_bytes += sum(blob.nbytes() + 49 * len(blob) for blob in texts.values())
+        print(memory_report(before_bytes, df, texts))
+    return df, texts
+
+
+def memory_report(before_bytes: int, df: pd.DataFrame, texts: dict[str, TextBlob]) -> str:
+    """
+    Summarises the memory footprint of a plain load versus the compact load.
+
+    Parameters:
+        before_bytes (int): Deep memory usage of the plain pandas load.
+        df (pd.DataFrame): The compact frame.
+        texts (dict[str, TextBlob]): The lazily loaded text columns.
+
+    Returns:
+        str: A small table, per column and in total.
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    offsets = sum(blob.offsets.nbytes for blob in texts.values())
+    after_bytes = int(usage.sum()) + offsets
+
+    lines = [f"{'column':<24}{'dtype':>12}{'MB':>10}"]
+    for column, size in usage.items():
+        lines.append(f"{column:<24}{str(df[column].dtype):>12}{size / 1e6:>10.2f}")
+    for column, blob in texts.items():
+        lines.append(f"{column:<24}{'mmap':>12}{blob.offsets.nbytes / 1e6:>10.2f}"
+                     f"  (+{blob.nbytes() / 1e6:.1f} MB on disk)")
+    lines.append(f"Memory: {before_bytes / 1e6:.1f} MB -> {after_bytes / 1e6:.1f} MB "
+                 f"({before_bytes / max(after_bytes, 1):.1f}x smaller)")
+    return "\n".join(lines)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+from ast import literal_eval
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# === SCHEMA ===
+# Columns stored as native list<string> instead of stringified Python/JSON lists
+LIST_COLUMNS = ["loanwords", "all_loanwords", "top_loanwords",
+                "refined_loanwords", "excluded_loanwords"]
+# Low-cardinality strings stored dictionary-encoded (read back as pandas categoricals)
+DICTIONARY_COLUMNS = ["source_site", "domain", "sentiment", "topic", "tone"]
+COLUMN_TYPES = {
+    "article_id": pa.int64(),
+    "url": pa.string(),
+    "date": pa.string(),
+    "year": pa.int16(),
+    "text": pa.string(),
+    "headline": pa.string(),
+    "summary": pa.string(),
+    # LLM enrichment columns are empty for articles not enriched yet
+    "loanwords_usage": pa.string(),
+    "loanword_context": pa.string(),
+    "marketing_loanwords": pa.string(),
+    "country_influence": pa.string(),
+    "word_count": pa.int32(),
+    "paragraphs": pa.int16(),
+    "boilerplate_paragraphs": pa.int16(),
+    "links": pa.int16(),
+    "loanword_count": pa.int32(),
+    "loanword_density": pa.float32(),
+}
+ROW_GROUP_SIZE = 10_000
+
+
+def parse_list_cell(value) -> Optional[list[str]]:
+    """
+    Parses one stringified list cell from a CSV into a Python list.
+
+    The scraper writes Python reprs (`['a', 'b']`) and the loanword cleaning
+    writes JSON (`["a", "b"]`); both are accepted. Lists (and the NumPy arrays
+    pyarrow returns for list columns) pass through as lists.
+
+    Parameters:
+        value: The raw cell value.
+
+    Returns:
+        list[str] or None: The parsed list, or None for missing values.
+    """
+    if isinstance(value, list):
+        return value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return literal_eval(value)
+
+
+def corpus_schema(df: pd.DataFrame) -> pa.Schema:
+    """
+    Builds the Arrow schema for the columns of a corpus DataFrame.
+
+    Parameters:
+        df (pd.DataFrame): Corpus rows; only used to infer the types of unknown columns.
+
+    Returns:
+        pa.Schema: Known columns get their typed/dictionary/list type, unknown ones
+        keep the type Arrow infers for them. Unknown columns that are entirely
+        empty (inferred as null or float NaN) become strings, since a partially
+        filled column is text far more often than numbers.
+    """
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = []
+    for column in df.columns:
+        if column in LIST_COLUMNS:
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        elif column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        elif column in COLUMN_TYPES:
+            fields.append(pa.field(column, COLUMN_TYPES[column]))
+        elif df[column].isna().all():
+            fields.append(pa.field(column, pa.string()))
+        else:
+            fields.append(inferred.field(column))
+    return pa.schema(fields)
+
+
+def to_arrow_table(df: pd.DataFrame, schema: Optional[pa.Schema] = None) -> pa.Table:
+    """
+    Converts a corpus DataFrame into an Arrow table with the corpus schema.
+
+    Stringified list columns are parsed on the way in, so they only ever have to
+    be parsed once, at conversion time.
+
+    Parameters:
+        df (pd.DataFrame): Corpus rows (e.g. a chunk of the enriched CSV).
+        schema (pa.Schema, optional): Schema to conform to, e.g. the one of the
+            first chunk, so all chunks of a file share one schema.
+
+    Returns:
+        pa.Table: The typed table.
+    """
+    df = df.copy()
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(parse_list_cell)
+    for column in DICTIONARY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("string")
+    if "year" in df.columns:
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int16")
+
+    if schema is None:
+        schema = corpus_schema(df)
+    else:
+        df = df[schema.names]
+        # Columns that happen to be all-empty in this chunk are read as float NaN
+        for field in schema:
+            if df[field.name].isna().all():
+                df[field.name] = pd.Series([None] * len(df), dtype=object, index=df.index)
+            elif pa.types.is_string(field.type) and not pd.api.types.is_object_dtype(df[field.name]):
+                # e.g. a text column holding only numbers in this chunk
+                df[field.name] = df[field.name].astype("string")
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_corpus(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes a corpus DataFrame to Parquet with the typed corpus schema.
+
+    Parameters:
+        df (pd.DataFrame): The corpus.
+        path (str): Output Parquet file.
+    """
+    pq.write_table(to_arrow_table(df), path, row_group_size=ROW_GROUP_SIZE,
+                   compression="zstd")
+
+
+def convert_csv_to_parquet(
+    csv_path: str = "scraped_articles_enriched_full.csv",
+    parquet_path: Optional[str] = None,
+    chunksize: int = 20_000
+) -> str:
+    """
+    Converts a scraped/enriched CSV to a typed Parquet corpus, chunk by chunk.
+
+    Memory stays bounded by `chunksize` rows, so the full 90k-article CSV never
+    has to be held in RAM as Python objects.
+
+    Parameters:
+        csv_path (str): The CSV to convert.
+        parquet_path (str, optional): Output path (default: same name with .parquet).
+        chunksize (int): Rows per CSV chunk (and roughly per Parquet row group).
+
+    Returns:
+        str: Path of the written Parquet file.
+    """
+    parquet_path = parquet_path or str(Path(csv_path).with_suffix(".parquet"))
+    writer = None
+
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            table = to_arrow_table(chunk, schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, table.schema, compression="zstd")
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    print(f"✅ Converted {csv_path} -> {parquet_path}")
+    return parquet_path
+
+
+def read_corpus(
+    path: str = "scraped_articles_enriched_full.parquet",
+    columns: Optional[list[str]] = None,
+    filters: Optional[list] = None
+) -> pd.DataFrame:
+    """
+    Reads a Parquet corpus, loading only the requested columns.
+
+    Column projection means that e.g. `columns=["year", "loanword_density"]`
+    never reads the article text from disk. List columns come back as NumPy
+    arrays of strings (one per cell) and dictionary columns as pandas
+    categoricals, with no per-row parsing.
+
+    Parameters:
+        path (str): The Parquet corpus.
+        columns (list[str], optional): Columns to load (default is all).
+        filters (list, optional): Row filters in pyarrow form, e.g. `[("year", ">=", 2016)]`.
+
+    Returns:
+        pd.DataFrame: The requested slice of the corpus.
+    """
+    table = pq.read_table(path, columns=columns, filters=filters)
+    return table.to_pandas()
+
+
+def corpus_columns(path: str) -> list[str]:
+    """
+    Lists the columns stored in a Parquet corpus without reading any data.
+    """
+    return pq.read_schema(path).names
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+from glob import glob
+from typing import Optional
+
+import duckdb
+import pandas as pd
+
+# === CONFIGURATION ===
+# View name -> dataset file (CSV, Parquet or a glob such as "scraped_articles_*.csv")
+DATASETS = {
+    "articles": "scraped_articles_enriched_full.parquet",
+    "sentiment": "scraped_articles_enriched.csv",
+    "llm_enrichment": "llm_enrich_checkpoint.csv",
+    "loanwords_clean": "loanwords_progress.csv",
+}
+JOIN_KEY = "article_id"
+CORPUS_VIEW = "corpus"
+
+
+def _quote(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+def columnar_copy(path: str) -> str:
+    """
+    Returns a Parquet copy of a CSV dataset, (re)writing it when the CSV is newer.
+
+    The copy is written by DuckDB itself, so the CSV is never loaded into pandas.
+    Parquet paths and globs are returned unchanged.
+
+    Parameters:
+        path (str): The CSV file.
+
+    Returns:
+        str: Path of the Parquet copy (same name with .parquet).
+    """
+    if not path.endswith(".csv") or any(c in path for c in "*?["):
+        return path
+
+    parquet_path = path[:-len(".csv")] + ".parquet"
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(path):
+        duckdb.execute(
+            f"COPY (SELECT * FROM read_csv_auto({_quote(path)}, header = true)) "
+            f"TO {_quote(parquet_path)} (FORMAT parquet, COMPRESSION zstd)")
+    return parquet_path
+
+
+def _scan_sql(path: str) -> str:
+    if path.endswith(".parquet"):
+        return f"read_parquet({_quote(path)}, union_by_name = true)"
+    return f"read_csv_auto({_quote(path)}, header = true, union_by_name = true)"
+
+
+def _latest_sql(path: str) -> str:
+    """
+    Scan of a dataset keeping only the last row per article ID.
+
+    Checkpoints are appended to, so an article re-processed later appears again
+    further down the file; as in `merge_on_id(keep="last")`, the last row wins.
+    Parquet rows are ordered by file name and row number, CSV rows by their
+    position in the scan (DuckDB preserves insertion order).
+    """
+    if path.endswith(".parquet"):
+        rows = (f"SELECT * FROM read_parquet({_quote(path)}, union_by_name = true, "
+                f"filename = '__file', file_row_number = true)")
+        order, drop = "__file DESC, file_row_number DESC", "__file, file_row_number"
+    else:
+        rows = f"SELECT *, row_number() OVER () AS __row FROM {_scan_sql(path)}"
+        order, drop = "__row DESC", "__row"
+    return (f'SELECT * EXCLUDE ({drop}) FROM ({rows}) '
+            f'QUALIFY row_number() OVER (PARTITION BY "{JOIN_KEY}" ORDER BY {order}) = 1')
+
+
+def connect(
+    datasets: Optional[dict[str, str]] = None,
+    columnar: bool = True,
+    database: str = ":memory:"
+) -> duckdb.DuckDBPyConnection:
+    """
+    Opens an in-process DuckDB with one view per dataset and a joined `corpus` view.
+
+    Views are lazy: nothing is read until a query runs, and DuckDB pushes column
+    selection and WHERE filters through the views (and the joins) into the
+    Parquet scans, so questions about a subset only read that subset.
+
+    The `corpus` view starts from the first dataset and left-joins the others
+    on `article_id`, adding only the columns the earlier views do not have.
+    The joined datasets are append-only checkpoints, so only their last row
+    per article is joined (see `_latest_sql`); filters on those columns are
+    applied after the de-duplication. Datasets whose files do not exist are skipped.
+
+    Parameters:
+        datasets (dict[str, str], optional): View name -> path (default is `DATASETS`).
+        columnar (bool): Query Parquet copies of the CSVs (see `columnar_copy`).
+        database (str): DuckDB database file (default is in-memory).
+
+    Returns:
+        duckdb.DuckDBPyConnection: The connection with the views registered.
+    """
+    datasets = datasets or DATASETS
+    con = duckdb.connect(database)
+
+    registered, paths = [], {}
+    for name, path in datasets.items():
+        if not glob(path):
+            continue
+        if columnar:
+            path = columnar_copy(path)
+        con.execute(f'CREATE OR REPLACE VIEW "{name}" AS SELECT * FROM {_scan_sql(path)}')
+        registered.append(name)
+        paths[name] = path
+
+    if registered:
+        base = registered[0]
+        seen = set(view_columns(con, base))
+        select = [f'"{base}".*']
+        joins = []
+        for name in registered[1:]:
+            columns = view_columns(con, name)
+            if JOIN_KEY not in columns:
+                continue
+            extra = [c for c in columns if c not in seen]
+            if not extra:
+                continue
+            seen.update(extra)
+            select += [f'"{name}"."{c}"' for c in extra]
+            joins.append(f'LEFT JOIN ({_latest_sql(paths[name])}) AS "{name}" USING ("{JOIN_KEY}")')
+        con.execute(f'CREATE OR REPLACE VIEW "{CORPUS_VIEW}" AS '
+                    f'SELECT {", ".join(select)} FROM "{base}" {" ".join(joins)}')
+
+    return con
+
+
+def view_columns(con: duckdb.DuckDBPyConnection, view: str) -> list[str]:
+    """
+    Lists the columns of a view without reading any rows.
+    """
+    return [row[0] for row in con.execute(f'DESCRIBE "{view}"').fetchall()]
+
+
+def _where(filters: dict) -> tuple[str, list]:
+    """
+    Builds a parameterised WHERE clause from column filters.
+
+    Each filter is `column=value`, `column=[values]` or `column=(start, end)`
+    (inclusive range), as in `DocTermMatrix.mask` and `slice_rollups`.
+    """
+    clauses, params = [], []
+    for column, value in filters.items():
+        if isinstance(value, tuple):
+            clauses.append(f'"{column}" BETWEEN ? AND ?')
+            params += [value[0], value[1]]
+        elif isinstance(value, list):
+            clauses.append(f'"{column}" IN ({", ".join("?" * len(value))})')
+            params += value
+        else:
+            clauses.append(f'"{column}" = ?')
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def query(con: duckdb.DuckDBPyConnection, sql: str, params: Optional[list] = None) -> pd.DataFrame:
+    """
+    Runs an SQL query against the registered views and returns a DataFrame.
+    """
+    return con.execute(sql, params or []).df()
+
+
+def density_by(
+    con: duckdb.DuckDBPyConnection,
+    by="year",
+    view: str = CORPUS_VIEW,
+    **filters
+) -> pd.DataFrame:
+    """
+    Mean loanword density per group with count, std, SEM and 95% CI.
+
+    Parameters:
+        con (duckdb.DuckDBPyConnection): Connection from `connect`.
+        by (str or list[str]): Grouping column(s) (default is "year").
+        view (str): View to query (default is the joined corpus).
+        **filters: Column filters, e.g. `year=(2016, 2023)`, `sentiment="negative"`.
+
+    Returns:
+        pd.DataFrame: One row per group, sorted by the group columns.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keys = ", ".join(f'"{b}"' for b in by)
+    where, params = _where(filters)
+    not_null = " AND ".join(f'"{b}" IS NOT NULL' for b in by)
+    where = f"{where} AND {not_null}" if where else f" WHERE {not_null}"
+
+    return query(con, f"""
+        SELECT {keys},
+               avg(loanword_density) AS mean,
+               count(loanword_density) AS count,
+               stddev_samp(loanword_density) AS std,
+               stddev_samp(loanword_density) / sqrt(count(loanword_density)) AS sem,
+               avg(loanword_density) - 1.96 * stddev_samp(loanword_density) / sqrt(count(loanword_density)) AS ci95_low,
+               avg(loanword_density) + 1.96 * stddev_samp(loanword_density) / sqrt(count(loanword_density)) AS ci95_high
+        FROM "{view}"{where}
+        GROUP BY {keys}
+        ORDER BY {keys}
+    """, params)
+
+
+def density_by_year(con: duckdb.DuckDBPyConnection, **filters) -> pd.DataFrame:
+    """
+    Mean loanword density per year (the data behind the confidence-band slide).
+    """
+    return density_by(con, "year", **filters)
+
+
+def sentiment_pivot(
+    con: duckdb.DuckDBPyConnection,
+    by: str = "year",
+    view: str = CORPUS_VIEW,
+    **filters
+) -> pd.DataFrame:
+    """
+    Mean loanword density per group, one column per sentiment label.
+
+    Parameters:
+        con (duckdb.DuckDBPyConnection): Connection from `connect`.
+        by (str): Row grouping column (default is "year").
+        view (str): View to query (default is the joined corpus).
+        **filters: Column filters, see `density_by`.
+
+    Returns:
+        pd.DataFrame: Same layout as `loanword_density_by_sentiment_breakdown.csv`.
+    """
+    where, params = _where(filters)
+    labels = [row[0] for row in con.execute(
+        f'SELECT DISTINCT sentiment FROM "{view}"{where} ORDER BY 1', params).fetchall()
+        if row[0] is not None]
+    columns = ", ".join(
+        f"avg(loanword_density) FILTER (WHERE sentiment = ?) AS \"{label}\"" for label in labels)
+
+    where = f'{where} AND "{by}" IS NOT NULL' if where else f' WHERE "{by}" IS NOT NULL'
+    return query(con, f"""
+        SELECT "{by}"{", " + columns if columns else ""}
+        FROM "{view}"{where}
+        GROUP BY "{by}"
+        ORDER BY "{by}"
+    """, labels + params)
+
+
+def _list_sql(con: duckdb.DuckDBPyConnection, view: str, column: str) -> str:
+    """
+    Returns an SQL expression for a loanword list column as a VARCHAR list.
+
+    Parquet corpora store native lists; CSVs hold Python reprs or JSON strings,
+    whose quoted items are extracted with a regular expression.
+    """
+    types = dict(con.execute(f'SELECT column_name, column_type FROM (DESCRIBE "{view}")').fetchall())
+    if types.get(column, "").endswith("[]"):
+        return f'"{column}"'
+    return f"""regexp_extract_all("{column}", '[''"]([^''"]+)[''"]', 1)"""
+
+
+def top_loanwords(
+    con: duckdb.DuckDBPyConnection,
+    k: int = 20,
+    column: str = "loanwords",
+    view: str = CORPUS_VIEW,
+    **filters
+) -> pd.DataFrame:
+    """
+    Most frequent loanwords in (a slice of) the corpus, via UNNEST.
+
+    Parameters:
+        con (duckdb.DuckDBPyConnection): Connection from `connect`.
+        k (int): Number of loanwords to return.
+        column (str): List column to count, e.g. "refined_loanwords" (default is "loanwords").
+        view (str): View to query (default is the joined corpus).
+        **filters: Column filters, see `density_by`.
+
+    Returns:
+        pd.DataFrame: Columns `loanword` and `frequency`, as in `top_loanwords.csv`.
+    """
+    where, params = _where(filters)
+    return query(con, f"""
+        SELECT loanword, count(*) AS frequency
+        FROM (SELECT unnest({_list_sql(con, view, column)}) AS loanword FROM "{view}"{where})
+        GROUP BY loanword
+        ORDER BY frequency DESC, loanword
+        LIMIT ?
+    """, params + [k])
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from loanword_index import explode_terms
+from rollups import combine_rollups, compute_rollups, slice_rollups
+
+# === CONFIGURATION ===
+OUTPUT_DIR = "flourish_data"
+DENSITY_COLUMN = "loanword_density"
+# Same bins as the "bins10" histogram in flourish_data.ipynb
+HISTOGRAM_EDGES = np.linspace(-0.05, 1.05, 11)
+TOP_K = 20
+BATCH_SIZE = 50_000
+COLUMNS = ["year", "topic", "sentiment", "source_site", DENSITY_COLUMN,
+           "loanword_count", "word_count", "loanwords"]
+
+
+def iter_corpus_batches(corpus_path: str, columns: list[str], batch_size: int = BATCH_SIZE) -> Iterator:
+    """
+    Streams the needed columns of the corpus in batches.
+
+    Parquet corpora are read as Arrow record batches with column projection (list
+    columns stay Arrow lists); CSVs are read in pandas chunks with `usecols`.
+
+    Parameters:
+        corpus_path (str): Parquet corpus or enriched CSV.
+        columns (list[str]): Columns to read (missing ones are skipped).
+        batch_size (int): Rows per batch.
+
+    Yields:
+        pa.RecordBatch or pd.DataFrame: One batch of rows.
+    """
+    if corpus_path.endswith(".parquet"):
+        parquet = pq.ParquetFile(corpus_path)
+        available = [c for c in columns if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=available):
+            yield batch
+    else:
+        header = pd.read_csv(corpus_path, nrows=0).columns
+        available = [c for c in columns if c in header]
+        for chunk in pd.read_csv(corpus_path, usecols=available, chunksize=batch_size):
+            yield chunk
+
+
+def compute_slide_aggregates(
+    corpus_path: str = "scraped_articles_enriched_full.parquet",
+    top_k: int = TOP_K,
+    batch_size: int = BATCH_SIZE
+) -> dict[str, pd.DataFrame]:
+    """
+    Computes every Flourish slide dataset in a single pass over the corpus.
+
+    Each batch updates additive accumulators (the density rollups, histogram
+    bin counts and loanword counts); the slide statistics are sliced from the
+    rollups at the end.
+
+    Parameters:
+        corpus_path (str): Parquet corpus (preferred) or enriched CSV.
+        top_k (int): Number of loanwords for the top-loanwords slide.
+        batch_size (int): Rows per streamed batch.
+
+    Returns:
+        dict[str, pd.DataFrame]: Output file name -> slide dataset.
+    """
+    rollups = None
+    bin_counts = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+    word_counts = Counter()
+
+    for batch in iter_corpus_batches(corpus_path, COLUMNS, batch_size):
+        if isinstance(batch, pa.RecordBatch):
+            if "loanwords" in batch.schema.names:
+                counts = pc.value_counts(pc.list_flatten(batch.column("loanwords")))
+                word_counts.update(dict(zip(counts.field("values").to_pylist(),
+                                            counts.field("counts").to_pylist())))
+            df = batch.select([c for c in batch.schema.names if c != "loanwords"]).to_pandas()
+        else:
+            if "loanwords" in batch.columns:
+                _, terms = explode_terms(batch["loanwords"])
+                word_counts.update(terms)
+            df = batch.drop(columns=["loanwords"], errors="ignore")
+
+        df = df[df[DENSITY_COLUMN].notna()]
+        density = df[DENSITY_COLUMN].to_numpy(dtype=np.float64)
+
+        # Right-closed bins with the lowest edge included, as pd.cut(include_lowest=True)
+        bins = np.searchsorted(HISTOGRAM_EDGES, density, side="left") - 1
+        bins[density == HISTOGRAM_EDGES[0]] = 0
+        valid = (bins >= 0) & (bins < len(bin_counts))
+        bin_counts += np.bincount(bins[valid], minlength=len(bin_counts))
+
+        rollups = combine_rollups(rollups, compute_rollups(df))
+
+    outputs = {}
+
+    year_stats = slice_rollups(rollups, "year")
+    year_stats["year"] = year_stats["year"].astype(int)
+    outputs["loanword_density_by_year.csv"] = year_stats[["year", "mean"]].rename(
+        columns={"mean": DENSITY_COLUMN})
+    outputs["loanword_density_confidence_flourish.csv"] = year_stats.rename(columns={
+        "year": "Year",
+        "mean": "Avg Loanword Density",
+        "count": "Article Count",
+        "ci95_low": "CI Lower",
+        "ci95_high": "CI Upper",
+    })[["Year", "Avg Loanword Density", "Article Count", "std", "sem", "CI Lower", "CI Upper"]]
+
+    labels = [f"{HISTOGRAM_EDGES[i]:.2f} - {HISTOGRAM_EDGES[i+1]:.2f}"
+              for i in range(len(HISTOGRAM_EDGES) - 1)]
+    outputs["loanword_density_histogram_bins10.csv"] = pd.DataFrame({
+        "Loanword Density Range": labels,
+        "Article Count": bin_counts,
+    })
+
+    for key in ("topic", "sentiment"):
+        stats = slice_rollups(rollups, key)
+        if not stats.empty:
+            outputs[f"loanword_density_by_{key}.csv"] = stats[[key, "mean"]] \
+                .rename(columns={"mean": DENSITY_COLUMN})
+    breakdown = slice_rollups(rollups, ["year", "sentiment"])
+    if not breakdown.empty:
+        pivot = breakdown.set_index(["year", "sentiment"])["mean"].unstack("sentiment").reset_index()
+        pivot["year"] = pivot["year"].astype(int)
+        pivot.columns.name = None
+        outputs["loanword_density_by_sentiment_breakdown.csv"] = pivot.sort_values("year")
+
+    outputs["top_loanwords.csv"] = pd.DataFrame(
+        word_counts.most_common(top_k), columns=["loanword", "frequency"])
+
+    return outputs
+
+
+def write_if_changed(df: pd.DataFrame, path: str) -> bool:
+    """
+    Writes a DataFrame to CSV only if the file content would change.
+
+    Keeps file timestamps stable, so Flourish uploads and git diffs only show
+    datasets that actually moved.
+
+    Parameters:
+        df (pd.DataFrame): The dataset.
+        path (str): Output CSV path.
+
+    Returns:
+        bool: True if the file was (re)written.
+    """
+    content = df.to_csv(index=False)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8", newline="") as f:
+            if f.read() == content:
+                return False
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    return True
+
+
+def export_flourish_datasets(
+    corpus_path: str = "scraped_articles_enriched_full.parquet",
+    output_dir: str = OUTPUT_DIR,
+    top_k: int = TOP_K
+) -> list[str]:
+    """
+    Refreshes all Flourish slide CSVs from the corpus in one pass.
+
+    Parameters:
+        corpus_path (str): Parquet corpus (preferred) or enriched CSV.
+        output_dir (str): Directory for the slide CSVs (default is "flourish_data").
+        top_k (int): Number of loanwords for the top-loanwords slide.
+
+    Returns:
+        list[str]: Paths of the files that changed.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    outputs = compute_slide_aggregates(corpus_path, top_k=top_k)
+
+    changed = []
+    for name, df in outputs.items():
+        path = os.path.join(output_dir, name)
+        if write_if_changed(df, path):
+            changed.append(path)
+
+    print(f"✅ Flourish export: {len(changed)} of {len(outputs)} datasets changed")
+    for path in changed:
+        print(f"   updated {path}")
+    return changed
+
+
+if __name__ == "__main__":
+    export_flourish_datasets()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+from itertools import chain
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from corpus_store import corpus_columns, parse_list_cell, read_corpus
+
+MISSING = -1
+
+
+def explode_terms(lists: pd.Series) -> tuple[np.ndarray, list[str]]:
+    """
+    Flattens a column of term lists into parallel (document position, term) arrays.
+
+    Stringified lists (as read from the CSVs) are parsed; missing cells count as
+    empty lists.
+
+    Parameters:
+        lists (pd.Series): One list of terms per document.
+
+    Returns:
+        tuple: Array of document positions (0..len(lists)-1) and the flat list of terms.
+    """
+    parsed = [parse_list_cell(v) or [] for v in lists]
+    lengths = np.fromiter((len(v) for v in parsed), dtype=np.int64, count=len(parsed))
+    doc_positions = np.repeat(np.arange(len(parsed), dtype=np.int64), lengths)
+    return doc_positions, list(chain.from_iterable(parsed))
+
+
+def _encode_categories(values: pd.Series, categories: list[str]) -> np.ndarray:
+    """
+    Maps values to integer codes against a growing category list (missing -> -1).
+    """
+    lookup = {c: i for i, c in enumerate(categories)}
+    codes = np.full(len(values), MISSING, dtype=np.int16)
+    for i, value in enumerate(values):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        value = str(value)
+        if value not in lookup:
+            lookup[value] = len(categories)
+            categories.append(value)
+        codes[i] = lookup[value]
+    return codes
+
+
+class LoanwordIndex:
+    """
+    Inverted index from loanword to the articles using it.
+
+    Postings are stored CSR-style: for term t, `post_docs[term_offsets[t]:term_offsets[t+1]]`
+    holds the sorted document positions and `post_counts` the number of times the
+    term occurs in each. Side arrays (`years`, `topics`, `sentiments`) are indexed
+    by document position, so filtered queries are vectorised mask operations.
+    """
+
+    def __init__(self):
+        self.vocab = []
+        self.term_lookup = {}
+        self.article_ids = np.array([], dtype=np.int64)
+        self.years = np.array([], dtype=np.int16)
+        self.topics = np.array([], dtype=np.int16)
+        self.sentiments = np.array([], dtype=np.int16)
+        self.topic_categories = []
+        self.sentiment_categories = []
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.post_docs = np.array([], dtype=np.int32)
+        self.post_counts = np.array([], dtype=np.int32)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.article_ids)
+
+    # === BUILDING ===
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        column: Optional[str] = None,
+        id_column: str = "article_id"
+    ) -> "LoanwordIndex":
+        """
+        Builds an index from a corpus DataFrame.
+
+        Parameters:
+            df (pd.DataFrame): Articles with an id column, a loanword list column and
+                optionally `year`, `topic` and `sentiment`.
+            column (str, optional): List column to index (default is "refined_loanwords"
+                if present, else "loanwords").
+            id_column (str): Column holding the article id.
+
+        Returns:
+            LoanwordIndex: The built index.
+        """
+        index = cls()
+        index.append(df, column=column, id_column=id_column)
+        return index
+
+    def append(
+        self,
+        df: pd.DataFrame,
+        column: Optional[str] = None,
+        id_column: str = "article_id"
+    ) -> int:
+        """
+        Adds newly scraped articles to the index.
+
+        Articles whose id is already indexed are skipped. New documents get
+        positions after all existing ones, so merged postings stay sorted with a
+        single stable sort by term.
+
+        Parameters:
+            df (pd.DataFrame): New articles (same columns as for `from_frame`).
+            column (str, optional): List column to index.
+            id_column (str): Column holding the article id.
+
+        Returns:
+            int: Number of articles added.
+        """
+        column = column or ("refined_loanwords" if "refined_loanwords" in df.columns else "loanwords")
+
+        ids = df[id_column].to_numpy(dtype=np.int64)
+        is_new = ~np.isin(ids, self.article_ids)
+        _, first = np.unique(ids, return_index=True)
+        is_first = np.zeros(len(ids), dtype=bool)
+        is_first[first] = True
+        df = df[is_new & is_first]
+        if df.empty:
+            return 0
+
+        base = self.n_docs
+        doc_positions, terms = explode_terms(df[column])
+
+        # Encode terms against the (growing) vocabulary
+        term_codes = np.empty(len(terms), dtype=np.int64)
+        for i, term in enumerate(terms):
+            code = self.term_lookup.get(term)
+            if code is None:
+                code = len(self.vocab)
+                self.term_lookup[term] = code
+                self.vocab.append(term)
+            term_codes[i] = code
+
+        # Count occurrences per (term, doc); unique keys come out sorted by term, then doc
+        n_new = len(df)
+        keys = term_codes * n_new + doc_positions
+        keys, counts = np.unique(keys, return_counts=True)
+        new_terms = keys // n_new
+        new_docs = (keys % n_new + base).astype(np.int32)
+
+        old_terms = np.repeat(np.arange(len(self.term_offsets) - 1), np.diff(self.term_offsets))
+        all_terms = np.concatenate([old_terms, new_terms])
+        all_docs = np.concatenate([self.post_docs, new_docs])
+        all_counts = np.concatenate([self.post_counts, counts.astype(np.int32)])
+
+        order = np.argsort(all_terms, kind="stable")
+        self.post_docs = all_docs[order]
+        self.post_counts = all_counts[order]
+        self.term_offsets = np.concatenate([
+            [0], np.cumsum(np.bincount(all_terms, minlength=len(self.vocab)))
+        ]).astype(np.int64)
+
+        years = pd.to_numeric(df["year"], errors="coerce") if "year" in df.columns \
+            else pd.Series(np.nan, index=df.index)
+        self.article_ids = np.concatenate([self.article_ids, df[id_column].to_numpy(dtype=np.int64)])
+        self.years = np.concatenate([self.years, years.fillna(MISSING).to_numpy(dtype=np.int16)])
+        self.topics = np.concatenate([self.topics, _encode_categories(
+            df["topic"] if "topic" in df.columns else pd.Series([None] * n_new),
+            self.topic_categories)])
+        self.sentiments = np.concatenate([self.sentiments, _encode_categories(
+            df["sentiment"] if "sentiment" in df.columns else pd.Series([None] * n_new),
+            self.sentiment_categories)])
+
+        return n_new
+
+    # === PERSISTENCE ===
+
+    def save(self, path: str = "loanword_index.npz") -> None:
+        """
+        Saves the index as a compressed .npz file.
+
+        Document positions are delta-encoded within each posting list, which makes
+        them small integers that compress well.
+
+        Parameters:
+            path (str): Output file.
+        """
+        starts = self.term_offsets[:-1]
+        deltas = np.diff(self.post_docs, prepend=0).astype(np.int64)
+        nonempty = starts[starts < len(deltas)]
+        deltas[nonempty] = self.post_docs[nonempty]
+
+        max_count = int(self.post_counts.max()) if len(self.post_counts) else 0
+        count_dtype = np.uint16 if max_count < 2 ** 16 else np.uint32
+
+        np.savez_compressed(
+            path,
+            vocab=np.array(self.vocab, dtype=str),
+            article_ids=self.article_ids,
+            years=self.years,
+            topics=self.topics,
+            sentiments=self.sentiments,
+            topic_categories=np.array(self.topic_categories, dtype=str),
+            sentiment_categories=np.array(self.sentiment_categories, dtype=str),
+            term_offsets=self.term_offsets,
+            doc_deltas=deltas.astype(np.uint32),
+            post_counts=self.post_counts.astype(count_dtype),
+        )
+
+    @classmethod
+    def load(cls, path: str = "loanword_index.npz") -> "LoanwordIndex":
+        """
+        Loads an index saved with `save`.
+
+        Parameters:
+            path (str): The .npz file.
+
+        Returns:
+            LoanwordIndex: The loaded index.
+        """
+        data = np.load(path)
+        index = cls()
+        index.vocab = data["vocab"].tolist()
+        index.term_lookup = {t: i for i, t in enumerate(index.vocab)}
+        index.article_ids = data["article_ids"]
+        index.years = data["years"]
+        index.topics = data["topics"]
+        index.sentiments = data["sentiments"]
+        index.topic_categories = data["topic_categories"].tolist()
+        index.sentiment_categories = data["sentiment_categories"].tolist()
+        index.term_offsets = data["term_offsets"]
+        index.post_counts = data["post_counts"].astype(np.int32)
+
+        # Undo the per-term delta encoding with one cumulative sum
+        deltas = data["doc_deltas"].astype(np.int64)
+        running = np.cumsum(deltas)
+        lengths = np.diff(index.term_offsets)
+        starts = index.term_offsets[:-1][lengths > 0]
+        base = running[starts] - deltas[starts]
+        index.post_docs = (running - np.repeat(base, lengths[lengths > 0])).astype(np.int32)
+        return index
+
+    # === QUERIES ===
+
+    def doc_mask(
+        self,
+        year: Union[int, tuple, list, None] = None,
+        topic: Optional[str] = None,
+        sentiment: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Builds a boolean mask over documents for the given filters.
+
+        Parameters:
+            year: A single year, an inclusive (start, end) tuple, or a list of years.
+            topic (str, optional): Topic label to keep.
+            sentiment (str, optional): Sentiment label to keep.
+
+        Returns:
+            np.ndarray or None: The mask, or None when no filter is set.
+        """
+        if year is None and topic is None and sentiment is None:
+            return None
+
+        mask = np.ones(self.n_docs, dtype=bool)
+        if isinstance(year, tuple):
+            mask &= (self.years >= year[0]) & (self.years <= year[1])
+        elif isinstance(year, list):
+            mask &= np.isin(self.years, year)
+        elif year is not None:
+            mask &= self.years == year
+        if topic is not None:
+            code = self.topic_categories.index(topic) if topic in self.topic_categories else -2
+            mask &= self.topics == code
+        if sentiment is not None:
+            code = self.sentiment_categories.index(sentiment) if sentiment in self.sentiment_categories else -2
+            mask &= self.sentiments == code
+        return mask
+
+    def postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the document positions and counts for one loanword.
+        """
+        code = self.term_lookup.get(term)
+        if code is None:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.int32)
+        start, end = self.term_offsets[code], self.term_offsets[code + 1]
+        return self.post_docs[start:end], self.post_counts[start:end]
+
+    def _filtered_postings(self, term: str, **filters) -> tuple[np.ndarray, np.ndarray]:
+        docs, counts = self.postings(term)
+        mask = self.doc_mask(**filters)
+        if mask is None:
+            return docs, counts
+        keep = mask[docs]
+        return docs[keep], counts[keep]
+
+    def articles_with(self, term: str, **filters) -> np.ndarray:
+        """
+        Returns the ids of the articles that use a loanword (optionally filtered).
+        """
+        docs, _ = self._filtered_postings(term, **filters)
+        return self.article_ids[docs]
+
+    def document_frequency(self, term: str, **filters) -> int:
+        """
+        Returns the number of articles that use a loanword (optionally filtered).
+        """
+        docs, _ = self._filtered_postings(term, **filters)
+        return len(docs)
+
+    def term_frequency(self, term: str, **filters) -> int:
+        """
+        Returns the total number of occurrences of a loanword (optionally filtered).
+        """
+        _, counts = self._filtered_postings(term, **filters)
+        return int(counts.sum())
+
+    def term_frequency_by_year(self, term: str, **filters) -> pd.Series:
+        """
+        Returns the occurrences of a loanword per year.
+
+        Parameters:
+            term (str): The loanword.
+            **filters: `topic` and/or `sentiment` filters (see `doc_mask`).
+
+        Returns:
+            pd.Series: Occurrence counts indexed by year (articles without a year are dropped).
+        """
+        docs, counts = self._filtered_postings(term, **filters)
+        years = self.years[docs]
+        known = years != MISSING
+        series = pd.Series(counts[known]).groupby(years[known]).sum()
+        series.index.name = "year"
+        return series.rename(term)
+
+    def top_k(self, k: int = 20, by: str = "frequency", **filters) -> pd.DataFrame:
+        """
+        Returns the most common loanwords, optionally within a slice of the corpus.
+
+        Parameters:
+            k (int): Number of loanwords to return.
+            by (str): "frequency" (total occurrences) or "documents" (article count).
+            **filters: `year`, `topic` and/or `sentiment` filters (see `doc_mask`).
+
+        Returns:
+            pd.DataFrame: Columns `loanword` and `frequency`, most common first.
+        """
+        posting_terms = np.repeat(np.arange(len(self.vocab)), np.diff(self.term_offsets))
+        weights = self.post_counts if by == "frequency" else np.ones_like(self.post_counts)
+
+        mask = self.doc_mask(**filters)
+        if mask is not None:
+            keep = mask[self.post_docs]
+            posting_terms, weights = posting_terms[keep], weights[keep]
+
+        totals = np.bincount(posting_terms, weights=weights, minlength=len(self.vocab))
+        k = min(k, int((totals > 0).sum()))
+        top = np.argpartition(-totals, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        top = top[np.argsort(-totals[top], kind="stable")]
+
+        return pd.DataFrame({
+            "loanword": [self.vocab[i] for i in top],
+            "frequency": totals[top].astype(np.int64),
+        })
+
+
+def build_loanword_index(
+    corpus_path: str = "scraped_articles_enriched_full.parquet",
+    index_path: str = "loanword_index.npz",
+    column: Optional[str] = None
+) -> LoanwordIndex:
+    """
+    Builds (or extends) the persistent loanword index from a corpus file.
+
+    If `index_path` already exists, only articles not yet in the index are added.
+
+    Parameters:
+        corpus_path (str): Parquet corpus or CSV with the loanword list column.
+        index_path (str): Where the index is stored.
+        column (str, optional): List column to index (see `LoanwordIndex.append`).
+
+    Returns:
+        LoanwordIndex: The up-to-date index.
+    """
+    wanted = ["article_id", "year", "topic", "sentiment", "loanwords", "refined_loanwords"]
+    if corpus_path.endswith(".parquet"):
+        available = corpus_columns(corpus_path)
+        df = read_corpus(corpus_path, columns=[c for c in wanted if c in available])
+    else:
+        df = pd.read_csv(corpus_path, usecols=lambda c: c in wanted)
+
+    if os.path.exists(index_path):
+        index = LoanwordIndex.load(index_path)
+        added = index.append(df, column=column)
+    else:
+        index = LoanwordIndex.from_frame(df, column=column)
+        added = index.n_docs
+
+    index.save(index_path)
+    print(f"✅ Loanword index: {added} new articles, {index.n_docs} total, {len(index.vocab)} loanwords")
+    return index
+
+
+if __name__ == "__main__":
+    build_loanword_index()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# === CONFIGURATION ===
+ROLLUP_PATH = "loanword_density_rollups.parquet"
+ROLLUP_KEYS = ["year", "topic", "sentiment", "source_site"]
+# Additive statistics kept per group; "sum"/"sumsq" are of loanword_density
+ROLLUP_STATS = ["count", "sum", "sumsq", "loanword_count", "word_count"]
+DENSITY_COLUMN = "loanword_density"
+# Stand-ins for missing keys, so groups with unknown year/topic/... still add up
+MISSING_YEAR = -1
+MISSING_LABEL = "unknown"
+# Per-article entries stored next to the rollups, so updates replace an article
+ARTICLE_COLUMNS = ["article_id"] + ROLLUP_KEYS + [DENSITY_COLUMN, "loanword_count", "word_count"]
+LEDGER_SCHEMA = pa.schema([
+    ("article_id", pa.int64()), ("year", pa.float64()), ("topic", pa.string()), ("sentiment", pa.string()),
+    ("source_site", pa.string()), (DENSITY_COLUMN, pa.float64()), ("loanword_count", pa.float64()),
+    ("word_count", pa.float64()), ("version", pa.int64()),
+])
+
+
+def _rollup_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extracts the normalised rollup key columns from corpus rows.
+    """
+    keys = pd.DataFrame(index=df.index)
+    year = pd.to_numeric(df["year"], errors="coerce") if "year" in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    keys["year"] = year.fillna(MISSING_YEAR).astype(np.int64)
+    for key in ROLLUP_KEYS[1:]:
+        if key in df.columns:
+            keys[key] = df[key].astype(object).where(df[key].notna(), MISSING_LABEL).astype(str)
+        else:
+            keys[key] = MISSING_LABEL
+    return keys
+
+
+def compute_rollups(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the additive rollup table for a set of corpus rows.
+
+    Parameters:
+        df (pd.DataFrame): Articles with `loanword_density` and any of `year`, `topic`,
+            `sentiment`, `source_site`, `loanword_count`, `word_count`.
+
+    Returns:
+        pd.DataFrame: One row per (year, topic, sentiment, source_site) with count,
+        sum and sum of squares of the density, and total loanword and word counts.
+    """
+    rows = df[df[DENSITY_COLUMN].notna()]
+    density = rows[DENSITY_COLUMN].astype(np.float64)
+
+    values = _rollup_keys(rows)
+    values["count"] = 1
+    values["sum"] = density
+    values["sumsq"] = density ** 2
+    for column in ("loanword_count", "word_count"):
+        values[column] = pd.to_numeric(rows[column], errors="coerce").fillna(0) \
+            if column in rows.columns else 0
+
+    return values.groupby(ROLLUP_KEYS, sort=True)[ROLLUP_STATS].sum().reset_index()
+
+
+def article_entries(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The per-article ledger entries: article_id and the raw key, density and
+    count values (missing columns as nulls, so an entry may be partial).
+    """
+    entries = pd.DataFrame({"article_id": df["article_id"].astype(np.int64).to_numpy()})
+    for column in ARTICLE_COLUMNS[1:]:
+        if column not in df.columns:
+            entries[column] = None
+        elif column in ("topic", "sentiment", "source_site"):
+            entries[column] = [str(v) if pd.notna(v) else None for v in df[column]]
+        else:
+            entries[column] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    return entries
+
+
+def combine_rollups(*parts: Optional[pd.DataFrame], sign: Optional[list[int]] = None) -> pd.DataFrame:
+    """
+    Adds (or subtracts) rollup tables group by group.
+
+    Parameters:
+        *parts: Rollup tables (None entries are ignored).
+        sign (list[int], optional): +1 or -1 per part (default all +1).
+
+    Returns:
+        pd.DataFrame: The combined rollup table, without groups whose count dropped to 0.
+
+    Raises:
+        ValueError: A group's count became negative (rows subtracted that were never added).
+    """
+    sign = sign or [1] * len(parts)
+    frames = []
+    for part, s in zip(parts, sign):
+        if part is None or part.empty:
+            continue
+        part = part.copy()
+        part[ROLLUP_STATS] = part[ROLLUP_STATS] * s
+        frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_KEYS + ROLLUP_STATS)
+
+    combined = pd.concat(frames, ignore_index=True) \
+        .groupby(ROLLUP_KEYS, sort=True)[ROLLUP_STATS].sum().reset_index()
+    negative = combined[combined["count"] < 0]
+    if len(negative):
+        raise ValueError(f"Rollup groups with negative counts: {negative[ROLLUP_KEYS].to_dict('records')}")
+    return combined[combined["count"] > 0].reset_index(drop=True)
+
+
+def load_rollups(path: str = ROLLUP_PATH) -> Optional[pd.DataFrame]:
+    """
+    Loads the materialised rollups, or None if they have not been built yet.
+    """
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_rollups(rollups: pd.DataFrame, path: str = ROLLUP_PATH) -> None:
+    """
+    Saves the rollup table (a few hundred rows) as Parquet.
+    """
+    rollups.to_parquet(path, index=False)
+
+
+def articles_path(path: str = ROLLUP_PATH) -> str:
+    """
+    Directory of the per-article ledger of the rollups at `path`.
+    """
+    return f"{os.path.splitext(path)[0]}.articles"
+
+
+def _append_entries(entries: pd.DataFrame, path: str) -> None:
+    """
+    Appends ledger entries as a new part; the newest part wins per article.
+    """
+    version = time.time_ns()
+    table = pa.Table.from_pandas(entries.assign(version=version), schema=LEDGER_SCHEMA, preserve_index=False)
+    directory = articles_path(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f".{version}.tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, os.path.join(directory, f"{version}.parquet"))
+
+
+def _read_entries(path: str, article_ids) -> pd.DataFrame:
+    """
+    The latest ledger entry of each of `article_ids`, indexed by article_id.
+
+    The filter is pushed into the Parquet scan, so only row groups that can
+    hold the IDs are read, not the whole ledger.
+    """
+    ids = [int(i) for i in article_ids]
+    table = ds.dataset(articles_path(path), format="parquet", schema=LEDGER_SCHEMA) \
+        .to_table(filter=ds.field("article_id").isin(ids))
+    entries = table.to_pandas().sort_values("version", kind="stable")
+    return entries.drop_duplicates(subset="article_id", keep="last").drop(columns="version") \
+        .set_index("article_id")
+
+
+def build_rollups(df: pd.DataFrame, path: str = ROLLUP_PATH) -> pd.DataFrame:
+    """
+    Builds the rollups from the full corpus once and saves them, together
+    with the per-article ledger `update_rollups` needs (replacing any
+    previous ledger, which also compacts it).
+
+    Parameters:
+        df (pd.DataFrame): The corpus (article_id, key, density and count columns are needed).
+        path (str): Where to store the rollups.
+
+    Returns:
+        pd.DataFrame: The rollup table.
+    """
+    entries = article_entries(df.drop_duplicates(subset="article_id", keep="last"))
+    rollups = compute_rollups(entries)
+    shutil.rmtree(articles_path(path), ignore_errors=True)
+    _append_entries(entries.sort_values("article_id"), path)
+    save_rollups(rollups, path)
+    return rollups
+
+
+def update_rollups(
+    added: Optional[pd.DataFrame] = None,
+    removed: Optional[pd.DataFrame] = None,
+    path: str = ROLLUP_PATH
+) -> Optional[pd.DataFrame]:
+    """
+    Applies an incremental change to the stored rollups.
+
+    The rollups keep each article's entry keyed by article_id, so the update
+    is idempotent: `added` rows are merged into the stored entry of their
+    article (values they do not carry, e.g. the topic when only sentiment
+    changed, keep their stored value), and the old contribution is
+    subtracted from the group it was actually counted in. An article only
+    counts once its density is known; until then its entry is kept as a
+    partial one, so a topic labelled before the density is computed is not
+    lost. `removed` articles are dropped.
+
+    Entries are appended to the ledger as a delta part and only the entries
+    of the changed articles are read, so the cost is O(changed rows + groups
+    + ledger parts); `build_rollups` compacts the ledger. Nothing happens if
+    the rollups have not been built yet.
+
+    Parameters:
+        added (pd.DataFrame, optional): New or changed rows, with article_id.
+        removed (pd.DataFrame, optional): Rows (only article_id is used) to drop.
+        path (str): Location of the stored rollups.
+
+    Returns:
+        pd.DataFrame or None: The updated rollups, or None if none are stored.
+
+    Raises:
+        ValueError: No article_id column, or rollups stored without a ledger.
+    """
+    rollups = load_rollups(path)
+    if rollups is None:
+        return None
+    if not os.path.isdir(articles_path(path)):
+        raise ValueError(f"{path} has no per-article ledger; rebuild it with build_rollups")
+    for frame in (added, removed):
+        if frame is not None and "article_id" not in frame.columns:
+            raise ValueError("update_rollups needs an article_id column")
+
+    ids = [frame["article_id"] for frame in (added, removed) if frame is not None]
+    if not ids:
+        return rollups
+    stored = _read_entries(path, pd.concat(ids).unique())
+
+    new = []
+    if added is not None:
+        added = article_entries(added.drop_duplicates(subset="article_id", keep="last")).set_index("article_id")
+        previous = stored.reindex(added.index)
+        new.append(added.astype(object).combine_first(previous.astype(object)).reset_index())
+    if removed is not None:
+        gone = pd.Index(removed["article_id"].astype(np.int64).unique())
+        gone = gone.difference(added.index) if added is not None else gone
+        new.append(article_entries(pd.DataFrame({"article_id": gone})))
+    new = pd.concat(new, ignore_index=True)[ARTICLE_COLUMNS]
+
+    rollups = combine_rollups(rollups, compute_rollups(new), compute_rollups(stored.reset_index()), sign=[1, 1, -1])
+    _append_entries(new, path)
+    save_rollups(rollups, path)
+    return rollups
+
+
+def moments_to_stats(acc: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turns accumulated density moments into mean, count, sample std, SEM and 95% CI.
+
+    Parameters:
+        acc (pd.DataFrame): Columns `count`, `sum` and `sumsq`, indexed by group.
+
+    Returns:
+        pd.DataFrame: Columns mean, count, std, sem, ci95_low and ci95_high, sorted by group.
+    """
+    acc = acc.sort_index()
+    stats = pd.DataFrame(index=acc.index)
+    n = acc["count"]
+    stats["mean"] = acc["sum"] / n
+    stats["count"] = n.astype(np.int64)
+    variance = (acc["sumsq"] - acc["sum"] ** 2 / n) / (n - 1)
+    stats["std"] = np.sqrt(variance.clip(lower=0)).where(n > 1)
+    stats["sem"] = stats["std"] / np.sqrt(n)
+    stats["ci95_low"] = stats["mean"] - 1.96 * stats["sem"]
+    stats["ci95_high"] = stats["mean"] + 1.96 * stats["sem"]
+    return stats
+
+
+def slice_rollups(
+    rollups: pd.DataFrame,
+    by,
+    include_missing: bool = False,
+    **filters
+) -> pd.DataFrame:
+    """
+    Answers a grouped density question from the rollups in O(groups).
+
+    Equivalent to `df[filters].groupby(by)["loanword_density"].agg(["mean", "count", "std"])`
+    plus SEM, 95% CI and the pooled loanword density (total loanwords / total words).
+
+    Parameters:
+        rollups (pd.DataFrame): The rollup table.
+        by (str or list[str]): Key column(s) to group by.
+        include_missing (bool): Keep groups whose `by` key is missing (pandas drops them).
+        **filters: Key filters: `key=value`, `key=[values]` or `key=(start, end)`.
+
+    Returns:
+        pd.DataFrame: One row per group with mean, count, std, sem, ci95_low,
+        ci95_high and pooled_density.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    rows = rollups
+
+    for key, value in filters.items():
+        if isinstance(value, tuple):
+            rows = rows[(rows[key] >= value[0]) & (rows[key] <= value[1])]
+        elif isinstance(value, list):
+            rows = rows[rows[key].isin(value)]
+        else:
+            rows = rows[rows[key] == value]
+
+    if not include_missing:
+        for key in by:
+            rows = rows[rows[key] != (MISSING_YEAR if key == "year" else MISSING_LABEL)]
+
+    acc = rows.groupby(by, sort=True)[ROLLUP_STATS].sum()
+    stats = moments_to_stats(acc)
+    stats["pooled_density"] = acc["loanword_count"] / acc["word_count"].where(acc["word_count"] > 0)
+    return stats.reset_index()
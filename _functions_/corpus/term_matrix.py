@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from loanword_index import explode_terms
+
+
+class DocTermMatrix:
+    """
+    Sparse document x loanword count matrix with a stable vocabulary.
+
+    Rows follow the order of the DataFrame the matrix was built from, columns
+    follow `vocab`. Group-wise statistics are computed as products of a sparse
+    group-indicator matrix with `counts`, so slicing by year, topic or sentiment
+    never loops over articles in Python.
+    """
+
+    def __init__(self, counts: sparse.csr_matrix, vocab: list[str], docs: pd.DataFrame):
+        self.counts = counts
+        self.vocab = vocab
+        self.docs = docs.reset_index(drop=True)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        column: str = "loanwords",
+        keep_columns: tuple = ("article_id", "year", "topic", "sentiment", "source_site"),
+        vocab: Optional[list[str]] = None
+    ) -> "DocTermMatrix":
+        """
+        Builds the CSR count matrix from a column of loanword lists.
+
+        Parameters:
+            df (pd.DataFrame): The corpus.
+            column (str): The list column to count (default is "loanwords").
+            keep_columns (tuple): Document attributes kept alongside the matrix for slicing.
+            vocab (list[str], optional): Fixed vocabulary (e.g. from an earlier build);
+                terms outside it are ignored. Default builds a sorted vocabulary.
+
+        Returns:
+            DocTermMatrix: The built matrix.
+        """
+        doc_positions, terms = explode_terms(df[column])
+        terms = np.asarray(terms, dtype=object)
+
+        if vocab is None:
+            vocab_array, term_codes = np.unique(terms.astype(str), return_inverse=True) \
+                if len(terms) else (np.array([], dtype=str), np.array([], dtype=np.int64))
+            vocab = vocab_array.tolist()
+        else:
+            lookup = {t: i for i, t in enumerate(vocab)}
+            term_codes = np.fromiter((lookup.get(t, -1) for t in terms),
+                                     dtype=np.int64, count=len(terms))
+            known = term_codes >= 0
+            doc_positions, term_codes = doc_positions[known], term_codes[known]
+
+        counts = sparse.csr_matrix(
+            (np.ones(len(term_codes), dtype=np.int32), (doc_positions, term_codes)),
+            shape=(len(df), len(vocab)),
+        )
+        counts.sum_duplicates()
+
+        docs = df[[c for c in keep_columns if c in df.columns]]
+        return cls(counts, vocab, docs)
+
+    # === SLICING ===
+
+    def mask(self, **filters) -> np.ndarray:
+        """
+        Builds a boolean row mask from column filters.
+
+        Each filter is `column=value`, `column=[values]` or `column=(start, end)`
+        (inclusive range), e.g. `mask(year=(2016, 2023), sentiment="negative")`.
+        """
+        keep = np.ones(self.counts.shape[0], dtype=bool)
+        for column, value in filters.items():
+            values = self.docs[column]
+            if isinstance(value, tuple):
+                keep &= ((values >= value[0]) & (values <= value[1])).fillna(False).to_numpy(dtype=bool)
+            elif isinstance(value, list):
+                keep &= values.isin(value).to_numpy(dtype=bool)
+            else:
+                keep &= (values == value).fillna(False).to_numpy(dtype=bool)
+        return keep
+
+    def group_indicator(self, by: str, mask: Optional[np.ndarray] = None) -> tuple[sparse.csr_matrix, pd.Index]:
+        """
+        Builds the sparse (groups x documents) indicator matrix for a column.
+
+        Parameters:
+            by (str): Document column to group by.
+            mask (np.ndarray, optional): Restrict the groups to these documents.
+
+        Returns:
+            tuple: The indicator matrix and the group labels (its row index).
+        """
+        codes, labels = pd.factorize(self.docs[by], sort=True)
+        keep = codes >= 0
+        if mask is not None:
+            keep &= mask
+        rows = codes[keep]
+        cols = np.flatnonzero(keep)
+        indicator = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(labels), self.counts.shape[0]),
+        )
+        return indicator, pd.Index(labels, name=by)
+
+    # === ANALYTICS ===
+
+    def term_totals(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns total occurrences per loanword, optionally over a row mask.
+        """
+        counts = self.counts if mask is None else self.counts[mask]
+        return np.asarray(counts.sum(axis=0)).ravel()
+
+    def top_loanwords(self, k: int = 20, **filters) -> pd.DataFrame:
+        """
+        Returns the k most frequent loanwords in a slice of the corpus.
+
+        Parameters:
+            k (int): Number of loanwords to return.
+            **filters: Column filters, see `mask`.
+
+        Returns:
+            pd.DataFrame: Columns `loanword` and `frequency`, as in the Flourish `top_loanwords.csv`.
+        """
+        totals = self.term_totals(self.mask(**filters) if filters else None)
+        k = min(k, int((totals > 0).sum()))
+        if k == 0:
+            return pd.DataFrame({"loanword": [], "frequency": []})
+        top = np.argpartition(-totals, k - 1)[:k]
+        top = top[np.argsort(-totals[top], kind="stable")]
+        return pd.DataFrame({
+            "loanword": [self.vocab[i] for i in top],
+            "frequency": totals[top],
+        })
+
+    def grouped_counts(self, by: str, **filters) -> pd.DataFrame:
+        """
+        Returns a (groups x loanwords) count table as one sparse product.
+
+        Parameters:
+            by (str): Document column to group by (e.g. "year").
+            **filters: Column filters, see `mask`.
+
+        Returns:
+            pd.DataFrame: Sparse-backed counts, one row per group, one column per loanword.
+        """
+        indicator, labels = self.group_indicator(by, self.mask(**filters) if filters else None)
+        grouped = (indicator @ self.counts).tocsr()
+        return pd.DataFrame.sparse.from_spmatrix(grouped, index=labels, columns=self.vocab)
+
+    def grouped_top_k(self, by: str, k: int = 10, **filters) -> pd.DataFrame:
+        """
+        Returns the top-k loanwords within every group.
+
+        Parameters:
+            by (str): Document column to group by.
+            k (int): Loanwords per group.
+            **filters: Column filters, see `mask`.
+
+        Returns:
+            pd.DataFrame: Columns `<by>`, `rank`, `loanword` and `frequency`.
+        """
+        indicator, labels = self.group_indicator(by, self.mask(**filters) if filters else None)
+        grouped = (indicator @ self.counts).tocsr()
+
+        rows = []
+        for g, label in enumerate(labels):
+            start, end = grouped.indptr[g], grouped.indptr[g + 1]
+            cols, values = grouped.indices[start:end], grouped.data[start:end]
+            order = np.argsort(-values, kind="stable")[:k]
+            for rank, i in enumerate(order, start=1):
+                rows.append((label, rank, self.vocab[cols[i]], int(values[i])))
+
+        return pd.DataFrame(rows, columns=[by, "rank", "loanword", "frequency"])
+
+    def term_trends(self, terms: list[str], by: str = "year", normalise: bool = True, **filters) -> pd.DataFrame:
+        """
+        Returns per-group frequencies of selected loanwords (e.g. per year).
+
+        Parameters:
+            terms (list[str]): Loanwords to track (unknown ones are ignored).
+            by (str): Document column to group by (default is "year").
+            normalise (bool): Divide by the number of articles in each group.
+            **filters: Column filters, see `mask`.
+
+        Returns:
+            pd.DataFrame: One row per group, one column per loanword.
+        """
+        lookup = {t: i for i, t in enumerate(self.vocab)}
+        terms = [t for t in terms if t in lookup]
+        cols = [lookup[t] for t in terms]
+
+        indicator, labels = self.group_indicator(by, self.mask(**filters) if filters else None)
+        grouped = (indicator @ self.counts[:, cols]).toarray().astype(np.float64)
+        if normalise:
+            n_docs = np.asarray(indicator.sum(axis=1)).ravel()
+            grouped = grouped / np.maximum(n_docs, 1)[:, None]
+
+        return pd.DataFrame(grouped, index=labels, columns=terms)
+
+    def tfidf(self, sublinear_tf: bool = True) -> sparse.csr_matrix:
+        """
+        Returns the TF-IDF weighted matrix (smooth idf, L2-normalised rows).
+
+        Parameters:
+            sublinear_tf (bool): Use 1 + log(tf) instead of raw counts.
+
+        Returns:
+            sparse.csr_matrix: Same shape as `counts`, float32.
+        """
+        n_docs = self.counts.shape[0]
+        df = np.bincount(self.counts.indices, minlength=self.counts.shape[1])
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+        weighted = self.counts.astype(np.float32)
+        if sublinear_tf:
+            weighted.data = 1 + np.log(weighted.data)
+        weighted = weighted @ sparse.diags(idf)
+
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        return sparse.diags(1 / np.maximum(norms, 1e-12)).astype(np.float32) @ weighted
+
+    # === PERSISTENCE ===
+
+    def save(self, path: str = "doc_term_matrix") -> None:
+        """
+        Saves the matrix (`<path>.npz`), vocabulary and document attributes (`<path>.parquet`).
+        """
+        sparse.save_npz(f"{path}.npz", self.counts)
+        np.save(f"{path}.vocab.npy", np.array(self.vocab, dtype=str))
+        self.docs.to_parquet(f"{path}.parquet", index=False)
+
+    @classmethod
+    def load(cls, path: str = "doc_term_matrix") -> "DocTermMatrix":
+        """
+        Loads a matrix saved with `save`.
+        """
+        counts = sparse.load_npz(f"{path}.npz").tocsr()
+        vocab = np.load(f"{path}.vocab.npy").tolist()
+        docs = pd.read_parquet(f"{path}.parquet")
+        return cls(counts, vocab, docs)
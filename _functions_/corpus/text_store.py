@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+class TextBlobWriter:
+    """
+    Appends texts to a UTF-8 blob file plus an int64 offset array.
+
+    Text i occupies bytes `offsets[i]:offsets[i + 1]` of `<path>`; the offsets
+    are saved to `<path>.offsets.npy` when the writer is closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._offsets = [0]
+
+    def append(self, texts: Iterable) -> None:
+        """
+        Appends texts in order; missing values are stored as empty strings.
+        """
+        position = self._offsets[-1]
+        for text in texts:
+            if not isinstance(text, str):
+                text = "" if text is None or pd.isna(text) else str(text)
+            data = text.encode("utf-8")
+            self._file.write(data)
+            position += len(data)
+            self._offsets.append(position)
+
+    def close(self) -> None:
+        self._file.close()
+        np.save(f"{self.path}.offsets.npy", np.asarray(self._offsets, dtype=np.int64))
+
+    def __enter__(self) -> "TextBlobWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TextBlob:
+    """
+    Read-only, memory-mapped view of a blob written by `TextBlobWriter`.
+
+    Only the offset array is held in memory; texts are decoded from the mapped
+    pages on access, so the OS page cache decides what stays resident.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets = np.load(f"{path}.offsets.npy")
+        self._data = np.memmap(path, dtype=np.uint8, mode="r") \
+            if os.path.getsize(path) else np.empty(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self._data[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, positions) -> list[str]:
+        """
+        Returns the texts at the given row positions (e.g. `df.index` of a filtered frame).
+        """
+        return [self[i] for i in positions]
+
+    def nbytes(self) -> int:
+        """
+        Size of the text data on disk.
+        """
+        return int(self.offsets[-1])
+
+    @staticmethod
+    def is_fresh(path: str, source: str) -> bool:
+        """
+        True if the blob at `path` exists and is newer than `source`.
+        """
+        offsets = f"{path}.offsets.npy"
+        return os.path.exists(path) and os.path.exists(offsets) \
+            and os.path.getmtime(offsets) >= os.path.getmtime(source)
+
+
+class _LazyTexts:
+    """
+    Sequence of texts for a list of row positions, decoded only when indexed.
+
+    Slicing returns plain lists, so batch loops (`texts[i:i + batch_size]`)
+    decode one batch at a time.
+    """
+
+    def __init__(self, blob: TextBlob, positions: np.ndarray):
+        self._blob = blob
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._blob.take(self._positions[i])
+        return self._blob[self._positions[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        for position in self._positions:
+            yield self._blob[position]
+
+
+class TextStore(TextBlob):
+    """
+    Memory-mapped article texts keyed by `article_id`.
+
+    Files: `<path>` (UTF-8 texts back to back), `<path>.offsets.npy` (int64
+    offsets) and `<path>.ids.npy` (int64 article IDs, in the same order).
+
+    Pickling a store only pickles its path: worker processes re-open the
+    mapping and share the same pages through the OS cache instead of
+    receiving copies of the texts.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.ids = np.load(f"{path}.ids.npy")
+        self._order = np.argsort(self.ids, kind="stable")
+        self._sorted_ids = self.ids[self._order]
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"])
+
+    def positions(self, article_ids) -> np.ndarray:
+        """
+        Maps article IDs to row positions in the blob.
+
+        Raises:
+            KeyError: If an ID is not in the store.
+        """
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        found = np.searchsorted(self._sorted_ids, article_ids)
+        known = found < len(self._sorted_ids)
+        known[known] = self._sorted_ids[found[known]] == article_ids[known]
+        if not known.all():
+            raise KeyError(f"Article IDs not in text store: {article_ids[~known][:5].tolist()}")
+        return self._order[found]
+
+    def __contains__(self, article_id) -> bool:
+        i = np.searchsorted(self._sorted_ids, article_id)
+        return i < len(self._sorted_ids) and self._sorted_ids[i] == article_id
+
+    def get(self, article_id) -> str:
+        """
+        Returns the text of one article.
+        """
+        return self[int(self.positions([article_id])[0])]
+
+    def view(self, article_id) -> memoryview:
+        """
+        Returns the raw UTF-8 bytes of one article without copying or decoding.
+        """
+        i = int(self.positions([article_id])[0])
+        return memoryview(self._data[self.offsets[i]:self.offsets[i + 1]])
+
+    def texts_for(self, article_ids) -> _LazyTexts:
+        """
+        Returns a lazy sequence of the texts of `article_ids`, in that order.
+        """
+        return _LazyTexts(self, self.positions(article_ids))
+
+    def iter_texts(self) -> Iterator[tuple[int, str]]:
+        """
+        Yields (article_id, text) in storage order.
+        """
+        for i in range(len(self)):
+            yield int(self.ids[i]), self[i]
+
+
+def build_text_store(
+    source: str,
+    path: Optional[str] = None,
+    id_column: str = "article_id",
+    text_column: str = "text",
+    chunksize: int = 20_000
+) -> TextStore:
+    """
+    Packs the texts of a CSV or Parquet dataset into a `TextStore`, chunk by chunk.
+
+    Parameters:
+        source (str): The dataset with `article_id` and `text` columns.
+        path (str, optional): Store path (default is `<source stem>.<text_column>.store`).
+        id_column (str): Article ID column.
+        text_column (str): Column to pack.
+        chunksize (int): Rows per streamed chunk.
+
+    Returns:
+        TextStore: The opened store.
+    """
+    path = path or default_store_path(source, text_column)
+    ids = []
+    with TextBlobWriter(path) as writer:
+        if source.endswith(".parquet"):
+            chunks = (batch.to_pandas() for batch in pq.ParquetFile(source).iter_batches(
+                batch_size=chunksize, columns=[id_column, text_column]))
+        else:
+            chunks = pd.read_csv(source, usecols=[id_column, text_column], chunksize=chunksize)
+        for chunk in chunks:
+            ids.append(chunk[id_column].to_numpy(dtype=np.int64))
+            writer.append(chunk[text_column])
+
+    np.save(f"{path}.ids.npy", np.concatenate(ids) if ids else np.empty(0, dtype=np.int64))
+    return TextStore(path)
+
+
+def default_store_path(source: str, text_column: str = "text") -> str:
+    return str(Path(source).with_suffix("")) + f".{text_column}.store"
+
+
+def open_text_store(source: str, path: Optional[str] = None, text_column: str = "text") -> TextStore:
+    """
+    Opens the text store of a dataset, (re)building it if the dataset is newer.
+    """
+    path = path or default_store_path(source, text_column)
+    if TextStore.is_fresh(path, source) and os.path.exists(f"{path}.ids.npy"):
+        return TextStore(path)
+    return build_text_store(source, path, text_column=text_column)
+
+
+if __name__ == "__main__":
+    import sys
+
+    store = build_text_store(sys.argv[1] if len(sys.argv) > 1 else "scraped_articles_enriched_full.csv")
+    print(f"✅ Packed {len(store)} texts ({store.nbytes() / 1e6:.1f} MB) into {store.path}")
@@ -6,22 +6,26 @@ from bs4 import BeautifulSoup
 import time
 import random
 import re
-import spacy
-from langdetect import detect
-from collections import Counter
 import pandas as pd
-from urllib.parse import urlparse
 import json
-from langdetect.lang_detect_exception import LangDetectException
-from transformers import pipeline
 from typing import Optional
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraping"))
+from scrape_timing import article_timer, phase
+from boilerplate import BoilerplateDetector
+from url_canon import URLCanonicaliser
+from quality_gate import ArticleRejected, check_article
+from scraping_pipeline import extract_article
+# The NLP steps (and the spaCy and sentiment models) `scraping_pipeline` loaded, so they are in memory once
+from scraping_helpers import make_doc, detect_loanwords, analyse_sentiment
+import site_profiles
 
 headers = {
     "User-Agent": "Mozilla/5.0"
 }
-sentiment_model = pipeline("sentiment-analysis", model="oliverguhr/german-sentiment-bert")
-non_article_pages = ["/video/,", ".jpg", ".jpeg",
-                     ".png", ".gif", "/bilder/", "/photo/"]
 
 def get_sitemap_urls(index_url: str) -> list[str]:
     """
@@ -64,9 +68,10 @@ def is_valid_article_url(url: str) -> bool:
     """
     Check if a given URL is a valid article link.
 
-    A valid article URL is defined as one that:
-    - Ends with "html"
-    - Does not contain any of the substrings listed in `non_article_pages`
+    The rule comes from the site's profile in `scraping/site_profiles.py`, the
+    same one the packaged scraper uses (for Business Insider: ends with "html",
+    no video, gallery or live ticker pages). URLs of sites without a profile
+    are rejected unless `site_profiles.ALLOW_UNKNOWN_SITES` is set.
 
     Parameters:
         url (str): The URL to validate.
@@ -74,10 +79,7 @@ def is_valid_article_url(url: str) -> bool:
     Returns:
         bool: True if the URL is considered a valid article URL, False otherwise.
     """
-    return (
-        url.endswith("html")
-        and not any(x in url for x in non_article_pages)
-    )
+    return site_profiles.is_valid_article_url(url)
 
 def extract_meta_data(soup: BeautifulSoup) -> Optional[str]:
     """
@@ -171,133 +173,78 @@ def extract_headline(soup: BeautifulSoup) -> Optional[str]:
 
     return None
 
-def detect_loanwords(text: str) -> list[str]:
-    """
-    Detects potential English loanwords in a given text.
-
-    This function tokenizes the input text using a spaCy NLP pipeline,
-    filters out stop words and non-alphabetic tokens, and checks if
-    each remaining word is likely to be English using a language detection
-    library. Only words with 4 or more alphabetic characters are considered.
-
-    Parameters:
-        text (str): The input text to analyze.
-
-    Returns:
-        list of str: A list of lowercase English words that are likely
-        loanwords in the context of the input text.
-    """
-    nlp = spacy.load("de_core_news_sm")
-
-    doc = nlp(text)
-    loanwords = []
-    for token in doc:
-        if token.is_alpha and not token.is_stop:
-            word = token.text
-            if re.match(r"^[A-Za-z]{4,}$", word):
-                try:
-                    if detect(word) == "en":
-                        loanwords.append(word.lower())
-                except LangDetectException:
-                    continue
-    return loanwords
-
-def analyse_sentiment(text: str) -> Optional[str]:
-    """
-    Analyses the sentiment of the given text using a preloaded sentiment model.
-
-    This function takes the first 516 characters of the input text, performs sentiment
-    analysis using the `sentiment_model`, and returns the predicted sentiment label
-    in lowercase (e.g., 'positive', 'negative', 'neutral').
-
-    Parameters:
-        text (str): The input text to analyze.
-
-    Returns:
-        str: The sentiment label in lowercase. Returns "unknown" if analysis fails.
-    """
-    try:
-        result = sentiment_model(text[:516])[0]
-        return result["label"].lower
-    except (KeyError, IndexError, TypeError) as e:
-        print(f"Sentiment analysis error: {e}")
-        return "unknown"
-
-def scrape_article_full(url: str) -> Optional[dict]:
+def scrape_article_full(
+    url: str,
+    detector: Optional[BoilerplateDetector] = None,
+    canonicaliser: Optional[URLCanonicaliser] = None,
+    raise_errors: bool = False
+) -> Optional[dict]:
     """
     Scrapes an article from the given URL and extracts metadata, text content,
     loanword analysis, and sentiment.
 
     This function performs the following:
-    - Downloads the article content
-    - Parses HTML to extract paragraphs
-    - Extracts publication date (from metadata, JSON-LD, or URL)
+    - Downloads the article and extracts its paragraphs (with the site
+      profile's selector), drops paragraphs repeated across the site (see
+      `boilerplate.py`) and extracts the publication date (from the profile's
+      date sources), all via `scraping_pipeline.extract_article`
+    - Skips articles that fail the quality gate (see `quality_gate.py`)
     - Calculates word count, loanword stats, and sentiment
     - Returns all information in a dictionary
 
+    With timing enabled (`scrape_timing.enable_timing`), each phase (fetch,
+    decode, parse, extract, nlp, sentiment) is timed per article.
+
     Parameters:
         url (str): The URL of the article to scrape.
+        detector (BoilerplateDetector, optional): Boilerplate detector (default: the process-wide one).
+        canonicaliser (URLCanonicaliser, optional): URL canonicaliser (default: the process-wide one).
+        raise_errors (bool): Re-raise network errors instead of returning None.
 
     Returns:
         dict or None: A dictionary containing article data and analysis results.
         Returns None if scraping or parsing fails.
+
+    Raises:
+        ArticleRejected: The article failed the quality gate (not worth retrying).
     """
     if not is_valid_article_url(url=url):
         print(f"Skipping non-article URL: {url}")
         return None
 
-    try:
-        res = requests.get(url, headers=headers, timeout=10)
-
-        if "text/html" not in res.headers.get("Content-Type", ""):
-            print(f"Non-HTML content for {url}")
-            return None
-
-        res.encoding = res.apparent_encoding
-        soup = BeautifulSoup(res.text, "html5lib")
-        paragraphs = soup.find_all("p")
-
-        if len(paragraphs) < 5:
-            print(f"Too few paragraphs at {url}")
-            return None
-
-        text = " ".join(p.get_text() for p in paragraphs).strip()
-        if not text:
-            print(f"No text extracted from {url}")
-            return None
-
-        text = " ".join(p.get_text() for p in paragraphs)
-        date = extract_meta_data(soup=soup) or extract_jsonld_date(soup=soup) or extract_year_from_url(url=url)
-        year = date.split("-")[0] if date else None
-        domain = urlparse(url).netloc
-        source_site = domain.replace("www.", "")
-        headline = extract_headline(soup=soup)
-        word_count = len(text.split())
-        loanwords = detect_loanwords(text)
-        loanword_count = len(loanwords)
-        loanword_density = loanword_count / word_count if word_count else 0
-        sentiment = analyse_sentiment(text)
-        top_loanwords = [w for w, _ in Counter(loanwords).most_common(3)]
-        all_loanwords = list(set(loanwords))
-
-        return {
-            "url": url,
-            "source_site": source_site,
-            "domain": domain.split(".")[0],
-            "date": date,
-            "year": int(year) if year else None,
-            "text": text,
-            "headline": headline,
-            "word_count": word_count,
-            "paragraphs": len(paragraphs),
-            "loanwords": loanwords,
-            "all_loanwords": all_loanwords,
-            "loanword_count": loanword_count,
-            "loanword_density": round(loanword_density, 4),
-            "top_loanwords": top_loanwords,
-            "sentiment": sentiment,
-        }
-
-    except (requests.RequestException, AttributeError, ValueError) as e:
-        print(f"Error scraping {url}: {e}")
+    with article_timer(url):
+        return _scrape_article(url, detector, canonicaliser, raise_errors)
+
+
+def _scrape_article(
+    url: str,
+    detector: Optional[BoilerplateDetector],
+    canonicaliser: Optional[URLCanonicaliser],
+    raise_errors: bool
+) -> Optional[dict]:
+    article = extract_article(url, detector, canonicaliser, raise_errors, parser="html5lib")
+    if article is None:
         return None
+
+    # Non-German pages, paywall teasers, tickers and link lists never reach spaCy and sentiment
+    rejected = check_article(article)
+    if rejected:
+        raise ArticleRejected(url, rejected, article["article_id"])
+
+    with phase("nlp"):
+        # Tokenised once; loanwords, their statistics and the sentiment input all read from `doc`
+        doc = make_doc(article["text"])
+        loanwords = detect_loanwords(doc)
+
+    with phase("sentiment"):
+        sentiment = analyse_sentiment(doc)
+
+    return {
+        **article,
+        "loanwords": loanwords,
+        "all_loanwords": doc.all_loanwords(),
+        "loanword_count": doc.loanword_count,
+        "loanword_density": round(doc.loanword_density, 4),
+        "top_loanwords": doc.top_loanwords(3),
+        "sentiment": sentiment,
+    }
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+import time
+from functools import partial
+from typing import Callable, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, cohen_kappa_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger("fast_classifier")
+
+# Labels the LLM prompts ask for; anything else in the checkpoint is noise
+LABEL_SETS = {
+    "classify_tone": ["formal", "informal"],
+    "classify_topic": ["business", "technology", "lifestyle", "politics", "culture"],
+}
+# Checkpoint column holding the LLM label for each task
+LABEL_COLUMNS = {
+    "classify_tone": "tone",
+    "classify_topic": "topic",
+}
+DEFAULT_THRESHOLD = 0.8
+
+
+def load_llm_labelled_articles(
+    task: str,
+    checkpoint_csv: str = "llm_enrich_checkpoint.csv",
+    articles_csv: str = "scraped_articles_parallel.csv",
+    text_column: str = "text"
+) -> pd.DataFrame:
+    """
+    Joins the LLM labels from the enrichment checkpoint with the article texts.
+
+    Only rows whose label is one of the task's allowed labels are kept, so
+    "error" responses and rambling answers do not end up as training classes.
+
+    Parameters:
+        task (str): "classify_tone" or "classify_topic".
+        checkpoint_csv (str): Enrichment checkpoint written by `process_scraped_csv_in_batches`.
+        articles_csv (str): Scraped articles with `article_id` and text.
+        text_column (str): Name of the text column in `articles_csv`.
+
+    Returns:
+        pd.DataFrame: Columns `article_id`, `text` and `label`.
+    """
+    label_column = LABEL_COLUMNS[task]
+    labels = pd.read_csv(checkpoint_csv, usecols=["article_id", label_column])
+    texts = pd.read_csv(articles_csv, usecols=["article_id", text_column])
+
+    labels["label"] = labels[label_column].astype(str).str.strip().str.lower()
+    labels = labels[labels["label"].isin(LABEL_SETS[task])]
+    labels = labels.drop_duplicates("article_id", keep="last")
+
+    df = texts.merge(labels[["article_id", "label"]], on="article_id", how="inner")
+    df = df.rename(columns={text_column: "text"})
+    return df[df["text"].notna()].reset_index(drop=True)
+
+
+def _truncate_lower(text: str, max_chars: int) -> str:
+    # Module-level (not a lambda) so fitted models can be pickled with joblib
+    return text[:max_chars].lower()
+
+
+def train_fast_classifier(
+    texts: list[str],
+    labels: list[str],
+    max_features: int = 100_000,
+    max_chars: int = 5000
+) -> Pipeline:
+    """
+    Trains a TF-IDF + logistic regression classifier on LLM-labelled articles.
+
+    Word uni- and bigrams in float32 keep the model small and prediction fast
+    enough to label thousands of articles per second on a CPU.
+
+    Parameters:
+        texts (list[str]): Article texts.
+        labels (list[str]): The LLM labels for those texts.
+        max_features (int): Vocabulary size cap for the vectorizer.
+        max_chars (int): Only the first `max_chars` characters of each text are used.
+
+    Returns:
+        Pipeline: A fitted scikit-learn pipeline with `predict_proba`.
+    """
+    model = Pipeline([
+        ("tfidf", TfidfVectorizer(
+            preprocessor=partial(_truncate_lower, max_chars=max_chars),
+            ngram_range=(1, 2),
+            min_df=2,
+            max_features=max_features,
+            sublinear_tf=True,
+            dtype=np.float32,
+        )),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+    model.fit(texts, labels)
+    return model
+
+
+def predict_with_confidence(model: Pipeline, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Predicts labels for a batch of texts together with the model's confidence.
+
+    Parameters:
+        model (Pipeline): A classifier from `train_fast_classifier`.
+        texts (list[str]): Texts to classify.
+
+    Returns:
+        tuple: Array of predicted labels and array of max class probabilities.
+    """
+    if len(texts) == 0:
+        return np.array([], dtype=object), np.array([], dtype=np.float32)
+
+    proba = model.predict_proba(texts)
+    best = proba.argmax(axis=1)
+    return model.classes_[best], proba[np.arange(len(best)), best]
+
+
+def evaluate_agreement(
+    model: Pipeline,
+    texts: list[str],
+    llm_labels: list[str],
+    threshold: float = DEFAULT_THRESHOLD
+) -> dict:
+    """
+    Measures how well the fast classifier agrees with the LLM labels.
+
+    Parameters:
+        model (Pipeline): A fitted classifier.
+        texts (list[str]): Held-out texts.
+        llm_labels (list[str]): The LLM labels for those texts.
+        threshold (float): Confidence above which the fast path would be trusted.
+
+    Returns:
+        dict: Overall accuracy, macro F1 and Cohen's kappa against the LLM, the share
+        of articles above the threshold (coverage), accuracy on that confident
+        subset, and prediction throughput in articles/sec.
+    """
+    start = time.perf_counter()
+    predicted, confidence = predict_with_confidence(model, texts)
+    elapsed = time.perf_counter() - start
+
+    llm_labels = np.asarray(llm_labels)
+    confident = confidence >= threshold
+
+    return {
+        "n": len(texts),
+        "accuracy": round(accuracy_score(llm_labels, predicted), 4),
+        "macro_f1": round(f1_score(llm_labels, predicted, average="macro"), 4),
+        "cohen_kappa": round(cohen_kappa_score(llm_labels, predicted), 4),
+        "threshold": threshold,
+        "coverage": round(confident.mean(), 4) if len(texts) else 0.0,
+        "confident_accuracy": (
+            round(accuracy_score(llm_labels[confident], predicted[confident]), 4)
+            if confident.any() else None),
+        "articles_per_sec": round(len(texts) / elapsed, 1) if elapsed else None,
+    }
+
+
+def build_fast_classifier(
+    task: str,
+    checkpoint_csv: str = "llm_enrich_checkpoint.csv",
+    articles_csv: str = "scraped_articles_parallel.csv",
+    model_path: Optional[str] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    test_size: float = 0.2,
+    seed: int = 42
+) -> tuple[Pipeline, dict]:
+    """
+    Trains, evaluates and optionally saves the fast classifier for one task.
+
+    Parameters:
+        task (str): "classify_tone" or "classify_topic".
+        checkpoint_csv (str): Enrichment checkpoint with the LLM labels.
+        articles_csv (str): Scraped articles with texts.
+        model_path (str, optional): Where to save the fitted model with joblib.
+        threshold (float): Confidence threshold used for the coverage metrics.
+        test_size (float): Fraction of labelled articles held out for evaluation.
+        seed (int): Random seed for the train/test split.
+
+    Returns:
+        tuple: The fitted classifier (refit on all labelled data) and the held-out agreement metrics.
+    """
+    df = load_llm_labelled_articles(task, checkpoint_csv, articles_csv)
+    if df["label"].nunique() < 2:
+        raise ValueError(f"Need at least two distinct LLM labels for {task}")
+
+    stratify = df["label"] if df["label"].value_counts().min() >= 2 else None
+    train, test = train_test_split(
+        df, test_size=test_size, random_state=seed, stratify=stratify)
+
+    model = train_fast_classifier(train["text"].tolist(), train["label"].tolist())
+    metrics = evaluate_agreement(
+        model, test["text"].tolist(), test["label"].tolist(), threshold)
+    metrics["task"] = task
+    logger.info(f"Fast classifier agreement for {task}: {metrics}")
+
+    model = train_fast_classifier(df["text"].tolist(), df["label"].tolist())
+    if model_path:
+        joblib.dump(model, model_path)
+
+    return model, metrics
+
+
+def load_fast_classifier(model_path: str) -> Pipeline:
+    """
+    Loads a classifier saved by `build_fast_classifier`.
+    """
+    return joblib.load(model_path)
+
+
+def classify_with_fallback(
+    texts: list[str],
+    model: Pipeline,
+    llm_func: Callable[[str], str],
+    threshold: float = DEFAULT_THRESHOLD
+) -> tuple[list[str], list[str]]:
+    """
+    Labels a batch with the fast classifier and asks the LLM only when unsure.
+
+    Parameters:
+        texts (list[str]): Texts to classify.
+        model (Pipeline): The fast classifier for this task.
+        llm_func (Callable): The LLM classifier to fall back to (e.g. `classify_tone`).
+        threshold (float): Minimum confidence to accept the fast prediction.
+
+    Returns:
+        tuple: The labels, and per text the source of the label ("fast", "llm",
+        or "error" with label None if the LLM call raised; the caller marks
+        those articles failed).
+    """
+    predicted, confidence = predict_with_confidence(model, texts)
+
+    labels, sources = [], []
+    for text, label, conf in zip(texts, predicted, confidence):
+        if conf >= threshold:
+            labels.append(str(label))
+            sources.append("fast")
+            continue
+        try:
+            labels.append(llm_func(text))
+            sources.append("llm")
+        except Exception as e:
+            logger.error(f"LLM fallback failed: {e}")
+            labels.append(None)
+            sources.append("error")
+    return labels, sources
+
+
+if __name__ == "__main__":
+    for task in LABEL_SETS:
+        try:
+            _, metrics = build_fast_classifier(
+                task, model_path=f"fast_{LABEL_COLUMNS[task]}_classifier.joblib")
+            print(f"✅ {task}: {metrics}")
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ {task}: {e}")
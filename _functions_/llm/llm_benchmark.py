@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from ollama_mock_server import PROFILES, start_mock_server
+
+SAMPLE_WORDS = [
+    "Unternehmen", "Wirtschaft", "Markt", "Kunden", "Entwicklung", "Jahr",
+    "Regierung", "Zukunft", "Arbeit", "Mitarbeiter", "Umsatz", "Analyse",
+    "Startup", "Meeting", "Business", "Marketing", "Team", "Software",
+    "Deal", "Trend", "Newsletter", "Update", "Feedback", "Manager",
+]
+LOANWORD_POOL = ["startup", "meeting", "business", "marketing",
+                 "team", "software", "deal", "trend", "feedback", "manager"]
+
+
+def make_synthetic_articles(
+    n_articles: int = 100,
+    words_per_article: tuple = (300, 1200),
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Builds a DataFrame of synthetic German-looking articles for benchmarking.
+
+    Parameters:
+        n_articles (int): Number of articles to generate.
+        words_per_article (tuple): Min and max number of words per article.
+        seed (int): Seed so repeated benchmark runs see the same corpus.
+
+    Returns:
+        pd.DataFrame: Columns `article_id`, `text` and `loanwords` (list of str).
+    """
+    rng = random.Random(seed)
+    rows = []
+    for article_id in range(n_articles):
+        n_words = rng.randint(*words_per_article)
+        words = [rng.choice(SAMPLE_WORDS) for _ in range(n_words)]
+        loanwords = [w.lower() for w in words if w.lower() in LOANWORD_POOL]
+        rows.append({
+            "article_id": article_id,
+            "text": " ".join(words) + ".",
+            "loanwords": loanwords,
+        })
+    return pd.DataFrame(rows)
+
+
+def summarise_latencies(latencies: list[float], wall_seconds: float) -> dict:
+    """
+    Reduces a list of per-request latencies to throughput and tail statistics.
+
+    Parameters:
+        latencies (list[float]): Per-request latencies in seconds.
+        wall_seconds (float): Wall-clock duration of the whole run.
+
+    Returns:
+        dict: Request count, requests/sec and p50/p95/p99/max latency in ms.
+    """
+    if not latencies:
+        return {"requests": 0, "requests_per_sec": 0.0}
+
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return round(ordered[idx] * 1000, 2)
+
+    return {
+        "requests": len(ordered),
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_sec": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+@contextmanager
+def track_csv_writes():
+    """
+    Times every `DataFrame.to_csv` call made inside the block.
+
+    The enrichment and cleaning stages checkpoint through `to_csv`, so the time
+    spent here is the checkpoint overhead of a run.
+
+    Yields:
+        list[float]: Durations in seconds, appended to as writes happen.
+    """
+    durations = []
+    original = pd.DataFrame.to_csv
+
+    def timed_to_csv(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    pd.DataFrame.to_csv = timed_to_csv
+    try:
+        yield durations
+    finally:
+        pd.DataFrame.to_csv = original
+
+
+@contextmanager
+def track_ask_ollama(module):
+    """
+    Records the latency of every `ask_ollama` call made through `module`.
+
+    Parameters:
+        module: A module that imported `ask_ollama` (directly or via llm_helpers).
+
+    Yields:
+        list[float]: Per-call latencies in seconds.
+    """
+    latencies = []
+    original = module.ask_ollama
+
+    def timed_ask_ollama(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    module.ask_ollama = timed_ask_ollama
+    try:
+        yield latencies
+    finally:
+        module.ask_ollama = original
+
+
+def bench_ask_ollama(llm_helpers, articles: pd.DataFrame, n_requests: int, concurrency: int) -> dict:
+    """
+    Fires `n_requests` tone-classification prompts at `ask_ollama` with a thread pool.
+
+    Parameters:
+        llm_helpers: The imported llm_helpers module.
+        articles (pd.DataFrame): Synthetic articles to draw prompts from.
+        n_requests (int): Number of calls to make.
+        concurrency (int): Number of concurrent worker threads.
+
+    Returns:
+        dict: Latency and throughput summary.
+    """
+    texts = articles["text"].tolist()
+    prompts = [
+        "Is the following article written in a formal or informal tone? "
+        "Respond with only one word: 'formal' or 'informal'.\n\n"
+        f"Text:\n{texts[i % len(texts)]}"
+        for i in range(n_requests)
+    ]
+
+    def one_call(prompt: str) -> float:
+        start = time.perf_counter()
+        llm_helpers.ask_ollama(prompt=prompt)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one_call, prompts))
+    wall = time.perf_counter() - start
+
+    summary = summarise_latencies(latencies, wall)
+    summary["concurrency"] = concurrency
+    return summary
+
+
+def bench_enrichment_pipeline(llm_helpers, pipeline, articles: pd.DataFrame, workdir: Path, batch_size: int) -> dict:
+    """
+    Runs `process_scraped_csv_in_batches` end to end on the synthetic corpus.
+
+    Parameters:
+        llm_helpers: The imported llm_helpers module.
+        pipeline: The imported llm_enrichment_pipeline module.
+        articles (pd.DataFrame): Synthetic articles.
+        workdir (Path): Scratch directory for input, checkpoint and log files.
+        batch_size (int): Batch size passed to the pipeline.
+
+    Returns:
+        dict: Latency summary of the underlying LLM calls, articles/sec and checkpoint overhead.
+    """
+    input_csv = workdir / "bench_scraped.csv"
+    checkpoint_csv = workdir / "bench_enrich_checkpoint.csv"
+    articles[["article_id", "text"]].to_csv(input_csv, index=False)
+    if checkpoint_csv.exists():
+        checkpoint_csv.unlink()
+
+    with track_ask_ollama(llm_helpers) as latencies, track_csv_writes() as writes:
+        start = time.perf_counter()
+        pipeline.process_scraped_csv_in_batches(
+            input_csv=str(input_csv),
+            checkpoint_csv=str(checkpoint_csv),
+            batch_size=batch_size,
+            limit=None,
+            log_path=str(workdir / "bench_enrichment.log"),
+            metrics_log=str(workdir / "bench_llm_metrics.jsonl"),
+            # No rollups are built under workdir, so the real ledger is never touched
+            rollup_path=str(workdir / "bench_density_rollups.parquet"),
+        )
+        wall = time.perf_counter() - start
+
+    summary = summarise_latencies(latencies, wall)
+    summary["articles"] = len(articles)
+    summary["articles_per_sec"] = round(len(articles) / wall, 2) if wall else 0.0
+    summary["checkpoint_writes"] = len(writes)
+    summary["checkpoint_seconds"] = round(sum(writes), 4)
+    summary["checkpoint_share"] = round(sum(writes) / wall, 4) if wall else 0.0
+    return summary
+
+
+def bench_batch_clean_loanwords(llm_helpers, articles: pd.DataFrame, workdir: Path) -> dict:
+    """
+    Runs `batch_clean_loanwords` on the synthetic corpus.
+
+    Parameters:
+        llm_helpers: The imported llm_helpers module.
+        articles (pd.DataFrame): Synthetic articles with `loanwords` lists.
+        workdir (Path): Scratch directory for the checkpoint and log.
+
+    Returns:
+        dict: Latency summary of the LLM calls, articles/sec and checkpoint overhead.
+    """
+    checkpoint_path = workdir / "bench_loanwords_progress.csv"
+    if checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    with track_ask_ollama(llm_helpers) as latencies, track_csv_writes() as writes:
+        start = time.perf_counter()
+        llm_helpers.batch_clean_loanwords(
+            articles,
+            checkpoint_path=str(checkpoint_path),
+            log_path=str(workdir / "bench_loanwords.log"),
+        )
+        wall = time.perf_counter() - start
+
+    summary = summarise_latencies(latencies, wall)
+    summary["articles"] = len(articles)
+    summary["articles_per_sec"] = round(len(articles) / wall, 2) if wall else 0.0
+    summary["checkpoint_writes"] = len(writes)
+    summary["checkpoint_seconds"] = round(sum(writes), 4)
+    return summary
+
+
+def run_llm_benchmark(
+    n_articles: int = 50,
+    n_requests: int = 200,
+    concurrency: tuple = (1, 4, 8),
+    profile: str = "instant",
+    batch_size: int = 10,
+    output_json: str = "llm_benchmark_results.json",
+    seed: int = 42
+) -> dict:
+    """
+    Benchmarks the LLM enrichment layer against a local mock Ollama server.
+
+    Starts `ollama_mock_server`, points the Ollama client at it through
+    `OLLAMA_HOST` and then drives `ask_ollama`, `process_scraped_csv_in_batches`
+    and `batch_clean_loanwords`. Results are appended to a JSON history file so
+    runs before and after a change can be compared.
+
+    Parameters:
+        n_articles (int): Size of the synthetic corpus.
+        n_requests (int): Number of raw `ask_ollama` calls per concurrency level.
+        concurrency (tuple): Thread counts to try for the raw `ask_ollama` benchmark.
+        profile (str): Latency profile of the mock server (see `PROFILES`).
+        batch_size (int): Batch size for the enrichment pipeline.
+        output_json (str): History file to append the results to.
+        seed (int): Seed for the synthetic corpus and mock jitter.
+
+    Returns:
+        dict: The results of this run.
+    """
+    server, url = start_mock_server(profile=profile, seed=seed)
+    os.environ["OLLAMA_HOST"] = url
+
+    # Imported late so the Ollama client picks up OLLAMA_HOST
+    import llm_helpers
+    import llm_enrichment_pipeline
+
+    articles = make_synthetic_articles(n_articles=n_articles, seed=seed)
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "profile": profile,
+        "n_articles": n_articles,
+        "ask_ollama": [],
+    }
+
+    try:
+        for workers in concurrency:
+            print(f"⏱️  ask_ollama x{n_requests} with {workers} thread(s)...")
+            results["ask_ollama"].append(
+                bench_ask_ollama(llm_helpers, articles, n_requests, workers))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            print("⏱️  process_scraped_csv_in_batches...")
+            results["process_scraped_csv_in_batches"] = bench_enrichment_pipeline(
+                llm_helpers, llm_enrichment_pipeline, articles, workdir, batch_size)
+            print("⏱️  batch_clean_loanwords...")
+            results["batch_clean_loanwords"] = bench_batch_clean_loanwords(
+                llm_helpers, articles, workdir)
+    finally:
+        server.shutdown()
+
+    history = []
+    if os.path.exists(output_json):
+        with open(output_json, encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(results)
+    with open(output_json, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+    print_benchmark_report(results)
+    return results
+
+
+def print_benchmark_report(results: dict) -> None:
+    """
+    Prints a compact, human-readable view of one benchmark run.
+    """
+    print(f"\n📊 LLM benchmark ({results['profile']} profile, "
+          f"{results['n_articles']} articles)")
+    for row in results["ask_ollama"]:
+        print(f"  ask_ollama  threads={row['concurrency']:<3} "
+              f"rps={row['requests_per_sec']:<8} p50={row['p50_ms']}ms "
+              f"p95={row['p95_ms']}ms p99={row['p99_ms']}ms")
+    for stage in ("process_scraped_csv_in_batches", "batch_clean_loanwords"):
+        row = results.get(stage)
+        if not row:
+            continue
+        print(f"  {stage}: {row['articles_per_sec']} articles/sec, "
+              f"{row['requests_per_sec']} calls/sec, p95={row.get('p95_ms')}ms, "
+              f"checkpoint {row['checkpoint_seconds']}s over {row['checkpoint_writes']} writes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the LLM enrichment layer against a mock Ollama server.")
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--profile", default="instant", choices=sorted(PROFILES))
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--output", default="llm_benchmark_results.json")
+    args = parser.parse_args()
+
+    run_llm_benchmark(
+        n_articles=args.articles,
+        n_requests=args.requests,
+        concurrency=tuple(args.concurrency),
+        profile=args.profile,
+        batch_size=args.batch_size,
+        output_json=args.output,
+    )
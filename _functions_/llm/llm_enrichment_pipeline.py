@@ -2,31 +2,48 @@
 # coding: utf-8
 
 import os
+import sys
 import pandas as pd
 import json
 import time
 import logging
+from typing import Optional
 from tqdm import tqdm
-from llm_helpers import (
-    classify_tone,
-    classify_topic,
-    summarise_article,
-    explain_loanwords_usage,
-    detect_marketing_loanwords,
-    detect_country_influence,
-    detect_unwanted_loanwords
-)
+from llm_helpers import ENRICHMENT_TASKS, LLM_ERROR, group_tasks_by_model, keep_models_resident
+from llm_metrics import configure_metrics_log, summarise_llm_metrics
+from fast_classifier import classify_with_fallback, DEFAULT_THRESHOLD, LABEL_SETS
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from rollups import ROLLUP_PATH, update_rollups
+from text_store import open_text_store
 
 print("🚀 LLM enrichment pipeline starting...")
 
 
+def completed_article_ids(checkpoint_csv: str) -> set:
+    """
+    IDs of the articles in the checkpoint with no failed ("error") task, which
+    are not enriched again; articles whose last row has an error are retried.
+    """
+    if not os.path.exists(checkpoint_csv):
+        return set()
+    checkpoint = pd.read_csv(checkpoint_csv).drop_duplicates(subset="article_id", keep="last")
+    failed = checkpoint.drop(columns="article_id").astype(str).eq(LLM_ERROR).any(axis=1)
+    return set(checkpoint.loc[~failed, "article_id"])
+
+
 def process_scraped_csv_in_batches(
     input_csv: str = "scraped_articles_parallel.csv",
     output_csv: str = "enriched_articles.csv",
     checkpoint_csv: str = "llm_enrich_checkpoint.csv",
     batch_size: int = 50,
     limit: int = 5,
-    log_path: str = "llm_enrichment.log"
+    log_path: str = "llm_enrichment.log",
+    metrics_log: str = "llm_metrics.jsonl",
+    fast_classifiers: Optional[dict] = None,
+    fast_threshold: float = DEFAULT_THRESHOLD,
+    rollup_path: Optional[str] = ROLLUP_PATH,
+    use_text_store: bool = True
 ):
     logger = logging.getLogger("llm_enrichment")
     logger.setLevel(logging.INFO)
@@ -35,49 +52,100 @@ def process_scraped_csv_in_batches(
         formatter = logging.Formatter('%(asctime)s - %(message)s')
         handler.setFormatter(formatter)
         logger.addHandler(handler)
+    configure_metrics_log(metrics_log)
 
-    processed_ids = set()
+    # Articles already enriched are not enriched (or rolled up) again
+    processed_ids = completed_article_ids(checkpoint_csv)
     if not os.path.exists(input_csv):
         logger.error(f"❌ Input CSV not found: {input_csv}")
         print(f"❌ Input CSV not found: {input_csv}")
         return
 
-    all_rows = pd.read_csv(input_csv)
-    if "article_id" not in all_rows.columns:
+    if "article_id" not in pd.read_csv(input_csv, nrows=0).columns:
         logging.error("❌ 'article_id' column not found in input CSV")
         print("❌ 'article_id' column not found in input CSV")
         return
+    # With the text store, texts are read from the memory-mapped store one batch at a time
+    store = open_text_store(input_csv) if use_text_store else None
+    all_rows = pd.read_csv(input_csv, usecols=lambda c: c != "text") if store is not None \
+        else pd.read_csv(input_csv)
     all_rows = all_rows[~all_rows["article_id"].isin(processed_ids)]
     if limit:
         all_rows = all_rows.head(limit)
 
     print(f"Starting enrichment on {len(all_rows)} articles...")
 
-    new_rows = []
-
-    for i in tqdm(range(0, len(all_rows), batch_size), desc="LLM Enrichment"):
-        batch = all_rows.iloc[i:i+batch_size]
-        for _, row in batch.iterrows():
-            try:
-                article_id = row["article_id"]
-                text = row["text"]
-
-                enriched = {
-                    "article_id": article_id,
-                    "tone": classify_tone(text),
-                    "topic": classify_topic(text),
-                    "summary": summarise_article(text),
-                    "loanword_context": explain_loanwords_usage(text),
-                    "marketing_loanwords": detect_marketing_loanwords(text),
-                    "country_influence": detect_country_influence(text)
-                }
-                new_rows.append(enriched)
-                logger.info(f"Processed article: {article_id}")
-            except Exception as e:
-                logging.error(f"Error processing article {row.get('article_id')}: {e}")
-
-        # Save progress
-        pd.DataFrame(new_rows).to_csv(checkpoint_csv, mode='a', index=False, header=not os.path.exists(checkpoint_csv))
-        new_rows = []
+    # The checkpoint keeps the original column name for the loanword explanation
+    columns = {task: column for task, (column, _) in ENRICHMENT_TASKS.items()}
+    columns["explain_loanwords_usage"] = "loanword_context"
+    models = group_tasks_by_model(list(ENRICHMENT_TASKS))
+
+    with keep_models_resident(list(models)):
+        for i in tqdm(range(0, len(all_rows), batch_size), desc="LLM Enrichment"):
+            batch = all_rows.iloc[i:i+batch_size]
+            if store is not None:
+                batch = batch.assign(text=store.texts_for(batch["article_id"])[:])
+            enriched = {
+                row["article_id"]: {"article_id": row["article_id"]}
+                for _, row in batch.iterrows()
+            }
+            failed = set()
+
+            # One model at a time over the whole batch, so models are not swapped per article
+            for model, tasks in models.items():
+                for task in tasks:
+                    func = ENRICHMENT_TASKS[task][1]
+
+                    # Fast local classifier first, LLM only for low-confidence articles
+                    if fast_classifiers and task in fast_classifiers:
+                        labels, sources = classify_with_fallback(
+                            batch["text"].fillna("").astype(str).tolist(),
+                            fast_classifiers[task], func, threshold=fast_threshold)
+                        for article_id, label, source in zip(batch["article_id"], labels, sources):
+                            if source == "error" or label == LLM_ERROR:
+                                failed.add(article_id)
+                                logger.error(f"Error processing article {article_id} ({task})")
+                            else:
+                                enriched[article_id][columns[task]] = label
+                        logger.info(f"{task}: {sources.count('fast')} fast, {sources.count('llm')} via LLM, "
+                                    f"{sources.count('error')} failed")
+                        continue
+
+                    for _, row in batch.iterrows():
+                        article_id = row["article_id"]
+                        if article_id in failed:
+                            continue
+                        try:
+                            result = func(row["text"])
+                        except Exception as e:
+                            failed.add(article_id)
+                            logger.error(f"Error processing article {article_id} ({task}): {e}")
+                            continue
+                        if result == LLM_ERROR:
+                            failed.add(article_id)
+                            logger.error(f"Error processing article {article_id} ({task}): LLM call failed")
+                        else:
+                            enriched[article_id][columns[task]] = result
+
+            new_rows = [row for article_id, row in enriched.items() if article_id not in failed]
+            for row in new_rows:
+                logger.info(f"Processed article: {row['article_id']}")
+
+            # Save progress
+            pd.DataFrame(new_rows, columns=["article_id"] + list(columns.values())).to_csv(
+                checkpoint_csv, mode='a', index=False, header=not os.path.exists(checkpoint_csv))
+
+            # Move the batch's articles to their new topic in the density rollups
+            # (keyed by article_id, so a rerun replaces rather than re-adds them);
+            # answers outside the topic labels are not used as rollup groups
+            topics = {row["article_id"]: row.get(columns["classify_topic"]) for row in new_rows}
+            topics = {article_id: topic for article_id, topic in topics.items()
+                      if topic in LABEL_SETS["classify_topic"]}
+            if rollup_path and topics:
+                update_rollups(added=pd.DataFrame({"article_id": list(topics), "topic": list(topics.values())}),
+                               path=rollup_path)
 
+    metrics = summarise_llm_metrics()
+    logger.info(f"LLM metrics per task:\n{metrics.to_string(index=False)}")
+    print(metrics.to_string(index=False))
     print("✅ LLM enrichment complete.")
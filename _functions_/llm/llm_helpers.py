@@ -6,31 +6,181 @@ import pandas as pd
 from typing import Optional
 from tqdm import tqdm
 import time
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 import json
+import sys
+from contextlib import contextmanager
+from llm_metrics import record_llm_call, observed_chars_per_token
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from article_ids import make_article_id
+
+logger = logging.getLogger("llm_helpers")
+
+# `ask_ollama` answers this instead of raising once its retries are used up
+LLM_ERROR = "error"
+
+# === MODEL CONFIGURATION ===
+DEFAULT_MODEL = "mistral"
+# Which model serves which enrichment task; unlisted tasks use DEFAULT_MODEL
+TASK_MODELS = {
+    "classify_tone": DEFAULT_MODEL,
+    "classify_topic": DEFAULT_MODEL,
+    "summarise_article": DEFAULT_MODEL,
+    "explain_loanwords_usage": DEFAULT_MODEL,
+    "detect_marketing_loanwords": DEFAULT_MODEL,
+    "detect_country_influence": DEFAULT_MODEL,
+    "detect_unwanted_loanwords": DEFAULT_MODEL,
+}
+# Upper bound on generated tokens per task (Ollama `num_predict`)
+TASK_NUM_PREDICT = {
+    "classify_tone": 4,
+    "classify_topic": 4,
+    "summarise_article": 160,
+    "summarise_chunk": 160,
+    "explain_loanwords_chunk": 160,
+    "explain_loanwords_usage": 256,
+    "detect_marketing_loanwords": 96,
+    "detect_country_influence": 160,
+    "detect_unwanted_loanwords": 96,
+}
+RUN_KEEP_ALIVE = "30m"
+
+# === LONG ARTICLES ===
+# Articles above this many model tokens are summarised map-reduce style
+LONG_TEXT_TOKENS = 2000
+CHUNK_TOKENS = 1200
+MAP_WORKERS = 4
+
+# keep_alive sent with every request while `keep_models_resident` is active
+_active_keep_alive = None
+
+
+def model_for_task(task: str) -> str:
+    """
+    Returns the Ollama model configured for an enrichment task.
+
+    Parameters:
+        task (str): The task name (e.g. "classify_tone").
+
+    Returns:
+        str: The model name from `TASK_MODELS`, or `DEFAULT_MODEL`.
+    """
+    return TASK_MODELS.get(task, DEFAULT_MODEL)
+
+
+def group_tasks_by_model(tasks: list[str]) -> dict[str, list[str]]:
+    """
+    Groups enrichment tasks by the model that serves them.
+
+    Running all tasks of one model before moving on to the next means each model
+    is loaded once, instead of being swapped in and out per article.
+
+    Parameters:
+        tasks (list[str]): Task names in their preferred order.
+
+    Returns:
+        dict[str, list[str]]: Model name -> tasks, in first-seen order.
+    """
+    grouped = {}
+    for task in tasks:
+        grouped.setdefault(model_for_task(task), []).append(task)
+    return grouped
+
+
+def warm_up_model(model: str, keep_alive: str = RUN_KEEP_ALIVE) -> bool:
+    """
+    Loads a model into memory without generating anything.
+
+    Ollama treats an empty generate request as a load request, so the
+    `load_duration` is paid here rather than by the first article.
+
+    Parameters:
+        model (str): The model to preload.
+        keep_alive (str): How long Ollama should keep it resident (e.g. "30m", -1 for forever).
+
+    Returns:
+        bool: True if the model was loaded, False if the request failed.
+    """
+    try:
+        response = ollama.generate(model=model, prompt="", keep_alive=keep_alive)
+        load_seconds = (response.get("load_duration") or 0) / 1e9
+        logger.info(f"Warmed up {model} in {load_seconds:.2f}s (keep_alive={keep_alive})")
+        return True
+    except Exception as e:
+        logger.warning(f"[Ollama warm-up failed for {model}] {e}")
+        return False
+
+
+@contextmanager
+def keep_models_resident(
+    models: list[str],
+    keep_alive: str = RUN_KEEP_ALIVE,
+    unload_on_exit: bool = False
+):
+    """
+    Preloads models and keeps them resident for the duration of a run.
+
+    Inside the block every `ask_ollama` call sends the given `keep_alive`, so
+    Ollama never unloads a model between articles of a long run.
+
+    Parameters:
+        models (list[str]): Models the run is about to use.
+        keep_alive (str): Residency to request from Ollama (default is RUN_KEEP_ALIVE).
+        unload_on_exit (bool): Unload the models when the block exits.
+    """
+    global _active_keep_alive
+
+    previous = _active_keep_alive
+    _active_keep_alive = keep_alive
+    for model in dict.fromkeys(models):
+        warm_up_model(model, keep_alive=keep_alive)
+    try:
+        yield
+    finally:
+        _active_keep_alive = previous
+        if unload_on_exit:
+            for model in dict.fromkeys(models):
+                try:
+                    ollama.generate(model=model, prompt="", keep_alive=0)
+                except Exception as e:
+                    logger.warning(f"[Ollama unload failed for {model}] {e}")
 
 
 def ask_ollama(
     prompt: str,
-    model: str = "mistral",
+    model: Optional[str] = None,
     system: Optional[str] = None,
     retries: int = 3,
-    delay: float = 2.0
+    delay: float = 2.0,
+    task: str = "ask_ollama",
+    num_predict: Optional[int] = None,
+    keep_alive: Optional[str] = None
 ) -> str:
     """
     Sends a prompt to an Ollama language model and returns the generated response.
 
     This function communicates with the Ollama chat API, optionally including a system
     message to guide the model's behaviour. It supports retry logic for improved robustness
-    in case of transient errors during the API call.
+    in case of transient errors during the API call. Every call is recorded as a metrics
+    event (token counts, Ollama durations, retries) via `llm_metrics.record_llm_call`.
+
+    Output length is capped per task through `TASK_NUM_PREDICT`, and inside
+    `keep_models_resident` the run-wide `keep_alive` is sent with the request.
 
     Parameters:
         prompt (str): The user message to send to the language model.
-        model (str, optional): The name of the Ollama model to use (default is "mistral").
+        model (str, optional): The Ollama model to use (default is the task's model from `TASK_MODELS`).
         system (str, optional): An optional system message to influence model behaviour.
         retries (int, optional): Number of retry attempts if an error occurs (default is 3).
         delay (float, optional): Delay in seconds between retry attempts (default is 2.0).
+        task (str, optional): Task name the call is recorded under in the metrics.
+        num_predict (int, optional): Maximum tokens to generate (default from `TASK_NUM_PREDICT`).
+        keep_alive (str, optional): Ollama keep_alive for this call (default is the active run's).
 
     Returns:
         str: The content of the model's response if successful, or "error" if all retries fail.
@@ -41,20 +191,33 @@ def ask_ollama(
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
 
+    model = model or model_for_task(task)
+    num_predict = num_predict or TASK_NUM_PREDICT.get(task)
+    options = {"num_predict": num_predict} if num_predict else None
+    keep_alive = keep_alive if keep_alive is not None else _active_keep_alive
+    prompt_chars = sum(len(m["content"]) for m in messages)
+
+    start = time.perf_counter()
+    last_error = None
+
     for attempt in range(retries):
         try:
-            response = ollama.chat(model=model, messages=messages)
+            response = ollama.chat(model=model, messages=messages,
+                                   options=options, keep_alive=keep_alive)
+            record_llm_call(task=task, model=model, response=response,
+                            latency=time.perf_counter() - start, retries=attempt,
+                            prompt_chars=prompt_chars)
             return response["message"]["content"].strip()
         except Exception as e:
-            print(f"[Ollama error - attempt {attempt+1}] {e}")
-            time.sleep(delay)
-        return "error"
+            last_error = e
+            logger.warning(
+                f"[Ollama error - {task} attempt {attempt+1}/{retries}] {e}")
+            if attempt + 1 < retries:
+                time.sleep(delay)
 
-    response = ollama.chat(model=model, messages=[
-        {"role": "system", "content": system} if system else {},
-        {"role": "user", "content": prompt}
-    ])
-    return response["message"]["content"]
+    record_llm_call(task=task, model=model, latency=time.perf_counter() - start,
+                    retries=retries - 1, error=str(last_error), prompt_chars=prompt_chars)
+    return LLM_ERROR
 
 
 def classify_tone(text: str) -> str:
@@ -75,7 +238,7 @@ def classify_tone(text: str) -> str:
         "Respond with only one word: 'formal' or 'informal'.\n\n"
         f"Text:\n{text}"
     )
-    return ask_ollama(prompt=prompt).strip().lower()
+    return ask_ollama(prompt=prompt, task="classify_tone").strip().lower()
 
 
 def classify_topic(text: str) -> str:
@@ -98,47 +261,220 @@ def classify_topic(text: str) -> str:
         f"Text:\n{text}"
     )
 
-    return ask_ollama(prompt=prompt).strip().lower()
+    return ask_ollama(prompt=prompt, task="classify_topic").strip().lower()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates how many model tokens a text will use.
+
+    The characters-per-token ratio is calibrated from the `prompt_eval_count`
+    Ollama reported for earlier calls (see `llm_metrics.observed_chars_per_token`).
+
+    Parameters:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return math.ceil(len(text) / observed_chars_per_token())
+
+
+def split_into_chunks(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    Splits a long text into chunks of at most `max_tokens`, aligned to paragraphs.
+
+    Paragraphs (blank-line or newline separated) are packed greedily. A paragraph
+    that is too long on its own is split at sentence ends, and a single overlong
+    sentence at word boundaries. Scraped texts have their paragraphs joined by
+    spaces, so for those the sentence level does the work.
+
+    Parameters:
+        text (str): The article text.
+        max_tokens (int): Token budget per chunk.
+
+    Returns:
+        list[str]: The chunks, in reading order.
+    """
+    max_chars = int(max_tokens * observed_chars_per_token())
+
+    units = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                units.append(sentence[:cut])
+                sentence = sentence[cut:].strip()
+            if sentence:
+                units.append(sentence)
+
+    chunks, current, current_len = [], [], 0
+    for unit in units:
+        if current and current_len + len(unit) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+        current.append(unit)
+        current_len += len(unit) + 1
+    if current:
+        chunks.append(" ".join(current))
+
+    return chunks
+
+
+def _map_chunks(
+    text: str,
+    map_prompt: str,
+    map_task: str,
+    max_tokens: int,
+    chunk_tokens: int,
+    max_workers: int
+) -> Optional[str]:
+    """
+    Sends `map_prompt` with every chunk of `text` to the model concurrently and
+    joins the answers. While the joined answers are longer than `max_tokens`
+    (and still shrinking), they are mapped again the same way.
+
+    Returns:
+        str or None: The joined answers of the last map round, or None if any chunk failed.
+    """
+    chunks = split_into_chunks(text, max_tokens=chunk_tokens)
+
+    def ask_chunk(chunk: str) -> str:
+        return ask_ollama(prompt=f"{map_prompt}\n\n{chunk}", task=map_task)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        partials = list(executor.map(ask_chunk, chunks))
+
+    failed = partials.count(LLM_ERROR)
+    if failed:
+        logger.error(f"[{map_task}] {failed}/{len(chunks)} chunks failed; not reducing a partial set")
+        return None
+
+    combined = "\n\n".join(partials)
+    if estimate_tokens(combined) > max_tokens and len(combined) < len(text):
+        return _map_chunks(combined, map_prompt, map_task, max_tokens, chunk_tokens, max_workers)
+    return combined
+
+
+def map_reduce_ask(
+    text: str,
+    map_prompt: str,
+    reduce_prompt: str,
+    map_task: str,
+    reduce_task: str,
+    max_tokens: int = LONG_TEXT_TOKENS,
+    chunk_tokens: int = CHUNK_TOKENS,
+    max_workers: int = MAP_WORKERS
+) -> str:
+    """
+    Answers a prompt about a long text by mapping over chunks and reducing the results.
+
+    The chunks are sent to the model concurrently with `map_prompt`. If the
+    partial answers are themselves longer than `max_tokens`, they are mapped
+    again chunk-wise (see `_map_chunks`); the final partial answers are then
+    combined with a single `reduce_prompt` call.
+
+    Parameters:
+        text (str): The long article text.
+        map_prompt (str): Instruction prepended to every chunk.
+        reduce_prompt (str): Instruction prepended to the joined partial answers.
+        map_task (str): Metrics task name for the map calls.
+        reduce_task (str): Metrics task name for the final call.
+        max_tokens (int): Token budget for a single prompt.
+        chunk_tokens (int): Token budget per chunk.
+        max_workers (int): Number of chunks sent to Ollama at the same time.
+
+    Returns:
+        str: The reduced answer, or "error" if any chunk failed (a partial set
+        would silently leave out whole sections of the article).
+    """
+    combined = _map_chunks(text, map_prompt, map_task, max_tokens, chunk_tokens, max_workers)
+    if combined is None:
+        return LLM_ERROR
+
+    return ask_ollama(prompt=f"{reduce_prompt}\n\n{combined}", task=reduce_task)
 
 
-def summarise_article(text: str) -> str:
+def summarise_article(text: str, max_tokens: int = LONG_TEXT_TOKENS) -> str:
     """
     Generates a concise 2–3 sentence summary of a German-language article.
 
+    Articles up to `max_tokens` model tokens are summarised in a single call.
+    Longer articles are split into paragraph-aligned chunks that are summarised
+    concurrently and then reduced into the final summary, so nothing is silently
+    cut off by the model's context window.
+
     Parameters:
         text (str): The full text of the German article.
+        max_tokens (int): Token threshold above which the map-reduce path is used.
 
     Returns:
         str: A brief summary generated by the language model.
     """
+    if estimate_tokens(text) > max_tokens:
+        return map_reduce_ask(
+            text,
+            map_prompt="Summarise this part of a German article in 2-3 sentences:",
+            reduce_prompt=(
+                "These are summaries of consecutive parts of one German article. "
+                "Summarise the whole article in 2-3 sentences:"),
+            map_task="summarise_chunk",
+            reduce_task="summarise_article",
+            max_tokens=max_tokens,
+        )
+
     prompt = (
         "Summarise the German article in 2-3 sentences:\n\n"
         f"{text}"
     )
 
-    return ask_ollama(prompt=prompt)
+    return ask_ollama(prompt=prompt, task="summarise_article")
 
 
-def explain_loanwords_usage(text: str) -> str:
+def explain_loanwords_usage(text: str, max_tokens: int = LONG_TEXT_TOKENS) -> str:
     """
     Analyses the presence of English loanwords in a German article and explains their purpose.
 
     The explanation may include insights into the article's context or target audience
-    based on the use of these English terms.
+    based on the use of these English terms. Articles longer than `max_tokens` are
+    first reduced chunk by chunk to notes on the English words they use.
 
     Parameters:
         text (str): The full text of the German article.
+        max_tokens (int): Token threshold above which the map-reduce path is used.
 
     Returns:
         str: A textual explanation of the loanword usage.
     """
+    if estimate_tokens(text) > max_tokens:
+        return map_reduce_ask(
+            text,
+            map_prompt=(
+                "List the English words used in this part of a German article "
+                "and briefly note the context each one is used in:"),
+            reduce_prompt=(
+                "These are notes on the English words used in one German article. "
+                "Why does the article use English words? "
+                "What might this say about the context or target audience?"),
+            map_task="explain_loanwords_chunk",
+            reduce_task="explain_loanwords_usage",
+            max_tokens=max_tokens,
+        )
+
     prompt = (
         "Why does this German article use English words? "
         "What might this say about the context or target audience?\n\n"
         f"{text}"
     )
 
-    return ask_ollama(prompt=prompt)
+    return ask_ollama(prompt=prompt, task="explain_loanwords_usage")
 
 
 def detect_marketing_loanwords(text: str) -> str:
@@ -158,7 +494,7 @@ def detect_marketing_loanwords(text: str) -> str:
         "Return a list."
     )
 
-    return ask_ollama(prompt=prompt)
+    return ask_ollama(prompt=prompt, task="detect_marketing_loanwords")
 
 
 def detect_country_influence(text: str) -> str:
@@ -187,7 +523,7 @@ def detect_country_influence(text: str) -> str:
         f"{text}"
     )
 
-    return ask_ollama(prompt=prompt)
+    return ask_ollama(prompt=prompt, task="detect_country_influence")
 
 
 def detect_unwanted_loanwords(text: str, loanwords: list[str]) -> list[str]:
@@ -212,16 +548,28 @@ def detect_unwanted_loanwords(text: str, loanwords: list[str]) -> list[str]:
         f"{text}"
     )
 
-    response = ask_ollama(prompt=prompt)
+    response = ask_ollama(prompt=prompt, task="detect_unwanted_loanwords")
     return [w.strip() for w in response.split(",") if w.strip()]
 
 
+# Task name -> (output column, function) for the six per-article enrichment prompts
+ENRICHMENT_TASKS = {
+    "classify_tone": ("tone", classify_tone),
+    "classify_topic": ("topic", classify_topic),
+    "summarise_article": ("summary", summarise_article),
+    "explain_loanwords_usage": ("loanwords_usage", explain_loanwords_usage),
+    "detect_marketing_loanwords": ("marketing_loanwords", detect_marketing_loanwords),
+    "detect_country_influence": ("country_influence", detect_country_influence),
+}
+
+
 def batch_clean_loanwords(
     df: pd.DataFrame,
     index_column: str = "article_id",
     limit: int = None,
     checkpoint_path: str = "loanwords_progress.csv",
-    log_path: str = "loanwords_processing.log"
+    log_path: str = "loanwords_processing.log",
+    text_store=None
 ) -> pd.DataFrame:
     """
     Processes a batch of articles to refine English loanwords by removing irrelevant ones.
@@ -235,6 +583,8 @@ def batch_clean_loanwords(
         limit (int, optional): Optional limit on number of rows to process.
         checkpoint_path (str): Path to save progress for resumability.
         log_path (str): Path to save processing logs.
+        text_store (TextStore, optional): Memory-mapped texts keyed by article ID
+            (see `corpus/text_store.py`); then `df` needs no "text" column.
 
     Returns:
         pd.DataFrame: DataFrame including original article IDs with updated loanword lists.
@@ -260,21 +610,23 @@ def batch_clean_loanwords(
 
     new_results = []
 
-    for _, row in tqdm(to_process.iterrows(), total=to_process.shape[0], desc="Cleaning loanwords"):
-        idx = row[index_column]
-        try:
-            excluded = detect_unwanted_loanwords(row["text"], row["loanwords"])
-            refined = [w for w in row["loanwords"] if w not in excluded]
-
-            result_row = {
-                index_column: idx,
-                "excluded_loanwords": excluded,
-                "refined_loanwords": refined
-            }
-            new_results.append(result_row)
-            logging.info(f"Processed row: {idx}")
-        except Exception as e:
-            logging.error(f"Error processing row {idx}: {e}")
+    with keep_models_resident([model_for_task("detect_unwanted_loanwords")]):
+        for _, row in tqdm(to_process.iterrows(), total=to_process.shape[0], desc="Cleaning loanwords"):
+            idx = row[index_column]
+            try:
+                text = text_store.get(idx) if text_store is not None else row["text"]
+                excluded = detect_unwanted_loanwords(text, row["loanwords"])
+                refined = [w for w in row["loanwords"] if w not in excluded]
+
+                result_row = {
+                    index_column: idx,
+                    "excluded_loanwords": excluded,
+                    "refined_loanwords": refined
+                }
+                new_results.append(result_row)
+                logging.info(f"Processed row: {idx}")
+            except Exception as e:
+                logging.error(f"Error processing row {idx}: {e}")
 
     new_df = pd.DataFrame(new_results)
     combined_df = pd.concat([processed_df, new_df], ignore_index=True)
@@ -295,7 +647,8 @@ def enrich_article_and_create_dataframe(
     Adds enrichment columns to a DataFrame of articles using various Ollama-based NLP tasks.
 
     For each article, computes tone, topic, summary, loanword usage explanation, 
-    marketing loanwords, and country influence.
+    marketing loanwords, and country influence. Tasks are run grouped by model
+    with the models held resident, so each model is loaded once per call.
 
     Parameters:
         df (pd.DataFrame): DataFrame containing a column named "text" with article content.
@@ -304,52 +657,70 @@ def enrich_article_and_create_dataframe(
         pd.DataFrame: New DataFrame with enrichment results for each article.
     """
     df_copy = df.copy()
+    texts = df_copy["text"].tolist()
 
-    results = {
-        "tone": [],
-        "topic": [],
-        "summary": [],
-        "loanwords_usage": [],
-        "marketing_loanwords": [],
-        "country_influence": []
-    }
+    results = {}
+    tasks = list(ENRICHMENT_TASKS)
+    with keep_models_resident(list(group_tasks_by_model(tasks))):
+        for model, model_tasks in group_tasks_by_model(tasks).items():
+            for task in model_tasks:
+                column, func = ENRICHMENT_TASKS[task]
+                results[column] = [
+                    func(text=txt)
+                    for txt in tqdm(texts, desc=f"Enriching with Ollama ({model}: {task})")
+                ]
 
-    for txt in tqdm(df_copy["text"], desc="Enriching with Ollama"):
-        results["tone"].append(classify_tone(text=txt))
-        results["topic"].append(classify_topic(text=txt))
-        results["summary"].append(summarise_article(text=txt))
-        results["loanwords_usage"].append(explain_loanwords_usage(text=txt))
-        results["marketing_loanwords"].append(
-            detect_marketing_loanwords(text=txt))
-        results["country_influence"].append(detect_country_influence(text=txt))
-
-    return pd.DataFrame(results)
+    return pd.DataFrame({column: results[column] for column, _ in ENRICHMENT_TASKS.values()})
 
 
 def add_id_to_df(
     df: pd.DataFrame,
-    column_name: str,
+    column_name: str = "article_id",
     # suffix: str,
     insert_index: bool = True
 ) -> pd.DataFrame:
     """
-    Adds a unique identifier column to a DataFrame based on row index.
+    Adds a unique identifier column to a DataFrame.
 
-    Optionally resets the index before assigning IDs. Useful for downstream tracking or merging.
+    Existing IDs in `column_name` are kept unchanged, so frames written by the
+    scrapers keep joining with the checkpoint, sentiment and rollup outputs.
+    Only rows without an ID get one. If the frame has a "url" column, the
+    derived ID is the canonical-URL ID from `corpus/article_ids.py`, the same
+    one `scrape_article_full` gives; otherwise it falls back to the row index,
+    optionally resetting the index first.
 
     Parameters:
         df (pd.DataFrame): The original DataFrame.
-        column_name (str): Name of the new identifier column.
+        column_name (str): Name of the identifier column.
         insert_index (bool): Whether to drop and reassign index before creating the ID column.
 
     Returns:
-        pd.DataFrame: Modified DataFrame with the new identifier column.
+        pd.DataFrame: Modified DataFrame with the identifier column filled in.
     """
     df_copy = df.copy()
 
     df_copy = df_copy.reset_index(drop=insert_index)
 
-    df_copy[f"{column_name}"] = df_copy.index
+    if column_name in df_copy.columns:
+        missing = df_copy[column_name].isna()
+    else:
+        missing = pd.Series(True, index=df_copy.index)
+
+    if not missing.any():
+        return df_copy
+
+    if "url" in df_copy.columns:
+        rows = df_copy[missing]
+        derived = pd.Series([make_article_id(u) for u in rows["url"]], index=rows.index)
+    else:
+        derived = pd.Series(df_copy.index[missing], index=df_copy.index[missing])
+
+    if column_name in df_copy.columns:
+        df_copy[column_name] = df_copy[column_name].where(~missing, derived).astype("int64")
+    else:
+        df_copy[column_name] = derived.astype("int64")
+
+    return df_copy
 
 
 def load_cleaned_progress(
@@ -358,12 +729,18 @@ def load_cleaned_progress(
     """
     Loads a previously saved loanword refinement CSV and parses its JSON-formatted columns.
 
+    A Parquet copy (see `corpus_store.convert_csv_to_parquet`) already stores the
+    loanword columns as native lists and is returned without any parsing.
+
     Parameters:
-        csv_path (str): Path to the saved CSV file.
+        csv_path (str): Path to the saved CSV (or .parquet) file.
 
     Returns:
         pd.DataFrame: DataFrame with properly loaded and parsed JSON columns.
     """
+    if csv_path.endswith(".parquet"):
+        return pd.read_parquet(csv_path)
+
     df = pd.read_csv(csv_path)
     df["excluded_loanwords"] = df["excluded_loanwords"].apply(json.loads)
     df["refined_loanwords"] = df["refined_loanwords"].apply(json.loads)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+import pandas as pd
+
+# === CONFIGURATION ===
+METRICS_LOG = "llm_metrics.jsonl"
+METRICS_MAX_BYTES = 20 * 1024 * 1024
+METRICS_BACKUP_COUNT = 5
+# Ollama reports durations in nanoseconds
+DURATION_FIELDS = ["total_duration", "load_duration",
+                   "prompt_eval_duration", "eval_duration"]
+COUNT_FIELDS = ["prompt_eval_count", "eval_count"]
+# Typical for German text with Mistral/Llama tokenizers
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+_metrics_logger = logging.getLogger("llm_metrics")
+_metrics_logger.setLevel(logging.INFO)
+_metrics_logger.propagate = False
+
+_events_lock = threading.Lock()
+_events = defaultdict(list)
+# Running prompt size totals for `observed_chars_per_token`
+_prompt_totals = {"calls": 0, "chars": 0, "tokens": 0}
+
+
+def configure_metrics_log(
+    log_path: str = METRICS_LOG,
+    max_bytes: int = METRICS_MAX_BYTES,
+    backup_count: int = METRICS_BACKUP_COUNT
+) -> None:
+    """
+    Points the metrics event stream at a rotating JSONL file.
+
+    Replaces any previously configured metrics handler, so it can be called again
+    to move the log (e.g. per run) without duplicating events.
+
+    Parameters:
+        log_path (str): Path of the JSONL file (default is "llm_metrics.jsonl").
+        max_bytes (int): Size at which the file is rotated.
+        backup_count (int): Number of rotated files to keep.
+    """
+    for handler in list(_metrics_logger.handlers):
+        _metrics_logger.removeHandler(handler)
+        handler.close()
+
+    handler = RotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _metrics_logger.addHandler(handler)
+
+
+def record_llm_call(
+    task: str,
+    model: str,
+    response=None,
+    latency: float = 0.0,
+    retries: int = 0,
+    error: Optional[str] = None,
+    prompt_chars: Optional[int] = None,
+    cache_hit: Optional[bool] = None
+) -> dict:
+    """
+    Records one LLM call as a structured metrics event.
+
+    The event is written to the rotating JSONL log (if configured) and kept in the
+    in-process aggregates used by `summarise_llm_metrics`.
+
+    Parameters:
+        task (str): Name of the enrichment task (e.g. "classify_tone").
+        model (str): The Ollama model that served the call.
+        response (optional): The raw Ollama response; token counts and durations are read from it.
+        latency (float): Client-side wall time of the call in seconds, including retries.
+        retries (int): Number of failed attempts before the final one.
+        error (str, optional): Error message if the call ultimately failed.
+        prompt_chars (int, optional): Length of the prompt in characters.
+        cache_hit (bool, optional): Whether the prompt was served from Ollama's prompt
+            cache. By default derived from the response: a successful call that
+            evaluated no prompt tokens (`prompt_eval_count` missing or 0) reused the
+            cached prompt, e.g. when the same article is asked again.
+
+    Returns:
+        dict: The recorded event.
+    """
+    event = {
+        "ts": time.time(),
+        "task": task,
+        "model": model,
+        "latency_s": round(latency, 6),
+        "retries": retries,
+        "error": error,
+        "prompt_chars": prompt_chars,
+    }
+
+    for field in COUNT_FIELDS:
+        value = response.get(field) if response is not None else None
+        event[field] = int(value) if value is not None else None
+
+    for field in DURATION_FIELDS:
+        value = response.get(field) if response is not None else None
+        event[field.replace("_duration", "_s")] = (
+            round(value / 1e9, 6) if value is not None else None)
+
+    if cache_hit is None:
+        cache_hit = response is not None and error is None and not event["prompt_eval_count"]
+    event["cache_hit"] = cache_hit
+
+    with _events_lock:
+        _events[task].append(event)
+        if prompt_chars and event["prompt_eval_count"]:
+            _prompt_totals["calls"] += 1
+            _prompt_totals["chars"] += prompt_chars
+            _prompt_totals["tokens"] += event["prompt_eval_count"]
+
+    if _metrics_logger.handlers:
+        _metrics_logger.info(json.dumps(event, ensure_ascii=False))
+
+    return event
+
+
+def observed_chars_per_token(default: float = DEFAULT_CHARS_PER_TOKEN, min_calls: int = 20) -> float:
+    """
+    Estimates characters per model token from the calls recorded so far.
+
+    Ollama reports the exact `prompt_eval_count` for every prompt, so the ratio of
+    prompt characters to prompt tokens calibrates token estimates to the model
+    actually in use.
+
+    Parameters:
+        default (float): Ratio to use until enough calls have been recorded.
+        min_calls (int): Minimum number of usable calls before trusting the observed ratio.
+
+    Returns:
+        float: Characters per token.
+    """
+    with _events_lock:
+        calls, chars, tokens = (_prompt_totals["calls"], _prompt_totals["chars"],
+                                _prompt_totals["tokens"])
+
+    if calls < min_calls:
+        return default
+    return chars / tokens
+
+
+def reset_llm_metrics() -> None:
+    """
+    Clears the in-process aggregates (the JSONL log is left untouched).
+    """
+    with _events_lock:
+        _events.clear()
+        for key in _prompt_totals:
+            _prompt_totals[key] = 0
+
+
+def _percentile(values: list[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarise_llm_metrics(cold_load_threshold: float = 0.5) -> pd.DataFrame:
+    """
+    Aggregates the recorded LLM calls per task.
+
+    Parameters:
+        cold_load_threshold (float): `load_duration` in seconds above which a call
+            counts as a cold model load (default is 0.5).
+
+    Returns:
+        pd.DataFrame: One row per task with call/error/retry/prompt-cache-hit
+        counts, p50/p95 latency, token totals, eval tokens/sec, total load
+        time and cold loads, sorted by total latency so the most expensive
+        task comes first.
+    """
+    with _events_lock:
+        snapshot = {task: list(events) for task, events in _events.items()}
+
+    rows = []
+    for task, events in snapshot.items():
+        served = [e for e in events if not e["error"]]
+        latencies = [e["latency_s"] for e in served]
+        eval_tokens = sum(e["eval_count"] or 0 for e in served)
+        eval_seconds = sum(e["eval_s"] or 0 for e in served)
+        load_seconds = [e["load_s"] or 0 for e in served]
+
+        rows.append({
+            "task": task,
+            "calls": len(events),
+            "errors": sum(1 for e in events if e["error"]),
+            "retries": sum(e["retries"] for e in events),
+            "cache_hits": sum(1 for e in served if e["cache_hit"]),
+            "p50_latency_s": _percentile(latencies, 50),
+            "p95_latency_s": _percentile(latencies, 95),
+            "total_latency_s": round(sum(latencies), 3),
+            "prompt_tokens": sum(e["prompt_eval_count"] or 0 for e in served),
+            "eval_tokens": eval_tokens,
+            "eval_tokens_per_s": round(eval_tokens / eval_seconds, 2) if eval_seconds else None,
+            "load_s": round(sum(load_seconds), 3),
+            "cold_loads": sum(1 for s in load_seconds if s > cold_load_threshold),
+        })
+
+    if not rows:
+        return pd.DataFrame(columns=["task", "calls"])
+
+    return pd.DataFrame(rows).sort_values("total_latency_s", ascending=False).reset_index(drop=True)
+
+
+def load_metrics_log(log_path: str = METRICS_LOG) -> pd.DataFrame:
+    """
+    Loads a metrics JSONL file (e.g. from an earlier background run) into a DataFrame.
+
+    Parameters:
+        log_path (str): Path to the JSONL file.
+
+    Returns:
+        pd.DataFrame: One row per recorded LLM call.
+    """
+    return pd.read_json(log_path, lines=True)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# === LATENCY PROFILES ===
+# Rough stand-ins for the hardware we actually run on. Rates are tokens/sec,
+# load_seconds is the cold-start cost paid when a model is not resident.
+PROFILES = {
+    "instant": {
+        "load_seconds": 0.0,
+        "prompt_tokens_per_sec": 0.0,
+        "eval_tokens_per_sec": 0.0,
+        "jitter": 0.0,
+    },
+    "cpu_7b": {
+        "load_seconds": 4.0,
+        "prompt_tokens_per_sec": 60.0,
+        "eval_tokens_per_sec": 8.0,
+        "jitter": 0.1,
+    },
+    "gpu_7b": {
+        "load_seconds": 1.5,
+        "prompt_tokens_per_sec": 1500.0,
+        "eval_tokens_per_sec": 60.0,
+        "jitter": 0.05,
+    },
+}
+
+# === RESPONSE TEMPLATES ===
+# The first template whose trigger appears in the user prompt wins.
+# "{choice:a|b|c}" is resolved deterministically from the prompt hash.
+RESPONSE_TEMPLATES = [
+    ("formal or informal tone", "{choice:formal|informal}"),
+    ("Classify the following article",
+     "{choice:business|technology|lifestyle|politics|culture}"),
+    ("Summarise the German article",
+     "Der Artikel beschreibt aktuelle Entwicklungen. "
+     "Er nennt Hintergründe und Folgen. Abschließend wird ein Ausblick gegeben."),
+    ("Summarise this part of a German article",
+     "Dieser Abschnitt beschreibt einen Teil der Entwicklung."),
+    ("Summarise the whole article",
+     "Der Artikel beschreibt aktuelle Entwicklungen. "
+     "Er nennt Hintergründe und Folgen. Abschließend wird ein Ausblick gegeben."),
+    ("List the English words used in this part",
+     "startup (Unternehmensgründung), meeting (Besprechung)"),
+    ("Why does the article use English words",
+     "The English terms signal a modern, international business context "
+     "aimed at a young, digitally literate audience."),
+    ("Why does this German article use English words",
+     "The English terms signal a modern, international business context "
+     "aimed at a young, digitally literate audience."),
+    ("marketing or advertising context", "startup, brand, sale"),
+    ("cultural influence",
+     '{"countries": ["{choice:USA|UK|Germany}"], '
+     '"reason": "The article references cultural trends from this country."}'),
+    ("generic UI or boilerplate terms", "newsletter, tracking, footer"),
+]
+DEFAULT_RESPONSE = "ok"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of model tokens in a text.
+
+    Uses the common rule of thumb of roughly four characters per token, which is
+    close enough for latency simulation and avoids pulling in a tokenizer.
+
+    Parameters:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count (at least 1 for non-empty text).
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+def render_response(prompt: str) -> str:
+    """
+    Picks and renders the templated response for a prompt.
+
+    Parameters:
+        prompt (str): The user prompt sent to the mock model.
+
+    Returns:
+        str: The deterministic response text for this prompt.
+    """
+    seed = int(hashlib.md5(prompt.encode("utf-8")).hexdigest(), 16)
+
+    for trigger, template in RESPONSE_TEMPLATES:
+        if trigger in prompt:
+            response = template
+            while "{choice:" in response:
+                start = response.index("{choice:")
+                end = response.index("}", start)
+                options = response[start + len("{choice:"):end].split("|")
+                response = response[:start] + \
+                    options[seed % len(options)] + response[end + 1:]
+            return response
+
+    return DEFAULT_RESPONSE
+
+
+class MockOllamaState:
+    """
+    Holds the configuration and the simulated model residency of the mock server.
+
+    Shared between handler threads, so all mutations go through `lock`.
+    """
+
+    def __init__(
+        self,
+        profile: str = "instant",
+        error_rate: float = 0.0,
+        default_keep_alive: float = 300.0,
+        seed: Optional[int] = None
+    ):
+        self.profile = dict(PROFILES[profile])
+        self.profile_name = profile
+        self.error_rate = error_rate
+        self.default_keep_alive = default_keep_alive
+        self.resident = {}
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+
+    def claim_model(self, model: str, keep_alive) -> float:
+        """
+        Marks a model as resident and returns the load time this request must pay.
+
+        Parameters:
+            model (str): The model name requested.
+            keep_alive: Seconds (or an Ollama duration string such as "30m") to keep
+                the model loaded after this request; 0 unloads immediately.
+
+        Returns:
+            float: Simulated load duration in seconds (0.0 if already resident).
+        """
+        now = time.monotonic()
+        keep_seconds = parse_keep_alive(keep_alive, self.default_keep_alive)
+
+        with self.lock:
+            self.request_count += 1
+            expires_at = self.resident.get(model)
+            cold = expires_at is None or (expires_at >= 0 and expires_at < now)
+            if keep_seconds < 0:
+                self.resident[model] = -1
+            elif keep_seconds == 0:
+                self.resident.pop(model, None)
+            else:
+                self.resident[model] = now + keep_seconds
+
+        return self.profile["load_seconds"] if cold else 0.0
+
+    def jittered(self, seconds: float) -> float:
+        """
+        Applies the profile's multiplicative jitter to a duration.
+        """
+        jitter = self.profile["jitter"]
+        if not jitter or seconds <= 0:
+            return seconds
+        with self.lock:
+            factor = self.rng.uniform(1 - jitter, 1 + jitter)
+        return seconds * factor
+
+
+def parse_keep_alive(value, default: float) -> float:
+    """
+    Converts an Ollama keep_alive value into seconds.
+
+    Accepts numbers (seconds) and duration strings like "90s", "5m" or "1h".
+    Negative values mean "keep loaded indefinitely".
+
+    Parameters:
+        value: The keep_alive value from the request body, or None.
+        default (float): Value to use when the request does not set keep_alive.
+
+    Returns:
+        float: The keep-alive in seconds.
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    text = str(value).strip()
+    for suffix in ("ms", "s", "m", "h"):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * units[suffix]
+    return float(text)
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    """
+    Request handler implementing the subset of the Ollama HTTP API we use.
+    """
+
+    server_version = "MockOllama/0.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        return
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/api/tags":
+            self._send_json({"models": []})
+        elif self.path == "/api/ps":
+            with state.lock:
+                models = [{"name": m, "model": m} for m in state.resident]
+            self._send_json({"models": models})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = self._read_json()
+
+        if self.path == "/api/chat":
+            messages = body.get("messages") or []
+            prompt = "\n".join(m.get("content", "")
+                               for m in messages if isinstance(m, dict))
+            self._complete(body, prompt, chat=True)
+        elif self.path == "/api/generate":
+            self._complete(body, body.get("prompt", ""), chat=False)
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _complete(self, body: dict, prompt: str, chat: bool):
+        state = self.server.state
+        model = body.get("model", "mistral")
+        options = body.get("options") or {}
+        started = time.perf_counter()
+
+        with state.lock:
+            fail = state.error_rate and state.rng.random() < state.error_rate
+        if fail:
+            self._send_json({"error": "simulated server error"}, status=500)
+            return
+
+        load_duration = state.jittered(
+            state.claim_model(model, body.get("keep_alive")))
+
+        # An empty generate request is Ollama's way of loading a model
+        if not prompt:
+            time.sleep(load_duration)
+            payload = {
+                "model": model,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "done": True,
+                "done_reason": "load",
+                "load_duration": int(load_duration * 1e9),
+            }
+            if chat:
+                payload["message"] = {"role": "assistant", "content": ""}
+            else:
+                payload["response"] = ""
+            self._send_json(payload)
+            return
+
+        content = render_response(prompt)
+        num_predict = options.get("num_predict")
+        if num_predict and num_predict > 0:
+            content = content[:int(num_predict) * 4]
+
+        prompt_tokens = estimate_tokens(prompt)
+        eval_tokens = estimate_tokens(content)
+
+        prompt_rate = state.profile["prompt_tokens_per_sec"]
+        eval_rate = state.profile["eval_tokens_per_sec"]
+        prompt_eval_duration = state.jittered(
+            prompt_tokens / prompt_rate if prompt_rate else 0.0)
+        eval_duration = state.jittered(
+            eval_tokens / eval_rate if eval_rate else 0.0)
+
+        time.sleep(load_duration + prompt_eval_duration + eval_duration)
+        total_duration = time.perf_counter() - started
+
+        payload = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int(total_duration * 1e9),
+            "load_duration": int(load_duration * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_eval_duration * 1e9),
+            "eval_count": eval_tokens,
+            "eval_duration": int(eval_duration * 1e9),
+        }
+        if chat:
+            payload["message"] = {"role": "assistant", "content": content}
+        else:
+            payload["response"] = content
+        self._send_json(payload)
+
+
+def start_mock_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    profile: str = "instant",
+    error_rate: float = 0.0,
+    seed: Optional[int] = None
+) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Starts the mock Ollama server on a background thread.
+
+    Parameters:
+        host (str): Interface to bind to (default is localhost).
+        port (int): Port to bind to; 0 picks a free port.
+        profile (str): Name of the latency profile in `PROFILES`.
+        error_rate (float): Fraction of requests answered with HTTP 500.
+        seed (int, optional): Seed for jitter and error injection.
+
+    Returns:
+        tuple: The running server and its base URL, suitable for OLLAMA_HOST.
+    """
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown profile '{profile}', choose from {sorted(PROFILES)}")
+
+    server = ThreadingHTTPServer((host, port), MockOllamaHandler)
+    server.daemon_threads = True
+    server.state = MockOllamaState(
+        profile=profile, error_rate=error_rate, seed=seed)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Ollama /api/chat endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--profile", default="cpu_7b", choices=sorted(PROFILES))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server, url = start_mock_server(
+        host=args.host, port=args.port, profile=args.profile,
+        error_rate=args.error_rate, seed=args.seed)
+    print(f"🚀 Mock Ollama ({args.profile}) listening on {url}")
+    print(f"   export OLLAMA_HOST={url}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("👋 Mock Ollama stopped.")
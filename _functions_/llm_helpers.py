@@ -201,15 +201,3 @@ def enrich_article_and_create_dataframe(
 
     return pd.DataFrame(results)
 
-
-def add_id_to_df(
-        df: pd.DataFrame,
-        column_name: str,
-        #suffix: str,
-        insert_index: bool = True
-) -> pd.DataFrame:
-    df_copy = df.copy()
-
-    df_copy = df_copy.reset_index(drop=insert_index)
-
-    df_copy[f"{column_name}"] = df_copy.index
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Callable, Iterator, Union
+
+# === CONFIGURATION ===
+# Characters of an article sent to the sentiment model (its 512-token limit)
+SENTIMENT_CHARS = 516
+# Loanword candidates: ASCII-only alphabetic tokens of at least this length
+MIN_CANDIDATE_LENGTH = 4
+
+# Token flags
+ALPHA = 1
+STOP = 2
+SPACE = 4
+
+
+class ArticleDoc:
+    """
+    One article tokenised once, shared by word count, loanword detection,
+    loanword statistics and sentiment truncation.
+
+    Tokens are stored as offsets into `text` (no token strings are kept):
+    `starts` and `lengths` are `array("I")`, `flags` an `array("B")` of
+    ALPHA/STOP/SPACE bits. `candidates` holds the indices of loanword
+    candidates (ASCII alphabetic, non-stop, >= 4 letters) and `loanwords` the
+    indices `detect_loanwords` confirmed as English.
+
+    Build it with `ArticleDoc.build(text, nlp.tokenizer)`: stop and alpha flags
+    are lexical attributes, so the tokenizer alone gives the same tokens as
+    the full spaCy pipeline without running tagger, parser and NER.
+    """
+    __slots__ = ("text", "starts", "lengths", "flags", "word_count", "candidates", "loanwords")
+
+    def __init__(self, text: str, starts: array, lengths: array, flags: array, word_count: int, candidates: array):
+        self.text = text
+        self.starts = starts
+        self.lengths = lengths
+        self.flags = flags
+        self.word_count = word_count
+        self.candidates = candidates
+        self.loanwords = array("I")
+
+    @classmethod
+    def build(cls, text: str, tokenizer: Callable) -> "ArticleDoc":
+        """
+        Tokenises `text` in a single pass.
+
+        `word_count` counts whitespace-separated words (as `len(text.split())`):
+        a word starts at every non-space token that does not touch the previous one.
+
+        Parameters:
+            text (str): The article text.
+            tokenizer (Callable): A spaCy tokenizer (`nlp.tokenizer`) or pipeline.
+
+        Returns:
+            ArticleDoc: The tokenised article.
+        """
+        starts, lengths, flags, candidates = array("I"), array("I"), array("B"), array("I")
+        word_count = 0
+        previous_end = -1
+        for i, token in enumerate(tokenizer(text)):
+            word = token.text
+            start = token.idx
+            starts.append(start)
+            lengths.append(len(word))
+            if token.is_space:
+                flags.append(SPACE)
+                continue
+            if start != previous_end:
+                word_count += 1
+            previous_end = start + len(word)
+            flag = (ALPHA if token.is_alpha else 0) | (STOP if token.is_stop else 0)
+            flags.append(flag)
+            if flag == ALPHA and len(word) >= MIN_CANDIDATE_LENGTH and word.isascii():
+                candidates.append(i)
+        return cls(text, starts, lengths, flags, word_count, candidates)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def token(self, i: int) -> str:
+        start = self.starts[i]
+        return self.text[start:start + self.lengths[i]]
+
+    def iter_candidates(self) -> Iterator[tuple[int, str]]:
+        """
+        Yields (token index, text) of the loanword candidates.
+        """
+        for i in self.candidates:
+            yield i, self.token(i)
+
+    def iter_loanwords(self) -> Iterator[str]:
+        """
+        Yields the detected loanwords, lower-cased, in text order.
+        """
+        for i in self.loanwords:
+            yield self.token(i).lower()
+
+    @property
+    def loanword_count(self) -> int:
+        return len(self.loanwords)
+
+    @property
+    def loanword_density(self) -> float:
+        return len(self.loanwords) / self.word_count if self.word_count else 0
+
+    def top_loanwords(self, n: int = 3) -> list[str]:
+        return [word for word, _ in Counter(self.iter_loanwords()).most_common(n)]
+
+    def all_loanwords(self) -> list[str]:
+        return list(set(self.iter_loanwords()))
+
+    def sentiment_text(self, max_chars: int = SENTIMENT_CHARS) -> str:
+        """
+        The first `max_chars` characters, cut at the end of the last whole token.
+        """
+        if len(self.text) <= max_chars:
+            return self.text
+        i = bisect_right(self.starts, max_chars) - 1
+        while i > 0 and self.starts[i] + self.lengths[i] > max_chars:
+            i -= 1
+        end = self.starts[i] + self.lengths[i] if i >= 0 else 0
+        return self.text[:end if end <= max_chars else max_chars]
+
+
+def sentiment_text(text: Union[str, ArticleDoc], max_chars: int = SENTIMENT_CHARS) -> str:
+    """
+    The sentiment model input of an article (document or plain text).
+    """
+    if isinstance(text, ArticleDoc):
+        return text.sentiment_text(max_chars)
+    return text[:max_chars]
@@ -3,16 +3,25 @@
 # pylint: skip-file
 
 
+import os
+import sys
 import pandas as pd
 import logging
 from sentiment_helpers import batch_analyse_sentiment_fast
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from rollups import ROLLUP_KEYS, ROLLUP_PATH, update_rollups
+from text_store import open_text_store
+from article_ids import assign_article_ids
+
 # === CONFIGURATION ===
-INPUT_CSV = "scraped_articles_clean_v1"
-OUTPUT_CSV = "scraped_articles_enriched.csv"
+# Paths can be passed on the command line: run_sentiment_batch.py [input_csv] [output_csv]
+INPUT_CSV = sys.argv[1] if len(sys.argv) > 1 else "scraped_articles_clean_v1"
+OUTPUT_CSV = sys.argv[2] if len(sys.argv) > 2 else "scraped_articles_enriched.csv"
 TEXT_COLUMN = "text"
 BATCH_SIZE = 32
 LOG_FILE = "sentiment_batch.log"
+WRITE_CHUNK = 5_000
 
 
 # === LOGGING SETUP ===
@@ -27,18 +36,54 @@ logging.info("Sentiment batch enrichment started")
 
 
 # === LOAD DATA ===
-logging.info("Loading input CSV")
-df = pd.read_csv(INPUT_CSV)
+input_columns = list(pd.read_csv(INPUT_CSV, nrows=0).columns)
+text_position = input_columns.index(TEXT_COLUMN)
+if "article_id" in input_columns:
+    # Texts stay in the memory-mapped text store; the frame only holds the other columns
+    logging.info("Opening text store")
+    store = open_text_store(INPUT_CSV, text_column=TEXT_COLUMN)
+    logging.info("Loading input CSV")
+    df = pd.read_csv(INPUT_CSV, usecols=lambda column: column != TEXT_COLUMN)
+    texts = None
+else:
+    # Older scrapes have no IDs: derive them from the URL, as the scraper does (texts then stay in memory)
+    logging.info("Loading input CSV and deriving article IDs")
+    store = None
+    df = assign_article_ids(pd.read_csv(INPUT_CSV), text_column=TEXT_COLUMN)
+    texts = df.pop(TEXT_COLUMN).fillna("").astype(str).tolist()
+
+
+def texts_for(rows: pd.DataFrame, start: int = 0) -> list:
+    return store.texts_for(rows["article_id"])[:] if store is not None else texts[start:start + len(rows)]
 
 
 # === RUN SENTIMENT PIPELINE ===
+# Labels from an earlier run, if the input has them; only changes go into the rollups
+previous_sentiment = df["sentiment"].copy() if "sentiment" in df.columns else None
 logging.info("Running fast sentiment analysis...")
 df = batch_analyse_sentiment_fast(
-    df, text_column=TEXT_COLUMN, new_column="sentiment", batch_size=BATCH_SIZE
+    df, new_column="sentiment", batch_size=BATCH_SIZE,
+    texts=store.texts_for(df["article_id"]) if store is not None else texts
 )
 
 
+# === UPDATE DENSITY ROLLUPS ===
+# Rollups are keyed by article_id: the stored contribution of each article is replaced.
+# Only articles that are new to this run or whose label changed are passed on
+changed = df["sentiment"].ne(previous_sentiment) if previous_sentiment is not None \
+    else pd.Series(True, index=df.index)
+rollup_columns = [c for c in df.columns
+                  if c in ["article_id"] + ROLLUP_KEYS + ["loanword_density", "loanword_count", "word_count"]]
+if changed.any() and update_rollups(added=df.loc[changed, rollup_columns], path=ROLLUP_PATH) is not None:
+    logging.info(f"Moved {int(changed.sum())} articles to their new sentiment in {ROLLUP_PATH}")
+
+
 # === SAVE OUTPUT ===
 logging.info("Saving output to CSV")
-df.to_csv(OUTPUT_CSV, index=False)
+columns = list(df.columns)
+columns.insert(min(text_position, len(columns)), TEXT_COLUMN)
+for i in range(0, len(df), WRITE_CHUNK):
+    chunk = df.iloc[i:i+WRITE_CHUNK]
+    chunk = chunk.assign(**{TEXT_COLUMN: texts_for(chunk, i)})[columns]
+    chunk.to_csv(OUTPUT_CSV, mode="w" if i == 0 else "a", header=i == 0, index=False)
 logging.info(f"Done! Output saved to {OUTPUT_CSV}")
@@ -5,7 +5,7 @@
 from transformers import pipeline
 import pandas as pd 
 from tqdm import tqdm
-from typing import List, Optional
+from typing import List, Optional, Sequence
 import numpy as np 
 
 sentiment_model = pipeline(
@@ -50,10 +50,13 @@ def batch_analyse_sentiment_fast(
     df: pd.DataFrame,
     text_column: str = "text",
     new_column: str = "sentiment",
-    batch_size: int = 32
+    batch_size: int = 32,
+    texts: Optional[Sequence[str]] = None
 ) -> pd.DataFrame:
     sentiments = []
-    texts = df[text_column].fillna("").astype(str).tolist()
+    # `texts` (e.g. a text store sequence) replaces df[text_column], one batch decoded at a time
+    if texts is None:
+        texts = df[text_column].fillna("").astype(str).tolist()
 
     for i in tqdm(range(0, len(texts), batch_size), desc="Batch Sentiment Analysis"):
         batch = texts[i:i+batch_size]
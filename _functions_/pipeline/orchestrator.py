@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from article_ids import merge_on_id
+
+logger = logging.getLogger("pipeline")
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step: a function from changed input rows to output rows.
+
+    `func(rows, **params)` receives only the rows whose fingerprint changed
+    (the first input left-joined with the others on `key`) and returns the
+    output rows for them; it may return fewer rows (e.g. filtering) or none.
+
+    Attributes:
+        name (str): Stage name, also the dataset name of its output.
+        func (Callable): The stage function.
+        inputs (list[str]): Source datasets or upstream stages; the first one drives the rows.
+        key (str): Row key shared by inputs and output (default is "article_id").
+        fingerprint_columns (list[str], optional): Input columns the output depends on
+            (default is all joined input columns).
+        params (dict): Keyword arguments for `func`, part of the fingerprint.
+        incremental (bool): Recompute only changed rows; otherwise rerun on every change.
+        retry_missing (bool): Input rows missing from the output are failures (e.g.
+            failed scrapes), not filtered rows: their fingerprints are not kept, so
+            the next run retries them.
+    """
+    name: str
+    func: Callable[..., pd.DataFrame]
+    inputs: list[str]
+    key: str = "article_id"
+    fingerprint_columns: Optional[list[str]] = None
+    params: dict = field(default_factory=dict)
+    incremental: bool = True
+    retry_missing: bool = False
+
+
+def code_version(func: Callable) -> str:
+    """
+    Hashes the source of a stage function, so editing it invalidates its outputs.
+    (Bump a parameter to invalidate a stage after changing a helper it calls.)
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__qualname__
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def stage_fingerprint(stage: Stage) -> str:
+    """
+    Combines code version and parameters into the stage-level fingerprint.
+    """
+    params = json.dumps(stage.params, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{code_version(stage.func)}\n{params}".encode("utf-8"),
+                           digest_size=8).hexdigest()
+
+
+def row_fingerprints(df: pd.DataFrame, columns: list[str], stage_hash: str) -> np.ndarray:
+    """
+    Hashes the fingerprinted columns of every row together with the stage fingerprint.
+
+    Object columns (texts, loanword lists) are hashed via their string form, so
+    list cells can be fingerprinted as well.
+
+    Returns:
+        np.ndarray: One int64 fingerprint per row.
+    """
+    values = df[columns].copy()
+    for column in columns:
+        if values[column].dtype == object:
+            values[column] = values[column].map(
+                lambda v: str(v.tolist()) if isinstance(v, np.ndarray) else str(v))
+    values["_stage"] = stage_hash
+    return pd.util.hash_pandas_object(values, index=False).to_numpy().view(np.int64)
+
+
+def read_dataset(path: str) -> pd.DataFrame:
+    """
+    Reads a CSV, Parquet or plain-text (one URL per line) dataset.
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".txt"):
+        with open(path, encoding="utf-8") as f:
+            return pd.DataFrame({"url": [line.strip() for line in f if line.strip()]})
+    return pd.read_csv(path)
+
+
+class Pipeline:
+    """
+    A DAG of stages over source datasets with per-row incremental recompute.
+
+    Every stage writes `<workdir>/<name>.parquet` and keeps the fingerprint of
+    each input row it processed in `<workdir>/<name>.state.parquet`. On the
+    next run only rows that are new or whose fingerprint (input columns, code
+    version, parameters) changed are recomputed; rows that disappeared from the
+    input are dropped from the output. Stages whose inputs are ready run
+    concurrently.
+    """
+
+    def __init__(self, sources: dict[str, str], stages: list[Stage], workdir: str = "pipeline_data"):
+        self.sources = sources
+        self.stages = {stage.name: stage for stage in stages}
+        self.workdir = workdir
+        for stage in stages:
+            unknown = [i for i in stage.inputs if i not in sources and i not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name!r} has unknown inputs: {unknown}")
+
+    # === DATASETS ===
+
+    def output_path(self, name: str) -> str:
+        return os.path.join(self.workdir, f"{name}.parquet")
+
+    def _state_path(self, name: str) -> str:
+        return os.path.join(self.workdir, f"{name}.state.parquet")
+
+    def read(self, name: str) -> pd.DataFrame:
+        """
+        Reads a source dataset or the current output of a stage.
+        """
+        return read_dataset(self.sources[name] if name in self.sources else self.output_path(name))
+
+    def _inputs(self, stage: Stage) -> pd.DataFrame:
+        frames = [self.read(name) for name in stage.inputs]
+        rows = frames[0].drop_duplicates(subset=stage.key, keep="last")
+        for other in frames[1:]:
+            if stage.key == "article_id":
+                rows = merge_on_id(rows, other, how="left")
+            else:
+                other = other[[stage.key] + [c for c in other.columns if c not in rows.columns]]
+                rows = rows.merge(other.drop_duplicates(subset=stage.key, keep="last"),
+                                  on=stage.key, how="left")
+        return rows.reset_index(drop=True)
+
+    # === PLANNING ===
+
+    def order(self, targets: Optional[list[str]] = None) -> list[str]:
+        """
+        Returns the stages needed for `targets` (default is all) in dependency order.
+        """
+        ordered, seen = [], set()
+
+        def visit(name: str, path: tuple) -> None:
+            if name in path:
+                raise ValueError(f"Cycle in pipeline: {' -> '.join(path + (name,))}")
+            if name in seen or name not in self.stages:
+                return
+            for upstream in self.stages[name].inputs:
+                visit(upstream, path + (name,))
+            seen.add(name)
+            ordered.append(name)
+
+        for name in targets or list(self.stages):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name!r}")
+            visit(name, ())
+        return ordered
+
+    def changes(self, name: str, force: bool = False) -> tuple[pd.DataFrame, np.ndarray, pd.Index]:
+        """
+        Determines which input rows of a stage must be recomputed.
+
+        Returns:
+            tuple: The joined input rows, a boolean "changed" mask over them and
+            the keys that disappeared since the last run.
+        """
+        stage = self.stages[name]
+        rows = self._inputs(stage)
+        columns = stage.fingerprint_columns or list(rows.columns)
+        columns = [c for c in columns if c in rows.columns]
+        fingerprints = row_fingerprints(rows, columns, stage_fingerprint(stage))
+
+        state_path = self._state_path(name)
+        if force or not os.path.exists(state_path) or not os.path.exists(self.output_path(name)):
+            return rows.assign(_fingerprint=fingerprints), np.ones(len(rows), dtype=bool), pd.Index([])
+
+        state = pd.read_parquet(state_path)
+        previous = pd.Series(state["fingerprint"].to_numpy(), index=state[stage.key])
+        changed = previous.reindex(rows[stage.key]).to_numpy() != fingerprints
+        removed = previous.index.difference(pd.Index(rows[stage.key]))
+        if not stage.incremental and (changed.any() or len(removed)):
+            changed[:] = True
+        return rows.assign(_fingerprint=fingerprints), changed, removed
+
+    # === EXECUTION ===
+
+    def run_stage(self, name: str, force: bool = False) -> dict:
+        """
+        Brings one stage up to date, recomputing only changed rows.
+
+        Returns:
+            dict: Stage name, rows recomputed, rows removed, output rows and seconds.
+        """
+        stage = self.stages[name]
+        start = time.perf_counter()
+        rows, changed, removed = self.changes(name, force=force)
+        report = {"stage": name, "recomputed": int(changed.sum()), "removed": len(removed)}
+
+        if not changed.any() and not len(removed):
+            logger.info(f"{name}: up to date")
+            return {**report, "rows": None, "seconds": time.perf_counter() - start}
+
+        todo = rows[changed]
+        logger.info(f"{name}: recomputing {len(todo)} rows, removing {len(removed)}")
+        result = stage.func(todo.drop(columns="_fingerprint"), **stage.params)
+
+        output_path = self.output_path(name)
+        dropped = pd.Index(todo[stage.key]).append(removed)
+        if os.path.exists(output_path) and stage.incremental and not force:
+            existing = pd.read_parquet(output_path)
+            existing = existing[~existing[stage.key].isin(dropped)]
+            result = pd.concat([existing, result], ignore_index=True) if len(result) else existing
+
+        # Output and state are written in key order, so downstream joins are sorted merges
+        if stage.key in result.columns:
+            result = result.sort_values(stage.key, kind="stable").reset_index(drop=True)
+        os.makedirs(self.workdir, exist_ok=True)
+        result.to_parquet(output_path, index=False)
+        if stage.retry_missing:
+            rows = rows[rows[stage.key].isin(result[stage.key])] if stage.key in result.columns else rows.iloc[:0]
+        rows[[stage.key, "_fingerprint"]].rename(columns={"_fingerprint": "fingerprint"}) \
+            .sort_values(stage.key).to_parquet(self._state_path(name), index=False)
+
+        report.update(rows=len(result), seconds=time.perf_counter() - start)
+        logger.info(f"{name}: {report}")
+        return report
+
+    def run(
+        self,
+        targets: Optional[list[str]] = None,
+        force: tuple = (),
+        max_workers: int = 2
+    ) -> list[dict]:
+        """
+        Runs the stages needed for `targets`, independent stages concurrently.
+
+        Parameters:
+            targets (list[str], optional): Stages to bring up to date (default is all).
+            force (tuple): Stages to recompute fully, ignoring fingerprints.
+            max_workers (int): Stages running at the same time.
+
+        Returns:
+            list[dict]: One report per stage, in completion order.
+        """
+        pending = self.order(targets)
+        done, reports, running = set(), [], {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for name in [n for n in pending if all(
+                        i in done or i in self.sources for i in self.stages[n].inputs)]:
+                    pending.remove(name)
+                    running[executor.submit(self.run_stage, name, name in force)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    reports.append(future.result())
+                    done.add(name)
+
+        return reports
+
+    def status(self) -> pd.DataFrame:
+        """
+        Reports, per stage, how many rows a run would recompute (for stages whose inputs exist).
+        """
+        rows = []
+        for name in self.order():
+            stage = self.stages[name]
+            ready = all(os.path.exists(self.sources[i]) if i in self.sources
+                        else os.path.exists(self.output_path(i)) for i in stage.inputs)
+            if not ready:
+                rows.append({"stage": name, "inputs_ready": False, "pending": None, "removed": None})
+                continue
+            _, changed, removed = self.changes(name)
+            rows.append({"stage": name, "inputs_ready": True,
+                         "pending": int(changed.sum()), "removed": len(removed)})
+        return pd.DataFrame(rows)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import logging
+
+from stages import build_pipeline
+from scrape_timing import dump_slowest_profiles, enable_timing, log_timing_summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the scrape -> clean -> quality gate -> loanwords -> sentiment/LLM -> corpus pipeline incrementally.")
+    parser.add_argument("command", choices=["run", "status"], nargs="?", default="run")
+    parser.add_argument("--urls", default="article_urls.txt",
+                        help="URL list (.txt, one per line, or CSV/Parquet with a 'url' column)")
+    parser.add_argument("--workdir", default="pipeline_data", help="Directory for stage outputs")
+    parser.add_argument("--stages", nargs="*", help="Stages to bring up to date (default is all)")
+    parser.add_argument("--force", nargs="*", default=[], help="Stages to recompute fully")
+    parser.add_argument("--workers", type=int, default=2, help="Stages running concurrently")
+    parser.add_argument("--min-words", type=int, default=50)
+    parser.add_argument("--scrape-workers", type=int, default=5)
+    parser.add_argument("--timing", action="store_true", help="Time scrape/NLP phases per article")
+    parser.add_argument("--profile-slowest", type=int, default=0,
+                        help="With --timing, dump cProfile stats of the N slowest articles")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(message)s")
+    if args.timing:
+        enable_timing(profile_slowest=args.profile_slowest)
+    pipeline = build_pipeline(args.urls, args.workdir, min_words=args.min_words,
+                              scrape_workers=args.scrape_workers)
+
+    if args.command == "status":
+        print(pipeline.status().to_string(index=False))
+        return
+
+    reports = pipeline.run(args.stages, force=tuple(args.force), max_workers=args.workers)
+    for report in reports:
+        print(f"{report['stage']:<20} recomputed {report['recomputed']:>6}  "
+              f"removed {report['removed']:>5}  {report['seconds']:.1f}s")
+    if args.timing:
+        log_timing_summary()
+        dump_slowest_profiles()
+
+
+if __name__ == "__main__":
+    main()
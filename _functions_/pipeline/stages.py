@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+from tqdm import tqdm
+
+# The stage modules live in sibling folders and import each other by plain module name
+FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("corpus", "scraping", "nlp", "llm"):
+    path = os.path.abspath(os.path.join(FUNCTIONS_DIR, folder))
+    if path not in sys.path:
+        sys.path.append(path)
+
+from orchestrator import Pipeline, Stage
+from scrape_timing import log_timing_summary, phase
+from boilerplate import save_boilerplate
+from url_canon import dedupe_urls, save_canonical_map
+from quality_gate import QualityGateConfig, quality_checks
+
+# Heavy models (spaCy, transformers, Ollama) are imported inside the stages,
+# so planning and `status` work without loading them.
+
+# Columns the quality stage adds next to the cleaned article columns
+QUALITY_COLUMNS = ["language", "links_per_paragraph", "passed", "reasons"]
+
+
+def canonical_url_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Canonicalises and de-duplicates the URL list, so the scrape stage's state
+    and output are both keyed by canonical URL.
+    """
+    return pd.DataFrame({"url": dedupe_urls(rows["url"])})
+
+
+def scrape_stage(rows: pd.DataFrame, max_workers: int = 5) -> pd.DataFrame:
+    """
+    Scrapes the given (canonical) URLs with `scrape_article_full`.
+    """
+    from scraping_pipeline import scrape_article_full
+
+    urls = rows["url"].tolist()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(tqdm(executor.map(scrape_article_full, urls),
+                            total=len(urls), desc="Scraping"))
+    log_timing_summary()
+    save_boilerplate()
+    save_canonical_map()
+    return pd.DataFrame([r for r in results if r])
+
+
+def clean_stage(rows: pd.DataFrame, min_words: int = 50) -> pd.DataFrame:
+    """
+    Drops articles without usable text and normalises whitespace.
+    """
+    rows = rows.dropna(subset=["text"]).copy()
+    rows["text"] = rows["text"].str.replace(r"\s+", " ", regex=True).str.strip()
+    rows["word_count"] = rows["text"].str.split().str.len()
+    return rows[rows["word_count"] >= min_words]
+
+
+def quality_stage(rows: pd.DataFrame, config: Optional[QualityGateConfig] = None) -> pd.DataFrame:
+    """
+    Records the quality gate verdict (language, length, paywall, ticker and
+    link checks) of every cleaned article, with the reasons for rejections.
+    """
+    return quality_checks(rows, config)
+
+
+def accepted_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    The cleaned articles that passed the quality gate; the NLP and LLM stages read from here.
+    """
+    return rows.loc[rows["passed"].fillna(False).astype(bool), [c for c in rows.columns if c not in QUALITY_COLUMNS]]
+
+
+def loanword_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Detects English loanwords and derives counts, density and the top loanwords.
+    """
+    from scraping_helpers import detect_loanwords, make_doc
+
+    records = []
+    for article_id, text in tqdm(zip(rows["article_id"], rows["text"]), total=len(rows), desc="Loanwords"):
+        with phase("nlp"):
+            # One tokenisation per article; the statistics read from the document
+            doc = make_doc(text)
+            loanwords = detect_loanwords(doc)
+        records.append({
+            "article_id": article_id,
+            "loanwords": loanwords,
+            "all_loanwords": doc.all_loanwords(),
+            "loanword_count": doc.loanword_count,
+            "loanword_density": round(doc.loanword_density, 4),
+            "top_loanwords": doc.top_loanwords(3),
+        })
+    return pd.DataFrame(records, columns=["article_id", "loanwords", "all_loanwords", "loanword_count",
+                                          "loanword_density", "top_loanwords"])
+
+
+def sentiment_stage(rows: pd.DataFrame, batch_size: int = 32) -> pd.DataFrame:
+    """
+    Labels sentiment with the batched transformer pipeline.
+    """
+    from sentiment_helpers import batch_analyse_sentiment_fast
+
+    with phase("sentiment"):
+        result = batch_analyse_sentiment_fast(rows[["article_id", "text"]].copy(), batch_size=batch_size)
+    return result[["article_id", "sentiment"]]
+
+
+def loanword_cleaning_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Removes UI/boilerplate terms from the loanword lists via the LLM.
+
+    Articles whose LLM call failed get no row, so the next run retries them.
+    """
+    from llm_helpers import LLM_ERROR, detect_unwanted_loanwords, keep_models_resident, model_for_task
+
+    records = []
+    with keep_models_resident([model_for_task("detect_unwanted_loanwords")]):
+        for article_id, text, loanwords in zip(rows["article_id"], rows["text"], rows["loanwords"]):
+            loanwords = list(loanwords)
+            excluded = detect_unwanted_loanwords(text, loanwords)
+            if LLM_ERROR in excluded:
+                continue
+            records.append({
+                "article_id": article_id,
+                "excluded_loanwords": excluded,
+                "refined_loanwords": [w for w in loanwords if w not in excluded],
+            })
+    return pd.DataFrame(records, columns=["article_id", "excluded_loanwords", "refined_loanwords"])
+
+
+def llm_enrichment_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Runs the LLM enrichment tasks model by model over the changed articles.
+
+    Articles with a failed task get no row, so the next run retries them.
+    """
+    from llm_helpers import ENRICHMENT_TASKS, LLM_ERROR, group_tasks_by_model, keep_models_resident
+
+    result = rows[["article_id"]].copy()
+    models = group_tasks_by_model(list(ENRICHMENT_TASKS))
+    with keep_models_resident(list(models)):
+        for model, tasks in models.items():
+            for task in tasks:
+                column, func = ENRICHMENT_TASKS[task]
+                result[column] = [func(text) for text in tqdm(rows["text"], desc=f"{model}: {task}")]
+    failed = result.drop(columns="article_id").astype(str).eq(LLM_ERROR).any(axis=1)
+    return result[~failed]
+
+
+def corpus_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    The joined corpus: cleaned articles with all enrichment columns.
+    """
+    return rows
+
+
+def rollup_stage(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rebuilds the density rollups (see `corpus/rollups.py`) from the corpus.
+    """
+    from rollups import compute_rollups
+
+    return compute_rollups(rows)
+
+
+def build_pipeline(
+    urls: str = "article_urls.txt",
+    workdir: str = "pipeline_data",
+    min_words: int = 50,
+    scrape_workers: int = 5,
+    quality: Optional[QualityGateConfig] = None
+) -> Pipeline:
+    """
+    Declares the URL canonicalisation -> scrape -> clean -> quality gate -> loanwords -> (sentiment, LLM,
+    loanword cleaning) -> corpus DAG.
+
+    Rejected articles stay in the "quality" output with their reasons and never
+    reach the NLP and LLM stages.
+
+    Parameters:
+        urls (str): URL list (.txt, one per line, or CSV/Parquet with a "url" column).
+        workdir (str): Directory for stage outputs and fingerprints.
+        min_words (int): Minimum words for an article to pass cleaning.
+        scrape_workers (int): Threads for scraping.
+        quality (QualityGateConfig, optional): Quality gate thresholds.
+
+    Returns:
+        Pipeline: The configured pipeline.
+    """
+    text = ["text"]
+    stages = [
+        # Not incremental: canonicalising the whole list takes microseconds per URL
+        Stage("canonical_urls", canonical_url_stage, ["urls"], key="url", incremental=False),
+        # Failed scrapes return no row and are retried on the next run
+        Stage("scrape", scrape_stage, ["canonical_urls"], key="url", fingerprint_columns=["url"],
+              params={"max_workers": scrape_workers}, retry_missing=True),
+        Stage("clean", clean_stage, ["scrape"], params={"min_words": min_words}),
+        # Not incremental: the per-site length check needs every article; all checks are cheap
+        Stage("quality", quality_stage, ["clean"], params={"config": quality or QualityGateConfig()},
+              incremental=False),
+        Stage("accepted", accepted_stage, ["clean", "quality"]),
+        Stage("loanwords", loanword_stage, ["accepted"], fingerprint_columns=text),
+        Stage("sentiment", sentiment_stage, ["accepted"], fingerprint_columns=text),
+        # Failed LLM calls return no row and are retried on the next run
+        Stage("llm_enrichment", llm_enrichment_stage, ["accepted"], fingerprint_columns=text,
+              retry_missing=True),
+        Stage("loanword_cleaning", loanword_cleaning_stage, ["loanwords", "accepted"],
+              fingerprint_columns=["text", "loanwords"], retry_missing=True),
+        Stage("corpus", corpus_stage,
+              ["accepted", "loanwords", "sentiment", "llm_enrichment", "loanword_cleaning"]),
+        Stage("rollups", rollup_stage, ["corpus"], incremental=False),
+    ]
+    return Pipeline({"urls": urls}, stages, workdir=workdir)
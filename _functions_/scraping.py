@@ -12,6 +12,41 @@ from typing import Optional, Callable
 import requests
 
 from helpers import get_sitemap_urls, get_article_urls, is_valid_article_url, scrape_article_full
+from scrape_timing import log_timing_summary
+from boilerplate import BOILERPLATE_PATH, save_boilerplate
+from url_canon import CANONICAL_MAP_PATH, dedupe_urls, save_canonical_map
+from quality_gate import ArticleRejected
+
+
+def rejected_path(output_csv: str) -> str:
+    """
+    Where the runners record articles the quality gate rejected: "<output>_rejected.csv".
+    """
+    path = Path(output_csv)
+    return str(path.with_name(f"{path.stem}_rejected.csv"))
+
+
+def record_rejection(error: ArticleRejected, rejected_csv: Optional[str], csv_lock) -> None:
+    """
+    Appends the rejection record (url, article_id, reasons) to `rejected_csv`.
+    """
+    print(f"[Rejected] {error.record['url']}: {error.record['reasons']}")
+    if rejected_csv:
+        with csv_lock:
+            pd.DataFrame([error.record]).to_csv(
+                rejected_csv, mode="a", index=False, header=not Path(rejected_csv).exists())
+
+
+def done_and_rejected_urls(output_csv: str, rejected_csv: str) -> tuple[pd.DataFrame, set]:
+    """
+    The articles already in `output_csv`, and the URLs to skip when resuming:
+    scraped ones and ones the quality gate rejected.
+    """
+    existing_df = pd.read_csv(output_csv) if Path(output_csv).exists() else pd.DataFrame(columns=["url"])
+    done_urls = set(existing_df["url"].tolist())
+    if Path(rejected_csv).exists():
+        done_urls |= set(pd.read_csv(rejected_csv, usecols=["url"])["url"])
+    return existing_df, done_urls
 
 
 def scrape_with_retries(
@@ -22,6 +57,7 @@ def scrape_with_retries(
     csv_lock,
     max_retries: int = 3,
     delay_range: tuple = (1.5, 3.5),
+    rejected_csv: Optional[str] = None,
 ) -> Optional[dict]:
     """
     Attempt to scrape an article from a given URL with multiple retries.
@@ -31,6 +67,7 @@ def scrape_with_retries(
     - Retries scraping up to `MAX_RETRIES` times in case of failure
     - Applies an increasing delay (with randomness) between retries
     - Saves successful results to a CSV file in a thread-safe way using `csv_lock`
+    - Records articles the quality gate rejects in `rejected_csv`, without retrying them
 
     Parameters:
         url (str): The URL of the article to scrape.
@@ -54,6 +91,9 @@ def scrape_with_retries(
                         output_csv, mode="a", index=False, header=not Path(output_csv).exists()
                     )
                 return result
+        except ArticleRejected as e:
+            record_rejection(e, rejected_csv, csv_lock)
+            return None
         except (requests.RequestException, ValueError) as e:
             print(f"{url} Attempt {attempt} failed: {e}")
 
@@ -71,21 +111,25 @@ def initiate_scraping_in_parallel(
         max_workers: int = 5,
         max_retries: int = 3,
         delay_range: tuple = (1.5, 3.5),
-        rerume: bool = True
+        rerume: bool = True,
+        csv_lock: Optional[Lock] = None,
+        boilerplate_path: str = BOILERPLATE_PATH,
+        canonical_map_path: str = CANONICAL_MAP_PATH,
+        rejected_csv: Optional[str] = None
 
 ):
-    csv_lock = Lock()
+    csv_lock = csv_lock or Lock()
+    rejected_csv = rejected_csv or rejected_path(output_csv)
 
-    # Resume
-    if Path(output_csv).exists() and rerume:
-        existing_df = pd.read_csv(output_csv)
-        done_urls = set(existing_df["url"].tolist())
+    # Resume (rejected articles are not fetched again either)
+    if rerume:
+        existing_df, done_urls = done_and_rejected_urls(output_csv, rejected_csv)
     else:
         existing_df = pd.DataFrame()
         done_urls = set()
 
-    # Check and filer already scraped
-    remaining_urls = [u for u in urls if u not in done_urls]
+    # Canonicalise and drop duplicates (tracking params, AMP, http/https, ...) and already scraped
+    remaining_urls = dedupe_urls(urls, done_urls)
 
     print(
         f"\n Starting parallel scrape with {max_workers} threads on {len(remaining_urls)} URLs...\n")
@@ -95,12 +139,13 @@ def initiate_scraping_in_parallel(
             executor.submit(
                 scrape_with_retries,
                 url,
-                scrape_func,
-                done_urls,
-                output_csv,
-                csv_lock,
-                max_retries,
-                delay_range
+                output_csv=output_csv,
+                scrape_func=scrape_func,
+                done_urls=done_urls,
+                csv_lock=csv_lock,
+                max_retries=max_retries,
+                delay_range=delay_range,
+                rejected_csv=rejected_csv
             ): url
             for url in remaining_urls
         }
@@ -109,6 +154,9 @@ def initiate_scraping_in_parallel(
 
         print(
             f"\n Done! Total scraped articles:{len(existing_df) + len(futures)}")
+        log_timing_summary()
+        save_boilerplate(boilerplate_path)
+        save_canonical_map(canonical_map_path)
         
 
 def scrape_with_retries_2(
@@ -118,7 +166,8 @@ def scrape_with_retries_2(
     output_csv,
     csv_lock,
     max_retries=3,
-    delay_range=(1.5, 3.5)
+    delay_range=(1.5, 3.5),
+    rejected_csv=None
 ):
     import pandas as pd
     import time
@@ -137,6 +186,9 @@ def scrape_with_retries_2(
                         output_csv, mode='a', index=False, header=not Path(output_csv).exists()
                     )
                 return result
+        except ArticleRejected as e:
+            record_rejection(e, rejected_csv, csv_lock)
+            return None
         except Exception as e:
             print(f"[{url}] Attempt {attempt} failed: {e}")
         time.sleep(random.uniform(*delay_range) * attempt)
@@ -152,7 +204,11 @@ def run_parallel_scraper(
     max_workers=5,
     max_retries=3,
     delay_range=(1.5, 3.5),
-    resume=True
+    resume=True,
+    csv_lock=None,
+    boilerplate_path=BOILERPLATE_PATH,
+    canonical_map_path=CANONICAL_MAP_PATH,
+    rejected_csv=None
 ):
     import pandas as pd
     from pathlib import Path
@@ -160,16 +216,17 @@ def run_parallel_scraper(
     from concurrent.futures import ThreadPoolExecutor, as_completed
     from tqdm import tqdm
 
-    csv_lock = Lock()
+    # An injected lock (e.g. the load test's TimedLock) measures writer contention
+    csv_lock = csv_lock or Lock()
+    rejected_csv = rejected_csv or rejected_path(output_csv)
 
-    if Path(output_csv).exists() and resume:
-        existing_df = pd.read_csv(output_csv)
-        done_urls = set(existing_df["url"].tolist())
+    if resume:
+        existing_df, done_urls = done_and_rejected_urls(output_csv, rejected_csv)
     else:
         existing_df = pd.DataFrame()
         done_urls = set()
 
-    remaining_urls = [u for u in urls if u not in done_urls]
+    remaining_urls = dedupe_urls(urls, done_urls)
 
     print(
         f"\n🚀 Starting parallel scrape with {max_workers} threads on {len(remaining_urls)} URLs...\n")
@@ -184,7 +241,8 @@ def run_parallel_scraper(
                 output_csv,
                 csv_lock,
                 max_retries,
-                delay_range
+                delay_range,
+                rejected_csv
             ): url
             for url in remaining_urls
         }
@@ -193,3 +251,6 @@ def run_parallel_scraper(
 
     print(
         f"\n✅ Done! Total scraped articles: {len(existing_df) + len(futures)}")
+    log_timing_summary()
+    save_boilerplate(boilerplate_path)
+    save_canonical_map(canonical_map_path)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from article_ids import content_hash
+
+# === CONFIGURATION ===
+BOILERPLATE_PATH = "boilerplate_paragraphs.parquet"
+# A paragraph is boilerplate once it appeared on more than this many pages of a site
+MIN_PAGES = 20
+# Paragraphs seen only once are forgotten every this many pages of a site, which
+# bounds memory; real boilerplate recurs within a few pages and is counted again
+PRUNE_EVERY = 5000
+# Columns a scrape produces; `clean_corpus` clears every other (derived) column of changed articles
+SCRAPE_COLUMNS = ["article_id", "content_hash", "url", "source_site", "domain", "date", "year", "text",
+                  "headline", "word_count", "paragraphs", "boilerplate_paragraphs", "links"]
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d")
+# Last characters of a word that ends a sentence (or a heading, quote or bracket)
+_SENTENCE_END = tuple(".!?:;\"'“”»«)…")
+
+
+def normalise_paragraph(text: str) -> str:
+    """
+    Case- and whitespace-insensitive form of a paragraph; digits are masked, so
+    "© 2023" and "© 2024" footers count as the same paragraph.
+    """
+    # split/join is ~3x faster than a whitespace regex (str.translate is slower
+    # still on non-ASCII text, so digits keep the regex)
+    return _DIGITS.sub("0", " ".join(text.split()).casefold())
+
+
+def paragraph_hash(text: str) -> int:
+    """
+    64-bit hash of the normalised paragraph.
+    """
+    digest = hashlib.blake2b(normalise_paragraph(text).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def page_hash(hashes) -> int:
+    """
+    64-bit hash of a page's distinct paragraph hashes (order-insensitive).
+    """
+    data = b"".join(h.to_bytes(8, "little", signed=True) for h in sorted(hashes))
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True)
+
+
+def pages_path(path: str = BOILERPLATE_PATH) -> str:
+    """
+    Location of the observed-page hashes of the detector saved at `path`.
+    """
+    return f"{os.path.splitext(path)[0]}.pages.parquet"
+
+
+class BoilerplateDetector:
+    """
+    Learns which paragraphs repeat across the pages of a site and strips them.
+
+    Every distinct page adds one count per distinct paragraph hash of its site.
+    Pages are identified by the hash of their paragraph hashes (`page_hash`)
+    and counted once, so retries, re-leased URLs and forced re-scrapes of the
+    same page do not add up. Once a hash has been seen on more than `min_pages` pages it is boilerplate
+    (newsletter teasers, cookie notices, author bios, "Lest auch" blocks) and
+    `strip` drops it with a single set lookup per paragraph. Learning is
+    online: the first pages of a new site keep their boilerplate until it has
+    been seen often enough.
+
+    With `track_pages` (the per-worker detectors of `url_queue.py`) the
+    paragraph hashes of every counted page are kept as well, so
+    `merge_boilerplate` can count a page that several workers scraped once.
+    """
+
+    def __init__(self, min_pages: int = MIN_PAGES, track_pages: bool = False):
+        self.min_pages = min_pages
+        self._lock = threading.Lock()
+        self.pages: Counter = Counter()
+        self.counts: dict[str, Counter] = {}
+        # site -> page hashes already counted
+        self.seen: dict[str, set[int]] = {}
+        # site -> {hash: example text} of learned boilerplate
+        self.learned: dict[str, dict[int, str]] = {}
+        # site -> {page hash: its paragraph hashes} of the pages counted here, if tracked
+        self.page_paragraphs: Optional[dict[str, dict[int, list[int]]]] = {} if track_pages else None
+
+    def observe(self, site: str, paragraphs: list[str]) -> None:
+        """
+        Counts the distinct paragraphs of one page (once per distinct page).
+        """
+        self._count(site, [paragraph_hash(p) for p in paragraphs], paragraphs)
+
+    def _count(self, site: str, hashes: list[int], paragraphs: list[str]) -> None:
+        hashes = {h: p for h, p in zip(hashes, paragraphs) if p.strip()}
+        page = page_hash(hashes)
+        with self._lock:
+            seen = self.seen.setdefault(site, set())
+            if page in seen:
+                return
+            seen.add(page)
+            if self.page_paragraphs is not None:
+                self.page_paragraphs.setdefault(site, {})[page] = list(hashes)
+            counts = self.counts.setdefault(site, Counter())
+            learned = self.learned.setdefault(site, {})
+            for h, text in hashes.items():
+                counts[h] += 1
+                # Learned in a merge without an example text ("") until the next page shows it
+                if counts[h] > self.min_pages and not learned.get(h):
+                    learned[h] = _WHITESPACE.sub(" ", text).strip()
+            self.pages[site] += 1
+            if self.pages[site] % PRUNE_EVERY == 0:
+                self.counts[site] = Counter({h: c for h, c in counts.items() if c > 1})
+
+    def is_boilerplate(self, site: str, paragraph: str) -> bool:
+        return paragraph_hash(paragraph) in self.learned.get(site, ())
+
+    def strip(self, site: str, paragraphs: list[str], learn: bool = True) -> list[str]:
+        """
+        Returns the paragraphs that are not boilerplate of `site`.
+
+        Parameters:
+            site (str): Site key (e.g. `source_site`).
+            paragraphs (list[str]): Paragraph texts of one page.
+            learn (bool): Also count this page (default), so the detector keeps learning.
+
+        Returns:
+            list[str]: The content paragraphs, in order.
+        """
+        hashes = [paragraph_hash(p) for p in paragraphs]
+        if learn:
+            self._count(site, hashes, paragraphs)
+        learned = self.learned.get(site)
+        if not learned:
+            return list(paragraphs)
+        return [p for h, p in zip(hashes, paragraphs) if h not in learned]
+
+    def strip_text(self, site: str, text: str) -> tuple[str, int]:
+        """
+        Removes learned boilerplate from already joined article text (e.g. an
+        existing corpus scraped before the detector existed).
+
+        The scrapers join paragraphs with a space, so paragraph breaks are not
+        in the text. Candidate paragraphs are word spans that start and end at
+        a sentence boundary (or the text edges) and have the word count of a
+        learned paragraph; a span is removed if its `paragraph_hash` (digits
+        masked, like the scrape-time match) is learned. Text that merely
+        contains a boilerplate phrase mid-sentence is kept.
+
+        Returns:
+            tuple[str, int]: The cleaned text and the number of paragraphs removed.
+        """
+        words = text.split()
+        learned = self.learned.get(site)
+        if not learned:
+            return " ".join(words), 0
+        lengths = sorted({len(p.split()) for p in learned.values() if p}, reverse=True)
+
+        kept, removed, i, n = [], 0, 0, len(words)
+        while i < n:
+            end = None
+            if i == 0 or words[i - 1].endswith(_SENTENCE_END):
+                for k in lengths:
+                    j = i + k
+                    if j > n:
+                        continue
+                    at_boundary = j == n or words[j - 1].endswith(_SENTENCE_END) or not words[j][0].islower()
+                    if at_boundary and paragraph_hash(" ".join(words[i:j])) in learned:
+                        end = j
+                        break
+            if end is None:
+                kept.append(words[i])
+                i += 1
+            else:
+                removed += 1
+                i = end
+        return " ".join(kept), removed
+
+    def report(self) -> pd.DataFrame:
+        """
+        Learned boilerplate per site with the number of pages it was seen on.
+        """
+        with self._lock:
+            rows = [{"site": site, "pages_seen": self.counts[site].get(h, self.min_pages + 1),
+                     "site_pages": self.pages[site], "paragraph": text}
+                    for site, learned in self.learned.items() for h, text in learned.items()]
+        columns = ["site", "pages_seen", "site_pages", "paragraph"]
+        return pd.DataFrame(rows, columns=columns).sort_values(["site", "pages_seen"], ascending=[True, False])
+
+    # === PERSISTENCE ===
+
+    def save(self, path: str = BOILERPLATE_PATH) -> None:
+        """
+        Writes the counts and learned paragraphs to Parquet, and the hashes of
+        the counted pages (with their paragraph hashes, if tracked) next to it
+        (`pages_path`), atomically, so a crashed run never leaves a half-written file.
+        """
+        with self._lock:
+            sites, hashes, counts, texts = [], [], [], []
+            for site, site_counts in self.counts.items():
+                learned = self.learned.get(site, {})
+                for h, count in site_counts.items():
+                    sites.append(site)
+                    hashes.append(h)
+                    counts.append(count)
+                    texts.append(learned.get(h))
+            table = pa.table({"site": pa.array(sites, pa.string()), "hash": pa.array(hashes, pa.int64()),
+                              "count": pa.array(counts, pa.int32()), "text": pa.array(texts, pa.string())})
+            metadata = {b"pages": json.dumps(dict(self.pages)).encode(),
+                        b"min_pages": str(self.min_pages).encode()}
+            pages = {"site": pa.array([site for site, seen in self.seen.items() for _ in seen], pa.string()),
+                     "page": pa.array([h for seen in self.seen.values() for h in seen], pa.int64())}
+            if self.page_paragraphs is not None:
+                # None for pages counted elsewhere (e.g. seeded from the shared detector)
+                pages["paragraphs"] = pa.array(
+                    [self.page_paragraphs.get(site, {}).get(h) for site, seen in self.seen.items() for h in seen],
+                    pa.list_(pa.int64()))
+            pages = pa.table(pages)
+        for target, data in ((pages_path(path), pages), (path, table.replace_schema_metadata(metadata))):
+            tmp = f"{target}.tmp"
+            pq.write_table(data, tmp)
+            os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str = BOILERPLATE_PATH, min_pages: Optional[int] = None,
+             track_pages: bool = False) -> "BoilerplateDetector":
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        detector = cls(min_pages if min_pages is not None else int(metadata.get(b"min_pages", MIN_PAGES)),
+                       track_pages)
+        detector.pages.update(json.loads(metadata.get(b"pages", b"{}")))
+        df = table.to_pandas()
+        for site, group in df.groupby("site", sort=False):
+            detector.counts[site] = Counter(dict(zip(group["hash"].tolist(), group["count"].tolist())))
+            learned = group[group["count"] > detector.min_pages]
+            detector.learned[site] = {h: t for h, t in zip(learned["hash"].tolist(), learned["text"].tolist())
+                                      if isinstance(t, str)}
+        if os.path.exists(pages_path(path)):
+            pages = pq.read_table(pages_path(path)).to_pandas()
+            for site, group in pages.groupby("site", sort=False):
+                detector.seen[site] = set(group["page"].tolist())
+                if "paragraphs" in group and group["paragraphs"].notna().any():
+                    tracked = group[group["paragraphs"].notna()]
+                    if detector.page_paragraphs is None:
+                        detector.page_paragraphs = {}
+                    detector.page_paragraphs[site] = {page: hashes.tolist() for page, hashes
+                                                      in zip(tracked["page"].tolist(), tracked["paragraphs"])}
+        return detector
+
+
+_detector: Optional[BoilerplateDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_detector(path: str = BOILERPLATE_PATH) -> BoilerplateDetector:
+    """
+    The process-wide detector used by `scrape_article_full`, loaded from `path` if it exists.
+    """
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = BoilerplateDetector.load(path) if os.path.exists(path) else BoilerplateDetector()
+        return _detector
+
+
+def strip_boilerplate(site: str, paragraphs: list[str]) -> list[str]:
+    """
+    Learns from and strips one page's paragraphs with the process-wide detector.
+    """
+    return get_detector().strip(site, paragraphs)
+
+
+def merge_boilerplate(paths: list[str], path: str = BOILERPLATE_PATH) -> BoilerplateDetector:
+    """
+    Folds the detectors saved by several workers into the shared one at `path`.
+
+    The pages each worker counted are replayed into the shared counts, skipping
+    pages already counted (by the shared detector or another worker, e.g. a
+    URL re-leased after its lease expired), and boilerplate is re-derived from
+    the combined counts, so a paragraph is learned from the pages of all
+    workers. Worker files without per-page paragraph hashes (detectors saved
+    without `track_pages`) have their counts summed instead. The worker files
+    are consumed (deleted), so running the merge again adds nothing twice.
+
+    Parameters:
+        paths (list[str]): Detector files written by the workers.
+        path (str): The shared detector (created if missing).
+
+    Returns:
+        BoilerplateDetector: The merged detector.
+    """
+    merged = BoilerplateDetector.load(path) if os.path.exists(path) else BoilerplateDetector()
+    texts: dict[int, str] = {h: t for learned in merged.learned.values() for h, t in learned.items()}
+    for worker_path in paths:
+        part = BoilerplateDetector.load(worker_path)
+        if part.page_paragraphs is None:
+            merged.pages.update(part.pages)
+            for site, counts in part.counts.items():
+                merged.counts.setdefault(site, Counter()).update(counts)
+            for site, seen in part.seen.items():
+                merged.seen.setdefault(site, set()).update(seen)
+        else:
+            for site, pages in part.page_paragraphs.items():
+                seen = merged.seen.setdefault(site, set())
+                counts = merged.counts.setdefault(site, Counter())
+                for page, hashes in pages.items():
+                    if page not in seen:
+                        seen.add(page)
+                        counts.update(hashes)
+                        merged.pages[site] += 1
+        texts.update({h: t for learned in part.learned.values() for h, t in learned.items() if t})
+    # Workers only save the text of paragraphs they learned themselves; one that
+    # only the summed counts make boilerplate gets its text from the next page
+    for site, counts in merged.counts.items():
+        merged.learned[site] = {h: texts.get(h, "") for h, c in counts.items() if c > merged.min_pages}
+    merged.save(path)
+    for worker_path in paths:
+        for target in (worker_path, pages_path(worker_path)):
+            if os.path.exists(target):
+                os.remove(target)
+    return merged
+
+
+def clean_corpus(df: pd.DataFrame, detector: BoilerplateDetector) -> pd.DataFrame:
+    """
+    Strips learned boilerplate from an existing corpus (see `strip_text`).
+
+    Articles whose text changed get a new word_count, boilerplate_paragraphs
+    count and content_hash (`paragraphs` counts the body paragraphs before
+    stripping and stays); their article_id stays (it is derived from the URL). Their other columns (loanwords, density, sentiment, LLM
+    labels, ...) were computed from the old text and are cleared, so the
+    enrichment steps redo them.
+
+    Parameters:
+        df (pd.DataFrame): Corpus with source_site and text.
+        detector (BoilerplateDetector): The detector with learned boilerplate.
+
+    Returns:
+        pd.DataFrame: The cleaned corpus.
+    """
+    df = df.copy()
+    stripped = [detector.strip_text(site, text) if isinstance(text, str) else (text, 0)
+                for site, text in zip(df["source_site"], df["text"])]
+    removed = pd.Series([r for _, r in stripped], index=df.index)
+    changed = removed > 0
+    if not changed.any():
+        return df
+
+    df.loc[changed, "text"] = [t for (t, _), c in zip(stripped, changed) if c]
+    rows = df[changed]
+    df.loc[changed, "word_count"] = rows["text"].str.split().str.len()
+    if "boilerplate_paragraphs" in df.columns:
+        df.loc[changed, "boilerplate_paragraphs"] = rows["boilerplate_paragraphs"].fillna(0) + removed[changed]
+    if "content_hash" in df.columns:
+        df.loc[changed, "content_hash"] = [content_hash(t) for t in df.loc[changed, "text"]]
+    derived = [c for c in df.columns if c not in SCRAPE_COLUMNS]
+    if derived:
+        df.loc[changed, derived] = None
+    return df
+
+
+def save_boilerplate(path: str = BOILERPLATE_PATH) -> None:
+    """
+    Persists the process-wide detector, if it was used; for the end of a scrape run.
+    """
+    if _detector is not None and _detector.pages:
+        _detector.save(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect learned boilerplate or clean an existing corpus.")
+    parser.add_argument("command", choices=["report", "clean"])
+    parser.add_argument("--path", default=BOILERPLATE_PATH)
+    parser.add_argument("--input", help="Corpus CSV/Parquet with source_site and text (for clean)")
+    parser.add_argument("--output", help="Where to write the cleaned corpus")
+    args = parser.parse_args()
+
+    detector = BoilerplateDetector.load(args.path)
+    if args.command == "report":
+        print(detector.report().to_string(index=False, max_colwidth=100))
+    else:
+        df = pd.read_parquet(args.input) if args.input.endswith(".parquet") else pd.read_csv(args.input)
+        cleaned = clean_corpus(df, detector)
+        changed = int((cleaned["text"].fillna("") != df["text"].fillna("")).sum())
+        output = args.output or args.input
+        if output.endswith(".parquet"):
+            cleaned.to_parquet(output, index=False)
+        else:
+            cleaned.to_csv(output, index=False)
+        print(f"✅ Cleaned {len(df)} articles ({changed} changed, their enrichment columns cleared) -> {output}")
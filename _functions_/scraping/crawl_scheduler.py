@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import pandas as pd
+import requests
+from tqdm import tqdm
+
+from boilerplate import save_boilerplate
+from site_profiles import SITE_PROFILES, SiteProfile, host_of, profile_for
+from url_canon import get_canonicaliser, save_canonical_map
+
+# === CONFIGURATION ===
+USER_AGENT = "Mozilla/5.0"
+MAX_WORKERS = 16
+MAX_RETRIES = 3
+# Back-off cap for a host that keeps failing (seconds between requests)
+MAX_DELAY = 60.0
+# Consecutive failed articles before a host is slowed down (single failures are
+# usually short or non-article pages, not rate limiting)
+FAILURE_STREAK = 3
+# Statuses that say "try again later"; any other 4xx is a dead link
+RETRY_STATUSES = {408, 429}
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    True for errors worth retrying: timeouts, connection errors, 429 and 5xx.
+    """
+    if not isinstance(error, requests.RequestException):
+        return False
+    response = error.response
+    if response is None:
+        return True
+    return response.status_code in RETRY_STATUSES or response.status_code >= 500
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds the server asked us to wait in its Retry-After header, if any.
+    """
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RobotsCache:
+    """
+    Fetches and caches robots.txt per host.
+
+    Unreachable or missing robots.txt files allow everything, as crawlers usually treat them.
+    """
+
+    def __init__(self, user_agent: str = USER_AGENT, timeout: int = 10):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._parsers: dict[str, Optional[RobotFileParser]] = {}
+        self._lock = threading.Lock()
+
+    def _parser(self, url: str) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            if origin in self._parsers:
+                return self._parsers[origin]
+
+        parser = None
+        try:
+            res = requests.get(f"{origin}/robots.txt", headers={"User-Agent": self.user_agent},
+                               timeout=self.timeout)
+            if res.status_code == 200:
+                parser = RobotFileParser()
+                parser.parse(res.text.splitlines())
+        except requests.RequestException:
+            pass
+        with self._lock:
+            self._parsers[origin] = parser
+        return parser
+
+    def allowed(self, url: str) -> bool:
+        parser = self._parser(url)
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> float:
+        """
+        Seconds between requests asked for by Crawl-delay or Request-rate (0 if none).
+        """
+        parser = self._parser(url)
+        if parser is None:
+            return 0.0
+        delay = parser.crawl_delay(self.user_agent)
+        rate = parser.request_rate(self.user_agent)
+        rate_delay = rate.seconds / rate.requests if rate and rate.requests else 0.0
+        return max(float(delay or 0.0), rate_delay)
+
+
+class _HostQueue:
+    """
+    Pending URLs and politeness state of one host.
+    """
+
+    def __init__(self, host: str, profile: SiteProfile, delay: float):
+        self.host = host
+        self.profile = profile
+        self.base_delay = delay
+        self.delay = delay
+        self.urls = deque()
+        self.attempts: dict[str, int] = {}
+        self.in_flight = 0
+        self.next_time = 0.0
+        self.failure_streak = 0
+        self.stats = {"scraped": 0, "failed": 0, "errors": 0, "seconds": 0.0}
+
+    def ready(self, now: float) -> bool:
+        return bool(self.urls) and self.in_flight < self.profile.max_concurrency and self.next_time <= now
+
+
+class CrawlScheduler:
+    """
+    Crawls many sites at once while keeping each host polite.
+
+    URLs are queued per host. A shared pool of worker threads always takes
+    the next URL from the host that has been ready the longest, so slow or
+    rate-limited sites never block the others. Per host, at most
+    `max_concurrency` requests (from its `SiteProfile`) are in flight, and
+    request starts are spaced by the larger of the profile's `crawl_delay`
+    and the robots.txt Crawl-delay. Disallowed URLs are dropped. A host whose
+    requests time out, fail to connect or answer 429/5xx, or whose articles
+    keep failing, has its delay doubled (up to `MAX_DELAY`) and honours
+    Retry-After; those URLs are retried. Other 4xx answers (404, 410) fail
+    the URL at once without slowing the host. The delay recovers gradually
+    on success.
+
+    Usage:
+        scheduler = CrawlScheduler()
+        scheduler.add_site(SITE_PROFILES["businessinsider.de"], limit=1000)
+        scheduler.add_urls(urls_from_elsewhere)
+        stats = scheduler.run(output_csv="articles.csv")
+    """
+
+    def __init__(
+        self,
+        scrape_func: Optional[Callable[[str], Optional[dict]]] = None,
+        max_workers: int = MAX_WORKERS,
+        respect_robots: bool = True,
+        user_agent: str = USER_AGENT,
+        max_retries: int = MAX_RETRIES
+    ):
+        if scrape_func is None:
+            from scraping_pipeline import scrape_article_full
+            # Network errors must reach `_worker` for the host's retry and back-off
+            scrape_func = partial(scrape_article_full, raise_errors=True)
+        self.scrape_func = scrape_func
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.robots = RobotsCache(user_agent) if respect_robots else None
+        self.hosts: dict[str, _HostQueue] = {}
+        self.skipped = {"not_article": 0, "robots": 0, "duplicate": 0}
+        self._queued: set[str] = set()
+        self._cond = threading.Condition()
+        self._total = 0
+
+    # === QUEUEING ===
+
+    def _host_queue(self, url: str) -> _HostQueue:
+        host = host_of(url)
+        if host not in self.hosts:
+            profile = profile_for(url)
+            delay = profile.crawl_delay
+            if self.robots:
+                delay = max(delay, self.robots.crawl_delay(url))
+            self.hosts[host] = _HostQueue(host, profile, delay)
+        return self.hosts[host]
+
+    def add_urls(self, urls: Iterable[str], done_urls: Optional[set] = None) -> int:
+        """
+        Queues article URLs (any mix of sites) after profile and robots.txt checks.
+
+        URLs are canonicalised first (see `url_canon.py`), so tracking-parameter,
+        AMP and http/https variants of a queued or done article are skipped.
+
+        Parameters:
+            urls (Iterable[str]): Article URLs.
+            done_urls (set, optional): Canonical URLs already scraped (`canonical_done_urls`).
+
+        Returns:
+            int: Number of URLs queued.
+        """
+        queued = 0
+        done_urls = done_urls or set()
+        canonicaliser = get_canonicaliser()
+        for url in urls:
+            url = canonicaliser.canonicalise(url)
+            if url in self._queued or url in done_urls:
+                self.skipped["duplicate"] += 1
+                continue
+            if not profile_for(url).is_article(url):
+                self.skipped["not_article"] += 1
+                continue
+            if self.robots and not self.robots.allowed(url):
+                self.skipped["robots"] += 1
+                continue
+            with self._cond:
+                self._host_queue(url).urls.append(url)
+                self._queued.add(url)
+                self._total += 1
+            queued += 1
+        return queued
+
+    def add_site(self, profile: SiteProfile, limit: Optional[int] = None,
+                 done_urls: Optional[set] = None) -> int:
+        """
+        Discovers a site's article URLs from its sitemap index and queues them.
+
+        Sitemap requests are spaced by the profile's crawl delay as well.
+
+        Parameters:
+            profile (SiteProfile): The site; needs `sitemap_index`.
+            limit (int, optional): Stop after this many URLs.
+            done_urls (set, optional): Canonical URLs already scraped (e.g. when resuming).
+
+        Returns:
+            int: Number of URLs queued.
+        """
+        from scraping_helpers import get_article_urls, get_sitemap_urls
+
+        queued = 0
+        for sitemap_url in get_sitemap_urls(profile.sitemap_index, pattern=profile.sitemap_filter):
+            urls = get_article_urls(sitemap_url=sitemap_url)
+            queued += self.add_urls(urls if limit is None else urls[:limit - queued], done_urls)
+            if limit is not None and queued >= limit:
+                break
+            time.sleep(profile.crawl_delay)
+        print(f"✅ {profile.name}: {queued} URLs queued")
+        return queued
+
+    # === SCHEDULING ===
+
+    def _next_task(self) -> Optional[tuple[_HostQueue, str]]:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                ready = [q for q in self.hosts.values() if q.ready(now)]
+                if ready:
+                    queue = min(ready, key=lambda q: q.next_time)
+                    queue.in_flight += 1
+                    queue.next_time = now + queue.delay
+                    return queue, queue.urls.popleft()
+
+                pending = [q for q in self.hosts.values() if q.urls]
+                if not pending and not any(q.in_flight for q in self.hosts.values()):
+                    return None
+                # Sleep until the next host's delay expires, or a request finishes
+                waits = [q.next_time - now for q in pending if q.in_flight < q.profile.max_concurrency]
+                self._cond.wait(timeout=max(min(waits), 0.001) if waits else None)
+
+    def _finish(self, queue: _HostQueue, url: str, result: Optional[dict], error: Optional[Exception],
+                seconds: float) -> bool:
+        """
+        Records a request's outcome; returns False if the URL was queued for a retry.
+        """
+        done = True
+        with self._cond:
+            queue.in_flight -= 1
+            queue.stats["seconds"] += seconds
+            if result:
+                queue.stats["scraped"] += 1
+                queue.failure_streak = 0
+                queue.delay = max(queue.base_delay, queue.delay * 0.8)
+            elif error is not None:
+                queue.stats["errors"] += 1
+                queue.attempts[url] = queue.attempts.get(url, 1) + 1
+                if is_transient(error):
+                    queue.delay = min(max(queue.delay, 0.5) * 2, MAX_DELAY)
+                    wait = retry_after(error)
+                    if wait:
+                        queue.next_time = max(queue.next_time, time.monotonic() + wait)
+                if is_transient(error) and queue.attempts[url] <= self.max_retries:
+                    queue.urls.append(url)
+                    done = False
+                else:
+                    queue.stats["failed"] += 1
+            else:
+                queue.stats["failed"] += 1
+                queue.failure_streak += 1
+                if queue.failure_streak >= FAILURE_STREAK:
+                    queue.delay = min(max(queue.delay, 0.5) * 2, MAX_DELAY)
+                    queue.failure_streak = 0
+            self._cond.notify_all()
+        return done
+
+    def _worker(self, write: Callable[[dict], None], progress: tqdm) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            queue, url = task
+            result, error, done = None, None, True
+            start = time.perf_counter()
+            try:
+                result = self.scrape_func(url)
+            except (requests.RequestException, ValueError) as e:
+                error = e
+                print(f"{url} failed: {e}")
+            finally:
+                # Also on unexpected errors: the host's slot must be freed, or hosts
+                # with max_concurrency=1 block the remaining workers forever
+                done = self._finish(queue, url, result, error, time.perf_counter() - start)
+            if result:
+                write(result)
+            if done:
+                progress.update(1)
+
+    def run(self, output_csv: Optional[str] = None, on_result: Optional[Callable[[dict], None]] = None) -> pd.DataFrame:
+        """
+        Crawls all queued URLs.
+
+        Parameters:
+            output_csv (str, optional): Append results to this CSV (thread-safe).
+            on_result (Callable, optional): Called with every scraped article.
+
+        Returns:
+            pd.DataFrame: Per host: profile, final delay, scraped, failed, errors,
+            average seconds per request and articles per second.
+        """
+        csv_lock = threading.Lock()
+
+        def write(result: dict) -> None:
+            if on_result:
+                on_result(result)
+            if output_csv:
+                with csv_lock:
+                    pd.DataFrame([result]).to_csv(
+                        output_csv, mode="a", index=False, header=not Path(output_csv).exists())
+
+        print(f"\n🚀 Crawling {self._total} URLs on {len(self.hosts)} hosts with {self.max_workers} threads...\n")
+        start = time.perf_counter()
+        with tqdm(total=self._total, desc="Crawling") as progress:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for future in [executor.submit(self._worker, write, progress) for _ in range(self.max_workers)]:
+                    future.result()
+        elapsed = time.perf_counter() - start
+        save_boilerplate()
+        save_canonical_map()
+
+        stats = pd.DataFrame([{
+            "host": q.host,
+            "profile": q.profile.name,
+            "delay": round(q.delay, 2),
+            **q.stats,
+            "seconds_per_request": round(q.stats["seconds"] / max(q.stats["scraped"] + q.stats["errors"]
+                                                                 + q.stats["failed"], 1), 3),
+            "articles_per_sec": round(q.stats["scraped"] / elapsed, 3),
+        } for q in self.hosts.values()])
+        print(f"\n✅ Done in {elapsed:.0f}s: {int(stats['scraped'].sum()) if len(stats) else 0} articles, "
+              f"skipped {self.skipped}")
+        return stats
+
+
+def canonical_done_urls(output_csv: str) -> set:
+    """
+    Canonical forms of the URLs already in `output_csv` (empty if it does not exist).
+    """
+    if not Path(output_csv).exists():
+        return set()
+    canonicaliser = get_canonicaliser()
+    return {canonicaliser.canonicalise(url) for url in pd.read_csv(output_csv, usecols=["url"])["url"]}
+
+
+def crawl_sites(
+    sites: list[str],
+    output_csv: str,
+    limit_per_site: Optional[int] = None,
+    max_workers: int = MAX_WORKERS,
+    resume: bool = True,
+    scrape_func: Optional[Callable[[str], Optional[dict]]] = None
+) -> pd.DataFrame:
+    """
+    Discovers and crawls several registered sites in one interleaved run.
+
+    Parameters:
+        sites (list[str]): Profile names from `SITE_PROFILES`.
+        output_csv (str): CSV the articles are appended to.
+        limit_per_site (int, optional): Maximum URLs per site.
+        max_workers (int): Total worker threads across all sites.
+        resume (bool): Skip URLs already in `output_csv`.
+        scrape_func (Callable, optional): Scrape function (default `scrape_article_full`); it
+            should raise `requests.RequestException` on network errors, which are retried
+            with back-off.
+
+    Returns:
+        pd.DataFrame: Per-host crawl statistics.
+    """
+    done_urls = canonical_done_urls(output_csv) if resume else set()
+
+    scheduler = CrawlScheduler(scrape_func=scrape_func, max_workers=max_workers)
+    for name in sites:
+        scheduler.add_site(SITE_PROFILES[name], limit=limit_per_site, done_urls=done_urls)
+    return scheduler.run(output_csv=output_csv)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Crawl several news sites at once, politely per host.")
+    parser.add_argument("--sites", nargs="+", default=["businessinsider.de"], choices=sorted(SITE_PROFILES))
+    parser.add_argument("--urls", help="Crawl the URLs in this file (one per line) instead of discovering them")
+    parser.add_argument("--output", default="articles_multi_site.csv")
+    parser.add_argument("--limit", type=int, help="Maximum URLs per site")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    if args.urls:
+        with open(args.urls, encoding="utf-8") as f:
+            url_list = [line.strip() for line in f if line.strip()]
+        done = canonical_done_urls(args.output)
+        crawler = CrawlScheduler(max_workers=args.workers)
+        crawler.add_urls(url_list, done_urls=done)
+        host_stats = crawler.run(output_csv=args.output)
+    else:
+        host_stats = crawl_sites(args.sites, args.output, args.limit, args.workers)
+    print(host_stats.to_string(index=False))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import codecs
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from charset_normalizer import from_bytes
+
+# === CONFIGURATION ===
+MAX_BODY_BYTES = 5 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+# <meta charset> must appear within the first 1024 bytes (HTML spec); a bit of slack
+META_SNIFF_BYTES = 4096
+# Charset detection only looks at this much of the body
+DETECT_BYTES = 32 * 1024
+
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_CLOSING_TAG = re.compile(r"^</([A-Za-z][\w-]*)\s*>$")
+
+
+class FetchRejected(ValueError):
+    """
+    The response was not fetched or decoded because its headers or size ruled it out.
+    """
+
+
+def _valid_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.decode("ascii") if isinstance(name, bytes) else name).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """
+    The charset parameter of a Content-Type header, if present and known.
+    """
+    match = _HEADER_CHARSET.search(content_type or "")
+    return _valid_encoding(match.group(1)) if match else None
+
+
+def meta_charset(prefix: bytes) -> Optional[str]:
+    """
+    The charset declared by `<meta charset>` or `<meta http-equiv="Content-Type">`
+    in the first bytes of a document.
+    """
+    match = _META_CHARSET.search(prefix[:META_SNIFF_BYTES])
+    return _valid_encoding(match.group(1)) if match else None
+
+
+def detect_charset(body: bytes) -> str:
+    """
+    Resolves the encoding of an HTML body without a declared charset: BOM,
+    then `<meta charset>`, then detection on a prefix of `DETECT_BYTES`
+    (not the whole document, as `Response.apparent_encoding` does).
+    """
+    if body.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    declared = meta_charset(body)
+    if declared:
+        return declared
+    best = from_bytes(body[:DETECT_BYTES]).best()
+    return best.encoding if best else "utf-8"
+
+
+@dataclass
+class FetchedPage:
+    """
+    A streamed HTML response.
+
+    Attributes:
+        url (str): Final URL (after redirects).
+        status_code (int): HTTP status.
+        content_type (str): Content-Type header.
+        body (bytes): The body read so far (all of it unless `complete` is False).
+        complete (bool): False if reading stopped early at the body-end marker.
+    """
+    url: str
+    status_code: int
+    content_type: str
+    body: bytes
+    complete: bool
+
+    @property
+    def encoding(self) -> str:
+        return header_charset(self.content_type) or detect_charset(self.body)
+
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+
+class _BodyEnd:
+    """
+    Finds where the body container closes in a growing buffer.
+
+    For a closing-tag marker (e.g. "</article>") openings and closings of
+    that tag are counted from `start`, and the body ends where the count
+    returns to zero; `depth` is 1 if `start` lies inside the container (after
+    the start marker) and 0 at the top of the page. An embedded `<article>`
+    (related-story cards, embeds) therefore does not end the body early.
+    Any other marker ends the body at its first occurrence.
+    """
+
+    def __init__(self, marker: str, start: int, depth: int):
+        self.marker = marker.encode("utf-8")
+        match = _CLOSING_TAG.match(marker)
+        self._tags = re.compile(rb"<(/?)%s(?=[\s>/])" % re.escape(match.group(1).encode("ascii")),
+                                re.IGNORECASE) if match else None
+        self.depth = depth
+        self.pos = start
+
+    def found(self, body: bytearray) -> bool:
+        if self._tags is None:
+            found = body.find(self.marker, self.pos) != -1
+            self.pos = max(self.pos, len(body) - len(self.marker))
+            return found
+        for match in self._tags.finditer(body, self.pos):
+            if match.end() >= len(body):
+                # The character after the tag name has not arrived yet
+                self.pos = match.start()
+                return False
+            self.pos = match.end()
+            if not match.group(1):
+                self.depth += 1
+                continue
+            self.depth -= 1
+            if self.depth <= 0:
+                return True
+        # A tag split across chunks is matched once the next chunk arrives
+        self.pos = max(self.pos, len(body) - len(self.marker))
+        return False
+
+
+def fetch_html(
+    url: str,
+    headers: Optional[dict] = None,
+    timeout: float = 10,
+    max_bytes: int = MAX_BODY_BYTES,
+    stop_marker: Optional[str] = None,
+    start_marker: Optional[str] = None
+) -> FetchedPage:
+    """
+    Streams an HTML page, checking headers before reading the body.
+
+    Error statuses, non-HTML responses (images, videos, PDFs that slipped past
+    the URL filter) and bodies above `max_bytes` (by Content-Length, or while
+    reading) are rejected without downloading them. With `stop_marker` (e.g.
+    "</article>", from the site profile) reading stops as soon as the body
+    container that `start_marker` lies in is closed, so comment sections,
+    teasers and footers are never downloaded. A closing-tag marker only
+    counts once the elements of that tag opened inside the body are closed
+    again (see `_BodyEnd`). Without `start_marker` the scan starts at the top
+    of the page; if `start_marker` never arrives, the whole page is read.
+
+    Parameters:
+        url (str): Page URL.
+        headers (dict, optional): Request headers.
+        timeout (float): Connect/read timeout in seconds.
+        max_bytes (int): Maximum body size.
+        stop_marker (str, optional): Stop reading where this closes the body container.
+        start_marker (str, optional): Only look for `stop_marker` after this byte sequence.
+
+    Returns:
+        FetchedPage: The (possibly partial) body with status and headers.
+
+    Raises:
+        FetchRejected: Non-HTML content type or body too large.
+        requests.HTTPError: 4xx/5xx status.
+        requests.RequestException: Network errors.
+    """
+    start = start_marker.encode("utf-8") if start_marker else None
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as res:
+        res.raise_for_status()
+        content_type = res.headers.get("Content-Type", "")
+        if not content_type.lower().startswith(HTML_TYPES):
+            raise FetchRejected(f"Non-HTML content ({content_type or 'no Content-Type'})")
+        length = res.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise FetchRejected(f"Body too large ({length} bytes)")
+
+        body = bytearray()
+        complete = True
+        # Scans for the end of the body; None until the start marker has arrived
+        body_end = _BodyEnd(stop_marker, 0, depth=0) if stop_marker and not start else None
+        for chunk in res.iter_content(CHUNK_SIZE):
+            offset = len(body)
+            body += chunk
+            if len(body) > max_bytes:
+                raise FetchRejected(f"Body larger than {max_bytes} bytes")
+            if not stop_marker:
+                continue
+            if body_end is None:
+                found = body.find(start, max(0, offset - len(start)))
+                if found == -1:
+                    continue
+                body_end = _BodyEnd(stop_marker, found + len(start), depth=1)
+            if body_end.found(body):
+                complete = False
+                break
+
+        return FetchedPage(res.url, res.status_code, content_type, bytes(body), complete)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+# === CONFIGURATION ===
+BASE_URL = "https://www.businessinsider.de"
+SITEMAP_SIZE = 200
+GERMAN_WORDS = [
+    "Unternehmen", "Wirtschaft", "Markt", "Kunden", "Entwicklung", "Jahr",
+    "Regierung", "Zukunft", "Arbeit", "Mitarbeiter", "Umsatz", "Analyse",
+    "Bericht", "Branche", "Gewinn", "Investoren", "Strategie", "Wachstum",
+    "Deutschland", "Verbraucher", "Preise", "Energie", "Studie", "Experten",
+    "der", "die", "das", "und", "mit", "für", "nicht", "auch", "nach", "bei",
+]
+ENGLISH_LOANWORDS = [
+    "Startup", "Meeting", "Business", "Marketing", "Team", "Software",
+    "Deal", "Trend", "Feedback", "Manager", "Homeoffice", "Workshop",
+    "Download", "Cloud", "Leadership", "Performance", "Recruiting", "Tool",
+]
+SECTIONS = ["wirtschaft", "tech", "karriere", "politik", "wissenschaft"]
+# Repeated on every page, like the site's newsletter/cookie/footer blocks
+BOILERPLATE_PARAGRAPHS = [
+    "Melde dich jetzt für unseren Newsletter an und erhalte die wichtigsten News.",
+    "Wir verwenden Cookies, um dir das bestmögliche Nutzererlebnis zu bieten.",
+    "Business Insider Deutschland – Alle Rechte vorbehalten.",
+]
+
+
+def _sentence(rng: random.Random, loanword_share: float) -> str:
+    words = [rng.choice(ENGLISH_LOANWORDS) if rng.random() < loanword_share else rng.choice(GERMAN_WORDS)
+             for _ in range(rng.randint(8, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_article_html(
+    url: str,
+    rng: random.Random,
+    published: date,
+    n_paragraphs: tuple = (8, 30),
+    loanword_share: float = 0.04
+) -> str:
+    """
+    Builds one Business Insider-style article page.
+
+    The page has the elements the extractors look at (og:title, <title>, <h1>,
+    article:published_time, JSON-LD datePublished, <p> paragraphs) plus the
+    noise real pages carry: navigation, scripts, inline styles, teasers,
+    boilerplate paragraphs and a related-story `<article>` card embedded in
+    the middle of the body (which must not end a streamed fetch early).
+
+    Parameters:
+        url (str): The article URL.
+        rng (random.Random): Source of randomness (seeded by the caller).
+        published (date): Publication date.
+        n_paragraphs (tuple): Min and max body paragraphs.
+        loanword_share (float): Share of English loanwords among body words.
+
+    Returns:
+        str: The HTML document.
+    """
+    headline = _sentence(rng, loanword_share * 2).rstrip(".")
+    paragraphs = [" ".join(_sentence(rng, loanword_share) for _ in range(rng.randint(2, 6)))
+                  for _ in range(rng.randint(*n_paragraphs))]
+    jsonld = json.dumps({
+        "@context": "https://schema.org",
+        "@type": "NewsArticle",
+        "headline": headline,
+        "datePublished": f"{published.isoformat()}T08:{rng.randint(0, 59):02d}:00+01:00",
+        "author": {"@type": "Person", "name": "Redaktion"},
+    }, ensure_ascii=False)
+    nav = "".join(f'<li><a href="{BASE_URL}/{s}/">{s.title()}</a></li>' for s in SECTIONS)
+    teasers = "".join(
+        f'<li><a href="{BASE_URL}/{rng.choice(SECTIONS)}/teaser-{rng.randint(1, 10**6)}/">'
+        f"{_sentence(rng, loanword_share)}</a></li>" for _ in range(6))
+    card = (f'<article class="related-card"><h3><a href="{BASE_URL}/{rng.choice(SECTIONS)}/'
+            f'related-{rng.randint(1, 10**6)}.html">{_sentence(rng, loanword_share)}</a></h3></article>')
+    body = [f"<p>{p}</p>" for p in paragraphs]
+    body = "\n".join(body[:len(body) // 2] + [card] + body[len(body) // 2:])
+    boilerplate = "\n".join(f'<p class="footer-note">{p}</p>' for p in BOILERPLATE_PARAGRAPHS)
+    script = "var dataLayer = window.dataLayer || []; " * rng.randint(20, 60)
+
+    return f"""<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>{headline} - Business Insider</title>
+<meta property="og:title" content="{headline}">
+<meta property="article:published_time" content="{published.isoformat()}T08:00:00+01:00">
+<link rel="canonical" href="{url}">
+<style>body {{ font-family: sans-serif; }} .teaser {{ margin: 0 }}</style>
+<script>{script}</script>
+<script type="application/ld+json">{jsonld}</script>
+</head>
+<body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main>
+<article>
+<h1>{headline}</h1>
+<div class="article-body">
+{body}
+</div>
+</article>
+<aside><h2>Das könnte dich auch interessieren</h2><ul class="teaser">{teasers}</ul></aside>
+</main>
+<footer>
+{boilerplate}
+</footer>
+</body>
+</html>
+"""
+
+
+def make_article_urls(n_articles: int, rng: random.Random, start: date = date(2016, 1, 1)) -> list[tuple[str, date]]:
+    """
+    Returns (url, publication date) pairs with Business Insider-style slugs.
+    """
+    urls = []
+    for i in range(n_articles):
+        published = start + timedelta(days=rng.randint(0, 9 * 365))
+        slug = "-".join(rng.choice(GERMAN_WORDS + ENGLISH_LOANWORDS).lower() for _ in range(5))
+        # ".html" endings pass both the legacy and the packaged is_valid_article_url
+        urls.append((f"{BASE_URL}/{rng.choice(SECTIONS)}/{slug}-{i}.html", published))
+    return urls
+
+
+def make_sitemaps(urls: list[str], sitemap_size: int = SITEMAP_SIZE) -> dict[str, str]:
+    """
+    Builds a sitemap index plus "post-sitemap" files listing the URLs.
+
+    Returns:
+        dict[str, str]: Path (relative to the site root) -> XML content.
+    """
+    files = {}
+    sitemap_urls = []
+    for n, start in enumerate(range(0, len(urls), sitemap_size), start=1):
+        name = f"post-sitemap{n}.xml"
+        sitemap_urls.append(f"{BASE_URL}/{name}")
+        entries = "".join(f"<url><loc>{u}</loc></url>" for u in urls[start:start + sitemap_size])
+        files[name] = ('<?xml version="1.0" encoding="UTF-8"?>'
+                       f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+    # Non-post sitemaps are listed too, so get_sitemap_urls has something to filter
+    sitemap_urls += [f"{BASE_URL}/page-sitemap.xml", f"{BASE_URL}/category-sitemap.xml"]
+    entries = "".join(f"<sitemap><loc>{u}</loc></sitemap>" for u in sitemap_urls)
+    files["sitemap_index.xml"] = ('<?xml version="1.0" encoding="UTF-8"?>'
+                                  f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                  f"{entries}</sitemapindex>")
+    return files
+
+
+def generate_fixture_site(
+    n_articles: int = 200,
+    seed: int = 42,
+    loanword_share: float = 0.04
+) -> dict[str, str]:
+    """
+    Generates a complete synthetic site in memory.
+
+    Parameters:
+        n_articles (int): Number of article pages.
+        seed (int): Seed, so the same fixture is produced on every run.
+        loanword_share (float): Share of English loanwords among body words.
+
+    Returns:
+        dict[str, str]: Absolute URL -> document (articles and sitemaps).
+    """
+    rng = random.Random(seed)
+    pages = {}
+    articles = make_article_urls(n_articles, rng)
+    for url, published in articles:
+        pages[url] = make_article_html(url, rng, published, loanword_share=loanword_share)
+    for name, xml in make_sitemaps([u for u, _ in articles]).items():
+        pages[f"{BASE_URL}/{name}"] = xml
+    return pages
+
+
+def url_to_path(url: str) -> str:
+    """
+    Maps a URL to a relative file path inside a fixture directory.
+    """
+    path = urlsplit(url).path.strip("/") or "index"
+    return path if path.endswith((".xml", ".html", ".txt")) else f"{path}/index.html"
+
+
+def write_fixture_site(directory: str, pages: Optional[dict[str, str]] = None, **kwargs) -> dict[str, str]:
+    """
+    Writes a fixture site to disk, with a manifest mapping URLs to files.
+
+    Parameters:
+        directory (str): Target directory.
+        pages (dict[str, str], optional): URL -> document (default generates one).
+        **kwargs: Passed to `generate_fixture_site`.
+
+    Returns:
+        dict[str, str]: URL -> file path relative to `directory` (also `manifest.json`).
+    """
+    pages = pages or generate_fixture_site(**kwargs)
+    root = Path(directory)
+    manifest = {}
+    for url, content in pages.items():
+        path = url_to_path(url)
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content, encoding="utf-8")
+        manifest[url] = path
+    with open(root / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def load_fixture_site(directory: str) -> dict[str, bytes]:
+    """
+    Loads a fixture site written by `write_fixture_site`.
+
+    Returns:
+        dict[str, bytes]: URL -> raw document bytes.
+    """
+    root = Path(directory)
+    with open(root / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {url: (root / path).read_bytes() for url, path in manifest.items()}
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "scrape_fixtures"
+    written = write_fixture_site(target, n_articles=int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+    print(f"✅ Wrote {len(written)} fixture pages to {target}")
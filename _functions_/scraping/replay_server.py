@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from html_fixtures import generate_fixture_site, load_fixture_site
+
+# === CONFIGURATION ===
+HOST = "127.0.0.1"
+CHUNK_SIZE = 16 * 1024
+NON_HTML_TYPES = ["application/pdf", "image/jpeg", "application/json"]
+
+
+@dataclass
+class ReplayConfig:
+    """
+    Network conditions and faults of the replay server.
+
+    Faults only hit article pages; the sitemap index and post-sitemaps are
+    always served, so URL discovery stays deterministic.
+
+    Attributes:
+        latency (tuple): Min and max seconds to wait before answering (uniform).
+        bandwidth (float, optional): Bytes per second per response (None = unlimited).
+        error_rates (dict): HTTP status -> probability, e.g. {429: 0.02, 503: 0.01}.
+        timeout_rate (float): Probability of stalling for `stall_seconds` before answering.
+        stall_seconds (float): Stall length; set it above the client timeout (10 s).
+        non_html_rate (float): Probability of answering with a non-HTML content type.
+        truncate_rate (float): Probability of closing the connection halfway through the body.
+        retry_after (int): Retry-After header sent with 429 responses.
+        seed (int, optional): Seed for the fault decisions.
+    """
+    latency: tuple = (0.0, 0.0)
+    bandwidth: Optional[float] = None
+    error_rates: dict = field(default_factory=dict)
+    timeout_rate: float = 0.0
+    stall_seconds: float = 12.0
+    non_html_rate: float = 0.0
+    truncate_rate: float = 0.0
+    retry_after: int = 1
+    seed: Optional[int] = None
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "ReplayServer/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        replay = self.server.replay
+        path = unquote(urlsplit(self.path).path)
+        body = replay.pages.get(path)
+        if body is None:
+            replay.record("404")
+            self._respond(404, b"Not found", "text/plain")
+            return
+
+        is_sitemap = path.endswith(".xml")
+        fault = None if is_sitemap else replay.draw_fault()
+        time.sleep(replay.draw_latency())
+
+        if fault == "timeout":
+            replay.record("timeout")
+            time.sleep(replay.config.stall_seconds)
+            return
+        if isinstance(fault, int):
+            replay.record(str(fault))
+            extra = {"Retry-After": str(replay.config.retry_after)} if fault == 429 else {}
+            self._respond(fault, b"Error", "text/plain", extra)
+            return
+        if fault == "non_html":
+            replay.record("non_html")
+            self._respond(200, body, replay.rng_choice(NON_HTML_TYPES))
+            return
+
+        content_type = "application/xml" if is_sitemap else "text/html; charset=utf-8"
+        replay.record("truncated" if fault == "truncated" else "200")
+        self._respond(200, body, content_type, truncate=fault == "truncated")
+
+    def _respond(self, status: int, body: bytes, content_type: str, extra: dict = None, truncate: bool = False):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (extra or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            # Content-Length announces the full body, so a truncated one fails on the client
+            self._write(body[:len(body) // 2] if truncate else body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        if truncate:
+            self.close_connection = True
+
+    def _write(self, body: bytes):
+        replay = self.server.replay
+        bandwidth = replay.config.bandwidth
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start:start + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+        replay.record_bytes(len(body))
+
+
+class ReplayServer:
+    """
+    Serves a recorded (or synthetic) site from memory over local HTTP.
+
+    Pages are looked up by path, and the original origin in sitemap XML is
+    rewritten to the server's address, so `get_sitemap_urls` ->
+    `get_article_urls` -> scraping works unchanged against
+    `server.url_for(<sitemap index URL>)`.
+
+    Usage:
+        with ReplayServer.from_directory("scrape_fixtures", ReplayConfig(latency=(0.05, 0.2))) as server:
+            urls = discover_urls(server.url_for(index_url))
+    """
+
+    def __init__(self, pages: dict[str, bytes], config: Optional[ReplayConfig] = None,
+                 host: str = HOST, port: int = 0):
+        self.config = config or ReplayConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _ReplayHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self._thread = None
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}"
+
+        origins = {f"{urlsplit(u).scheme}://{urlsplit(u).netloc}".encode() for u in pages}
+        self.pages = {}
+        for url, body in pages.items():
+            if urlsplit(url).path.endswith(".xml"):
+                for origin in origins:
+                    body = body.replace(origin, self.base_url.encode())
+            self.pages[urlsplit(url).path] = body
+        self.reset_stats()
+
+    @classmethod
+    def from_directory(cls, directory: str, config: Optional[ReplayConfig] = None, **kwargs) -> "ReplayServer":
+        """
+        Serves a fixture directory written by `html_fixtures.write_fixture_site`.
+        """
+        return cls(load_fixture_site(directory), config, **kwargs)
+
+    @classmethod
+    def synthetic(cls, n_articles: int = 200, seed: int = 42,
+                  config: Optional[ReplayConfig] = None, **kwargs) -> "ReplayServer":
+        """
+        Serves a seeded synthetic site from `html_fixtures.generate_fixture_site`.
+        """
+        pages = generate_fixture_site(n_articles=n_articles, seed=seed)
+        return cls({url: doc.encode("utf-8") for url, doc in pages.items()}, config, **kwargs)
+
+    # === LIFECYCLE ===
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # === HELPERS ===
+
+    def url_for(self, url: str) -> str:
+        """
+        Maps an original URL to its address on the replay server.
+        """
+        parts = urlsplit(url)
+        return self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def article_urls(self) -> list[str]:
+        return [self.base_url + path for path in self.pages if not path.endswith(".xml")]
+
+    def draw_fault(self):
+        config = self.config
+        with self._lock:
+            roll = self._rng.random()
+        for fault, rate in [("timeout", config.timeout_rate), *config.error_rates.items(),
+                            ("non_html", config.non_html_rate), ("truncated", config.truncate_rate)]:
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def draw_latency(self) -> float:
+        with self._lock:
+            return self._rng.uniform(*self.config.latency)
+
+    def rng_choice(self, options: list):
+        with self._lock:
+            return self._rng.choice(options)
+
+    # === STATS ===
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats[outcome] = self._stats.get(outcome, 0) + 1
+
+    def record_bytes(self, n: int) -> None:
+        with self._lock:
+            self._stats["bytes_sent"] += n
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {"requests": 0, "bytes_sent": 0}
+
+    def stats(self) -> dict:
+        """
+        Returns request counts per outcome ("200", "429", "timeout", "non_html", ...) and bytes sent.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a fixture site locally with simulated network conditions.")
+    parser.add_argument("--fixtures", help="Fixture directory (default: synthetic site)")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--bandwidth", type=float, help="Bytes per second per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 429/500/503 answers (split evenly)")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--non-html-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = ReplayConfig(
+        latency=tuple(args.latency),
+        bandwidth=args.bandwidth,
+        error_rates={status: args.error_rate / 3 for status in (429, 500, 503)},
+        timeout_rate=args.timeout_rate,
+        non_html_rate=args.non_html_rate,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    server = (ReplayServer.from_directory(args.fixtures, config, port=args.port) if args.fixtures
+              else ReplayServer.synthetic(args.articles, config=config, port=args.port))
+    print(f"🚀 Serving {len(server.pages)} pages at {server.base_url}/sitemap_index.xml (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, Optional
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+import boilerplate
+import site_profiles
+import url_canon
+from replay_server import ReplayConfig, ReplayServer
+
+# The parallel runners live in _functions_/scraping.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# === CONFIGURATION ===
+WORKER_COUNTS = [1, 5, 10, 20]
+RUNNERS = ["run_parallel_scraper", "initiate_scraping_in_parallel"]
+INDEX_PATH = "/sitemap_index.xml"
+# Short retry back-off, so a run measures the scraper rather than its sleeps
+DELAY_RANGE = (0.01, 0.05)
+RESULTS_CSV = "scrape_load_test_results.csv"
+
+
+class TimedLock:
+    """
+    A drop-in for `threading.Lock` that records how long writers waited for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        waited = time.perf_counter() - start
+        if acquired:
+            with self._stats_lock:
+                self.acquisitions += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+        return acquired
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _locs(url: str) -> list[str]:
+    res = requests.get(url, timeout=10)
+    res.raise_for_status()
+    return [el.text.strip() for el in ET.fromstring(res.content).iter() if el.tag.endswith("loc")]
+
+
+def discover_urls(index_url: str) -> list[str]:
+    """
+    Follows a sitemap index to its post-sitemaps and returns the article URLs.
+    (Same filtering as `get_sitemap_urls`, without needing lxml.)
+    """
+    urls = []
+    for sitemap in _locs(index_url):
+        if "post-sitemap" in sitemap:
+            urls.extend(_locs(sitemap))
+    return urls
+
+
+def fetch_article(url: str) -> Optional[dict]:
+    """
+    Light scrape function: fetch, check, parse and join paragraphs, no NLP.
+
+    HTTP errors and non-HTML answers raise, so the runners' retry handling is
+    exercised the same way as by a failing real scrape.
+    """
+    res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    res.raise_for_status()
+    if "text/html" not in res.headers.get("Content-Type", ""):
+        raise ValueError(f"Non-HTML content: {res.headers.get('Content-Type')}")
+    soup = BeautifulSoup(res.content, "html.parser")
+    paragraphs = soup.find_all("p")
+    return {"url": url, "paragraphs": len(paragraphs),
+            "text": " ".join(p.get_text() for p in paragraphs)}
+
+
+def _counting(scrape_func: Callable) -> tuple[Callable, dict]:
+    calls = {"attempts": 0}
+    lock = threading.Lock()
+
+    def wrapped(url):
+        with lock:
+            calls["attempts"] += 1
+        return scrape_func(url)
+    return wrapped, calls
+
+
+def run_once(
+    server: ReplayServer,
+    urls: list[str],
+    runner: str,
+    workers: int,
+    scrape_func: Callable = fetch_article,
+    max_retries: int = 3,
+    delay_range: tuple = DELAY_RANGE
+) -> dict:
+    """
+    Scrapes `urls` once from the replay server with one runner and worker count.
+
+    Each run starts with an empty boilerplate detector and URL canonicaliser
+    and writes their state into its temporary directory, so runs (and the
+    replay server's synthetic pages) never leak into each other or into the
+    real `boilerplate_paragraphs.parquet` / `canonical_urls.parquet`. The
+    replay server's host has no site profile, so unknown sites are accepted
+    as articles for the duration of the run.
+
+    Returns:
+        dict: Throughput, attempts/retries, failures, writer lock waits and server outcomes.
+    """
+    import scraping
+
+    run = getattr(scraping, runner)
+    func, calls = _counting(scrape_func)
+    lock = TimedLock()
+    server.reset_stats()
+
+    detector, canonicaliser = boilerplate._detector, url_canon._canonicaliser
+    allow_unknown_sites = site_profiles.ALLOW_UNKNOWN_SITES
+    boilerplate._detector = boilerplate.BoilerplateDetector()
+    url_canon._canonicaliser = url_canon.URLCanonicaliser()
+    site_profiles.ALLOW_UNKNOWN_SITES = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_csv = os.path.join(tmp, "articles.csv")
+            kwargs = {"resume": False} if runner == "run_parallel_scraper" else {"rerume": False}
+            start = time.perf_counter()
+            run(urls, output_csv, func, max_workers=workers, max_retries=max_retries,
+                delay_range=delay_range, csv_lock=lock,
+                boilerplate_path=os.path.join(tmp, boilerplate.BOILERPLATE_PATH),
+                canonical_map_path=os.path.join(tmp, url_canon.CANONICAL_MAP_PATH), **kwargs)
+            seconds = time.perf_counter() - start
+            scraped = len(pd.read_csv(output_csv)) if os.path.exists(output_csv) else 0
+    finally:
+        boilerplate._detector, url_canon._canonicaliser = detector, canonicaliser
+        site_profiles.ALLOW_UNKNOWN_SITES = allow_unknown_sites
+
+    return {
+        "runner": runner,
+        "workers": workers,
+        "urls": len(urls),
+        "articles": scraped,
+        "seconds": round(seconds, 3),
+        "articles_per_sec": round(scraped / seconds, 2),
+        "attempts": calls["attempts"],
+        "retries": calls["attempts"] - len(urls),
+        "failed": len(urls) - scraped,
+        "lock_acquisitions": lock.acquisitions,
+        "lock_wait_total_s": round(lock.wait_total, 4),
+        "lock_wait_max_ms": round(lock.wait_max * 1000, 2),
+        **{f"server_{k}": v for k, v in server.stats().items()},
+    }
+
+
+def load_test(
+    server: ReplayServer,
+    worker_counts: list[int] = WORKER_COUNTS,
+    runners: list[str] = RUNNERS,
+    max_articles: Optional[int] = None,
+    scrape_func: Callable = fetch_article,
+    max_retries: int = 3,
+    delay_range: tuple = DELAY_RANGE,
+    output_csv: Optional[str] = RESULTS_CSV
+) -> pd.DataFrame:
+    """
+    Runs every runner at every worker count against a replay server.
+
+    URLs are discovered from the server's sitemap index, like a real run.
+    `server` must already be started (use it as a context manager).
+
+    Parameters:
+        server (ReplayServer): The running replay server.
+        worker_counts (list[int]): Thread counts to try.
+        runners (list[str]): Runner functions in `scraping.py` to compare.
+        max_articles (int, optional): Limit on the URLs per run.
+        scrape_func (Callable): Scrape function (default `fetch_article`; pass
+            `helpers.scrape_article_full` to include parsing and NLP).
+        max_retries (int): Retries per URL in the runners.
+        delay_range (tuple): Retry back-off range in seconds.
+        output_csv (str, optional): Where to save the results.
+
+    Returns:
+        pd.DataFrame: One row per (runner, workers).
+    """
+    urls = discover_urls(server.base_url + INDEX_PATH)[:max_articles]
+    print(f"🚀 Load test on {len(urls)} URLs from {server.base_url}")
+
+    rows = []
+    for runner in runners:
+        for workers in worker_counts:
+            row = run_once(server, urls, runner, workers, scrape_func, max_retries, delay_range)
+            print(f"⏱️  {runner} x{workers}: {row['articles_per_sec']} articles/sec, "
+                  f"{row['retries']} retries, {row['failed']} failed, "
+                  f"lock wait {row['lock_wait_total_s']}s")
+            rows.append(row)
+
+    results = pd.DataFrame(rows)
+    if output_csv:
+        results.to_csv(output_csv, index=False)
+        print(f"✅ Results saved to {output_csv}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the parallel scrapers against a local replay server.")
+    parser.add_argument("--fixtures", help="Fixture directory (default: synthetic site)")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=WORKER_COUNTS)
+    parser.add_argument("--runners", nargs="+", default=RUNNERS, choices=RUNNERS)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.05, 0.2), metavar=("MIN", "MAX"))
+    parser.add_argument("--bandwidth", type=float, help="Bytes per second per response")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of 429/500/503 answers (split evenly)")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--non-html-rate", type=float, default=0.01)
+    parser.add_argument("--truncate-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--full", action="store_true", help="Use helpers.scrape_article_full (loads NLP models)")
+    parser.add_argument("--output", default=RESULTS_CSV)
+    args = parser.parse_args()
+
+    config = ReplayConfig(
+        latency=tuple(args.latency),
+        bandwidth=args.bandwidth,
+        error_rates={status: args.error_rate / 3 for status in (429, 500, 503)},
+        timeout_rate=args.timeout_rate,
+        non_html_rate=args.non_html_rate,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    func = fetch_article
+    if args.full:
+        from helpers import scrape_article_full as func
+
+    server = (ReplayServer.from_directory(args.fixtures, config) if args.fixtures
+              else ReplayServer.synthetic(args.articles, config=config))
+    with server:
+        results = load_test(server, args.workers, args.runners, scrape_func=func, output_csv=args.output)
+    print(results[["runner", "workers", "articles_per_sec", "retries", "failed",
+                   "lock_wait_total_s", "lock_wait_max_ms"]].to_string(index=False))
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import cProfile
+import heapq
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("scrape_timing")
+
+# === CONFIGURATION ===
+PHASES = ["fetch", "decode", "parse", "extract", "nlp", "sentiment"]
+# Log-spaced histogram buckets from 10 µs to 100 s, 10 per decade
+BUCKET_EDGES = np.logspace(-5, 2, 71)
+LOG_EVERY = 100
+PROFILE_DIR = "scrape_profiles"
+
+
+class PhaseHistogram:
+    """
+    Fixed-bucket histogram of durations, with exact count, sum and max.
+
+    Recording is one bucket lookup and a few additions, so it is cheap enough
+    for the per-article hot path.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(len(BUCKET_EDGES) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[np.searchsorted(BUCKET_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile (upper edge of the bucket holding it, capped at the max).
+        """
+        if not self.count:
+            return float("nan")
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * self.count))
+        return min(float(BUCKET_EDGES[min(bucket, len(BUCKET_EDGES) - 1)]), self.max)
+
+
+class _Timing:
+    """
+    Process-wide timing state. Disabled unless `enable_timing` is called
+    (or SCRAPE_TIMING=1 is set), in which case `phase` is a no-op.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("SCRAPE_TIMING") == "1"
+        self.lock = threading.Lock()
+        self.log_every = LOG_EVERY
+        self.profile_slowest = 0
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.wall = {}
+            self.cpu = {}
+            self.articles = 0
+            self.slowest = []  # min-heap of (seconds, sequence, url, profile)
+
+
+_timing = _Timing()
+_local = threading.local()
+# cProfile can only be active in one thread at a time (Python 3.12+), so
+# concurrent articles are profiled one at a time and the rest only timed
+_profile_lock = threading.Lock()
+
+
+def enable_timing(log_every: int = LOG_EVERY, profile_slowest: int = 0) -> None:
+    """
+    Turns on phase timing.
+
+    Parameters:
+        log_every (int): Log a summary every this many articles (0 disables).
+        profile_slowest (int): Keep cProfile profiles of the N slowest profiled
+            articles (profiling costs extra time, so the default is 0).
+    """
+    _timing.enabled = True
+    _timing.log_every = log_every
+    _timing.profile_slowest = profile_slowest
+
+
+def disable_timing() -> None:
+    _timing.enabled = False
+
+
+def reset_timing() -> None:
+    _timing.reset()
+
+
+def _record(name: str, wall: float, cpu: float) -> None:
+    with _timing.lock:
+        _timing.wall.setdefault(name, PhaseHistogram()).record(wall)
+        _timing.cpu.setdefault(name, PhaseHistogram()).record(cpu)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Times one phase (wall and thread CPU time) of the current article.
+    """
+    if not _timing.enabled:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+
+@contextmanager
+def article_timer(url: str):
+    """
+    Times a whole article (as phase "total") and, if enabled, profiles it.
+
+    Nested timers (e.g. a pipeline wrapping `scrape_article_full`) only count
+    the outermost one.
+    """
+    if not _timing.enabled or getattr(_local, "active", False):
+        yield
+        return
+
+    _local.active = True
+    profiler = None
+    if _timing.profile_slowest and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            _profile_lock.release()
+        _local.active = False
+        seconds = time.perf_counter() - wall
+        _record("total", seconds, time.thread_time() - cpu)
+
+        with _timing.lock:
+            _timing.articles += 1
+            if profiler:
+                entry = (seconds, _timing.articles, url, profiler)
+                if len(_timing.slowest) < _timing.profile_slowest:
+                    heapq.heappush(_timing.slowest, entry)
+                elif seconds > _timing.slowest[0][0]:
+                    heapq.heapreplace(_timing.slowest, entry)
+            log_now = _timing.log_every and _timing.articles % _timing.log_every == 0
+
+        if log_now:
+            logger.info(f"Scrape timing after {_timing.articles} articles:\n"
+                        f"{timing_summary().to_string()}")
+
+
+def timing_summary() -> pd.DataFrame:
+    """
+    Summarises the recorded phases.
+
+    Returns:
+        pd.DataFrame: Per phase: count, mean/p50/p95/p99/max wall seconds,
+        mean CPU seconds and the share of total wall time.
+    """
+    with _timing.lock:
+        phases = [p for p in PHASES + ["total"] if p in _timing.wall] + \
+            [p for p in _timing.wall if p not in PHASES + ["total"]]
+        rows = []
+        for name in phases:
+            wall, cpu = _timing.wall[name], _timing.cpu[name]
+            rows.append({
+                "phase": name,
+                "count": wall.count,
+                "mean_s": wall.total / wall.count,
+                "p50_s": wall.quantile(0.5),
+                "p95_s": wall.quantile(0.95),
+                "p99_s": wall.quantile(0.99),
+                "max_s": wall.max,
+                "cpu_mean_s": cpu.total / cpu.count,
+                "wall_total_s": wall.total,
+            })
+
+    summary = pd.DataFrame(rows).set_index("phase") if rows else pd.DataFrame()
+    if "total" in summary.index:
+        summary["share"] = summary["wall_total_s"] / summary.loc["total", "wall_total_s"]
+    return summary
+
+
+def log_timing_summary() -> None:
+    """
+    Logs (and prints) the phase summary, if timing is enabled; for the end of a scrape run.
+    """
+    if not _timing.enabled or not _timing.wall:
+        return
+    summary = timing_summary().to_string()
+    logger.info(f"Scrape timing after {_timing.articles} articles:\n{summary}")
+    print(summary)
+
+
+def dump_slowest_profiles(directory: str = PROFILE_DIR) -> list[str]:
+    """
+    Writes the cProfile stats of the slowest articles (view with `snakeviz` or `pstats`).
+
+    Returns:
+        list[str]: The written .prof files, slowest first.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with _timing.lock:
+        slowest = sorted(_timing.slowest, key=lambda entry: -entry[0])
+
+    paths = []
+    for rank, (seconds, _, url, profiler) in enumerate(slowest, start=1):
+        path = os.path.join(directory, f"{rank:02d}_{seconds:.2f}s.prof")
+        profiler.dump_stats(path)
+        logger.info(f"Profile of {url} ({seconds:.2f}s) -> {path}")
+        paths.append(path)
+    return paths
+
+
+def slowest_urls() -> list[tuple[float, str]]:
+    """
+    Returns (seconds, url) of the profiled slowest articles, slowest first.
+    """
+    with _timing.lock:
+        return sorted(((s, u) for s, _, u, _ in _timing.slowest), reverse=True)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+from unittest import mock
+
+import requests
+from bs4 import BeautifulSoup
+
+from html_fixtures import load_fixture_site, generate_fixture_site
+from scrape_timing import disable_timing, enable_timing, reset_timing, timing_summary
+
+HISTORY_JSON = "scraping_benchmark_results.json"
+# Relative slowdown that counts as a regression
+REGRESSION_THRESHOLD = 0.2
+PARSERS = ["html.parser", "html5lib", "lxml"]
+
+
+def _fixture_response(url: str, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    # Already "read", so iter_content (streaming fetch) serves the body in chunks
+    response._content_consumed = True
+    response.headers["Content-Type"] = "text/xml" if url.endswith(".xml") else "text/html; charset=utf-8"
+    return response
+
+
+@contextmanager
+def offline(pages: dict[str, bytes]):
+    """
+    Serves `requests.get` from the fixture pages instead of the network.
+    """
+    def fake_get(url, *args, **kwargs):
+        if url not in pages:
+            response = _fixture_response(url, b"")
+            response.status_code = 404
+            return response
+        return _fixture_response(url, pages[url])
+
+    with mock.patch("requests.get", fake_get):
+        yield
+
+
+def _time_per_call(func, items: list, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / (len(items) * repeat)
+
+
+def bench_extractors(articles: dict[str, bytes], repeat: int = 3) -> dict:
+    """
+    Times HTML parsing per parser and each extractor per page.
+
+    Returns:
+        dict: Microseconds per page for every parser and extractor.
+    """
+    import scraping_helpers as helpers
+
+    results = {}
+    html = [body.decode("utf-8") for body in articles.values()]
+    for parser in PARSERS:
+        try:
+            BeautifulSoup("<p></p>", parser)
+        except Exception:
+            continue
+        results[f"parse_{parser}_us"] = round(
+            _time_per_call(lambda h: BeautifulSoup(h, parser), html) * 1e6, 1)
+
+    soups = [BeautifulSoup(h, "html.parser") for h in html]
+    extractors = {
+        "extract_meta_data": lambda s: helpers.extract_meta_data(soup=s),
+        "extract_jsonld_date": lambda s: helpers.extract_jsonld_date(soup=s),
+        "extract_headline": lambda s: helpers.extract_headline(soup=s),
+        "paragraph_text": lambda s: " ".join(p.get_text() for p in s.find_all("p")),
+    }
+    for name, func in extractors.items():
+        results[f"{name}_us"] = round(_time_per_call(func, soups, repeat) * 1e6, 1)
+    results["extract_year_from_url_us"] = round(
+        _time_per_call(lambda u: helpers.extract_year_from_url(url=u), list(articles), repeat) * 1e6, 2)
+    return results
+
+
+def bench_scrape_article_full(pages: dict[str, bytes], articles: list[str]) -> dict:
+    """
+    Runs `scrape_article_full` over the fixture articles with the network stubbed out.
+
+    A fresh boilerplate detector and URL canonicaliser are used, so the result
+    does not depend on the `boilerplate_paragraphs.parquet` in the working
+    directory, and the fixture pages never reach the process-wide state.
+
+    Returns:
+        dict: Articles/sec, ms per article and mean ms per phase.
+    """
+    import scraping_pipeline
+    from boilerplate import BoilerplateDetector
+    from url_canon import URLCanonicaliser
+
+    detector, canonicaliser = BoilerplateDetector(), URLCanonicaliser()
+    reset_timing()
+    enable_timing(log_every=0)
+    try:
+        with offline(pages):
+            start = time.perf_counter()
+            scraped = [scraping_pipeline.scrape_article_full(url, detector=detector, canonicaliser=canonicaliser)
+                       for url in articles]
+            seconds = time.perf_counter() - start
+        phases = timing_summary()
+    finally:
+        disable_timing()
+
+    results = {
+        "articles": sum(1 for r in scraped if r),
+        "articles_per_sec": round(len(articles) / seconds, 2),
+        "ms_per_article": round(seconds / len(articles) * 1000, 3),
+    }
+    for name, row in phases.iterrows():
+        if name != "total":
+            results[f"{name}_ms"] = round(row["mean_s"] * 1000, 3)
+    return results
+
+
+def bench_detect_loanwords(texts: list[str]) -> dict:
+    """
+    Times `detect_loanwords`, normalised per 1,000 tokens.
+    """
+    from scraping_helpers import detect_loanwords
+
+    tokens = sum(len(t.split()) for t in texts)
+    start = time.perf_counter()
+    found = sum(len(detect_loanwords(t)) for t in texts)
+    seconds = time.perf_counter() - start
+    return {
+        "tokens": tokens,
+        "loanwords": found,
+        "ms_per_1k_tokens": round(seconds / tokens * 1000 * 1000, 3),
+    }
+
+
+def bench_sentiment(texts: list[str], batch_size: int = 32) -> dict:
+    """
+    Times `batch_analyse_sentiment_fast`, normalised per 100 articles.
+    """
+    import pandas as pd
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nlp"))
+    from sentiment_helpers import batch_analyse_sentiment_fast
+
+    df = pd.DataFrame({"text": texts})
+    start = time.perf_counter()
+    batch_analyse_sentiment_fast(df, batch_size=batch_size)
+    seconds = time.perf_counter() - start
+    return {
+        "articles": len(texts),
+        "s_per_100_articles": round(seconds / len(texts) * 100, 3),
+    }
+
+
+def _flatten(results: dict) -> dict[str, float]:
+    flat = {}
+    for section, values in results.items():
+        if isinstance(values, dict):
+            for name, value in values.items():
+                if isinstance(value, (int, float)):
+                    flat[f"{section}.{name}"] = value
+    return flat
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def _is_timing(metric: str) -> bool:
+    name = metric.split(".", 1)[-1]
+    return name.endswith(("_us", "_ms", "_per_sec")) or name.startswith(("ms_per_", "s_per_"))
+
+
+def check_regressions(
+    history: list[dict],
+    threshold: float = REGRESSION_THRESHOLD,
+    baseline_runs: int = 3
+) -> list[dict]:
+    """
+    Compares the latest run with the median of the previous runs.
+
+    Parameters:
+        history (list[dict]): Benchmark runs, oldest first.
+        threshold (float): Relative slowdown that counts as a regression (0.2 = 20%).
+        baseline_runs (int): Number of earlier runs forming the baseline.
+
+    Returns:
+        list[dict]: One entry per regressed metric (metric, baseline, latest, change).
+    """
+    if len(history) < 2:
+        return []
+
+    latest = _flatten(history[-1])
+    earlier = [_flatten(run) for run in history[-1 - baseline_runs:-1]]
+    regressions = []
+    for metric, value in latest.items():
+        if not _is_timing(metric):
+            continue
+        values = sorted(run[metric] for run in earlier if metric in run)
+        if not values:
+            continue
+        baseline = values[len(values) // 2]
+        if not baseline or not value:
+            continue
+        # Positive change = slower, for both "time per" and "per second" metrics
+        change = baseline / value - 1 if _higher_is_better(metric) else value / baseline - 1
+        if change > threshold:
+            regressions.append({"metric": metric, "baseline": baseline,
+                                "latest": value, "change": round(change, 3)})
+    return regressions
+
+
+def run_scraping_benchmark(
+    fixture_dir: Optional[str] = None,
+    n_articles: int = 200,
+    nlp: bool = True,
+    nlp_articles: int = 100,
+    output_json: str = HISTORY_JSON,
+    threshold: float = REGRESSION_THRESHOLD,
+    seed: int = 42
+) -> tuple[dict, list[dict]]:
+    """
+    Benchmarks the scraping and NLP hot paths offline.
+
+    Uses a frozen fixture directory (see `html_fixtures.write_fixture_site`) if
+    given, otherwise a seeded synthetic site, so runs are comparable. Results
+    are appended to a JSON history and the latest run is checked against the
+    previous ones.
+
+    Parameters:
+        fixture_dir (str, optional): Directory with a recorded or generated fixture site.
+        n_articles (int): Number of synthetic articles (without `fixture_dir`).
+        nlp (bool): Also benchmark `detect_loanwords` and sentiment (needs the models).
+        nlp_articles (int): Articles used for the NLP benchmarks.
+        output_json (str): History file to append the results to.
+        threshold (float): Relative slowdown flagged as a regression.
+        seed (int): Seed for the synthetic site.
+
+    Returns:
+        tuple: The results of this run and the detected regressions.
+    """
+    if fixture_dir:
+        pages = load_fixture_site(fixture_dir)
+    else:
+        pages = {url: html.encode("utf-8")
+                 for url, html in generate_fixture_site(n_articles=n_articles, seed=seed).items()}
+    articles = {url: body for url, body in pages.items() if not url.endswith(".xml")}
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "fixture": fixture_dir or f"synthetic(n={n_articles}, seed={seed})",
+        "n_articles": len(articles),
+    }
+
+    print("⏱️  extractors...")
+    results["extractors"] = bench_extractors(articles)
+    print("⏱️  scrape_article_full (offline)...")
+    results["scrape_article_full"] = bench_scrape_article_full(pages, list(articles))
+
+    if nlp:
+        texts = [" ".join(p.get_text() for p in BeautifulSoup(body, "html.parser").find_all("p"))
+                 for body in list(articles.values())[:nlp_articles]]
+        print("⏱️  detect_loanwords...")
+        results["detect_loanwords"] = bench_detect_loanwords(texts)
+        print("⏱️  sentiment...")
+        results["sentiment"] = bench_sentiment(texts)
+
+    history = []
+    if os.path.exists(output_json):
+        with open(output_json, encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(results)
+    with open(output_json, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+    regressions = check_regressions(history, threshold)
+    print_benchmark_report(results, regressions)
+    return results, regressions
+
+
+def print_benchmark_report(results: dict, regressions: list[dict]) -> None:
+    """
+    Prints a compact, human-readable view of one benchmark run.
+    """
+    print(f"\n📊 Scraping benchmark ({results['fixture']}, {results['n_articles']} articles)")
+    for section in ("extractors", "scrape_article_full", "detect_loanwords", "sentiment"):
+        if section in results:
+            values = "  ".join(f"{k}={v}" for k, v in results[section].items())
+            print(f"  {section}: {values}")
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s):")
+        for r in regressions:
+            print(f"  {r['metric']}: {r['baseline']} -> {r['latest']} ({r['change']:+.0%})")
+    else:
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scraping and NLP offline on fixture HTML.")
+    parser.add_argument("--fixtures", help="Fixture directory (default: seeded synthetic site)")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--no-nlp", action="store_true", help="Skip loanword and sentiment benchmarks")
+    parser.add_argument("--nlp-articles", type=int, default=100)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--output", default=HISTORY_JSON)
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    _, found = run_scraping_benchmark(
+        fixture_dir=args.fixtures,
+        n_articles=args.articles,
+        nlp=not args.no_nlp,
+        nlp_articles=args.nlp_articles,
+        output_json=args.output,
+        threshold=args.threshold,
+    )
+    if args.check and found:
+        sys.exit(1)
@@ -14,7 +14,15 @@ from urllib.parse import urlparse
 import json
 from langdetect.lang_detect_exception import LangDetectException
 from transformers import pipeline
-from typing import Optional
+from typing import Optional, Union
+from array import array
+import os
+import sys
+
+import site_profiles
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nlp"))
+from article_doc import ArticleDoc, sentiment_text
 
 headers = {
     "User-Agent": "Mozilla/5.0"
@@ -25,23 +33,25 @@ sentiment_model = pipeline(
 nlp = spacy.load("de_core_news_sm")  # de_core_news_lg best for accuracy
 
 
-def get_sitemap_urls(index_url: str) -> list[str]:
+def get_sitemap_urls(index_url: str, pattern: str = "post-sitemap") -> list[str]:
     """
     Retrieves a list of sitemap URLs from a sitemap index XML file.
 
     This function sends a GET request to the provided sitemap index URL,
     parses the XML content, and returns a list of URLs that contain
-    the substring "post-sitemap" (commonly used for blog post sitemaps).
+    the substring `pattern` ("post-sitemap", commonly used for blog post sitemaps,
+    by default; see `SiteProfile.sitemap_filter` for other sites).
 
     Parameters:
         index_url (str): The URL of the sitemap index file (typically ending in .xml).
+        pattern (str): Substring selecting the article sitemaps.
 
     Returns:
         list[str]: A list of sitemap URLs filtered to include only those related to posts.
     """
     res = requests.get(index_url, headers=headers)
     soup = BeautifulSoup(res.text, "xml")
-    return [loc.text for loc in soup.find_all("loc") if "post-sitemap" in loc.text]
+    return [loc.text for loc in soup.find_all("loc") if pattern in loc.text]
 
 
 def get_article_urls(sitemap_url: str) -> list[str]:
@@ -64,14 +74,14 @@ def get_article_urls(sitemap_url: str) -> list[str]:
     return [loc.text for loc in soup.find_all("loc")]
 
 
-# TODO change the startswith url to be reusable
 def is_valid_article_url(url: str) -> bool:
     """
     Check if a given URL is a valid article link.
 
-    A valid article URL is defined as one that:
-    - Ends with "html"
-    - Does not contain any of the substrings listed in `non_article_pages`
+    The rule comes from the site's profile in `site_profiles` (domain, allow
+    patterns, non-article pages such as videos, galleries and live tickers).
+    URLs of sites without a profile are rejected unless
+    `site_profiles.ALLOW_UNKNOWN_SITES` is set.
 
     Parameters:
         url (str): The URL to validate.
@@ -79,13 +89,7 @@ def is_valid_article_url(url: str) -> bool:
     Returns:
         bool: True if the URL is considered a valid article URL, False otherwise.
     """
-    non_article_pages = ["/video/,", ".jpg", ".jpeg",
-                         ".png", ".gif", "/bilder/", "/photo/", "/live/"]
-
-    return (
-        url.startswith("https://www.businessinsider.de/")
-        and not any(pattern in url for pattern in non_article_pages)
-    )
+    return site_profiles.is_valid_article_url(url)
 
 
 def extract_meta_data(soup: BeautifulSoup) -> Optional[str]:
@@ -134,6 +138,23 @@ def extract_jsonld_date(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 
+def extract_time_tag_date(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Extracts the publication date from the first <time datetime="..."> element.
+
+    Parameters:
+        soup (BeautifulSoup): A BeautifulSoup object representing the parsed HTML content.
+
+    Returns:
+        str or None: The publication date as a string in 'YYYY-MM-DD' format if found,
+        otherwise None.
+    """
+    time_tag = soup.find("time", datetime=True)
+    if time_tag:
+        return time_tag["datetime"].split("T")[0].split(" ")[0]
+    return None
+
+
 def extract_year_from_url(url: str) -> Optional[str]:
     """
     Extracts a four-digit year (starting with 20) from a URL string.
@@ -184,37 +205,44 @@ def extract_headline(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 
-def detect_loanwords(text: str) -> list[str]:
+def make_doc(text: str) -> ArticleDoc:
+    """
+    Tokenises an article once (spaCy tokenizer only) for all NLP steps.
+    """
+    return ArticleDoc.build(text, nlp.tokenizer)
+
+
+def detect_loanwords(text: Union[str, ArticleDoc]) -> list[str]:
     """
     Detects potential English loanwords in a given text.
 
-    This function tokenizes the input text using a spaCy NLP pipeline,
-    filters out stop words and non-alphabetic tokens, and checks if
-    each remaining word is likely to be English using a language detection
-    library. Only words with 4 or more alphabetic characters are considered.
+    This function tokenizes the input text with the spaCy tokenizer (unless
+    an `ArticleDoc` is passed), skips stop words and non-alphabetic tokens,
+    and checks if each remaining word is likely to be English using a
+    language detection library. Only words with 4 or more ASCII letters are
+    considered. The indices of the detected tokens are stored in
+    `doc.loanwords`, for the count, density and top loanwords.
 
     Parameters:
-        text (str): The input text to analyze.
+        text (str or ArticleDoc): The input text or its tokenised document.
 
     Returns:
         list of str: A list of lowercase English words that are likely
         loanwords in the context of the input text.
     """
-    doc = nlp(text)
-    loanwords = []
-    for token in doc:
-        if token.is_alpha and not token.is_stop:
-            word = token.text
-            if re.match(r"^[A-Za-z]{4,}$", word):
-                try:
-                    if detect(word) == "en":
-                        loanwords.append(word.lower())
-                except LangDetectException:
-                    continue
-    return loanwords
+    doc = text if isinstance(text, ArticleDoc) else make_doc(text)
+    found = array("I")
+    for i, word in doc.iter_candidates():
+        try:
+            if detect(word) == "en":
+                found.append(i)
+        except LangDetectException:
+            continue
+    doc.loanwords = found
+    return list(doc.iter_loanwords())
 
 
-def analyse_sentiment(text: str) -> Optional[str]:
+def analyse_sentiment(text: Union[str, ArticleDoc]) -> Optional[str]:
     """
     Analyses the sentiment of the given text using a preloaded sentiment model.
 
@@ -223,13 +251,14 @@ def analyse_sentiment(text: str) -> Optional[str]:
     in lowercase (e.g., 'positive', 'negative', 'neutral').
 
     Parameters:
-        text (str): The input text to analyze.
+        text (str or ArticleDoc): The input text or its tokenised document
+            (cut at a token boundary instead of mid-word).
 
     Returns:
         str: The sentiment label in lowercase. Returns "unknown" if analysis fails.
     """
     try:
-        result = sentiment_model(text[:516])[0]
+        result = sentiment_model(sentiment_text(text))[0]
         return result["label"].lower()
     except (KeyError, IndexError, TypeError) as e:
         print(f"Sentiment analysis error: {e}")
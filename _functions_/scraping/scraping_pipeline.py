@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
@@ -14,64 +16,146 @@ from scraping_helpers import (
     is_valid_article_url,
     extract_meta_data,
     extract_jsonld_date,
+    extract_time_tag_date,
     extract_year_from_url,
     extract_headline
 )
+from site_profiles import SiteProfile, profile_for
+from scrape_timing import article_timer, phase
+from boilerplate import BoilerplateDetector, get_detector
+from fetch import FetchRejected, fetch_html
+from url_canon import URLCanonicaliser, get_canonicaliser
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "corpus"))
+from article_ids import make_article_id, content_hash
+
+# Date sources a SiteProfile can list, tried in the profile's order
+DATE_EXTRACTORS = {
+    "meta": lambda soup, url: extract_meta_data(soup=soup),
+    "jsonld": lambda soup, url: extract_jsonld_date(soup=soup),
+    "time": lambda soup, url: extract_time_tag_date(soup=soup),
+    "url": lambda soup, url: extract_year_from_url(url=url),
+}
 
 
-def scrape_article_full(url: str) -> Optional[dict]:
+def extract_date(soup: BeautifulSoup, url: str, profile: SiteProfile) -> Optional[str]:
+    """
+    Returns the first date found by the profile's date sources.
+    """
+    for source in profile.date_sources:
+        date = DATE_EXTRACTORS[source](soup, url)
+        if date:
+            return date
+    return None
+
+
+def scrape_article_full(
+    url: str,
+    detector: Optional[BoilerplateDetector] = None,
+    canonicaliser: Optional[URLCanonicaliser] = None,
+    raise_errors: bool = False
+) -> Optional[dict]:
     """
     Scrapes an article from the given URL and extracts metadata, text content,
     loanword analysis, and sentiment.
 
     This function performs the following:
     - Downloads the article content
-    - Parses HTML to extract paragraphs
-    - Extracts publication date (from metadata, JSON-LD, or URL)
+    - Parses HTML to extract paragraphs (with the site profile's selector)
+    - Drops paragraphs repeated across the site (see `boilerplate.py`)
+    - Extracts publication date (from the profile's date sources: metadata,
+      JSON-LD, <time> tag or URL)
     - Calculates word count, loanword stats, and sentiment
     - Returns all information in a dictionary
 
+    With timing enabled (`scrape_timing.enable_timing`), the fetch, decode,
+    parse and extract phases are timed per article.
+
     Parameters:
         url (str): The URL of the article to scrape.
+        detector (BoilerplateDetector, optional): Detector to learn and strip
+            boilerplate with (default: the process-wide `get_detector()`).
+        canonicaliser (URLCanonicaliser, optional): Canonicaliser to learn
+            rel=canonical links into (default: `get_canonicaliser()`).
+        raise_errors (bool): Re-raise network errors instead of returning None,
+            for callers that retry them (URL queue, crawl scheduler).
 
     Returns:
         dict or None: A dictionary containing article data and analysis results.
         Returns None if scraping or parsing fails.
+
+    Raises:
+        requests.RequestException: On network or HTTP errors, if `raise_errors`.
     """
     if not is_valid_article_url(url=url):
         print(f"Skipping non-article URL: {url}")
         return None
 
+    with article_timer(url):
+        return extract_article(url, detector, canonicaliser, raise_errors)
+
+
+def extract_article(
+    url: str,
+    detector: Optional[BoilerplateDetector] = None,
+    canonicaliser: Optional[URLCanonicaliser] = None,
+    raise_errors: bool = False,
+    parser: str = "html.parser"
+) -> Optional[dict]:
+    """
+    Fetches one article page and extracts its text and metadata, without
+    the URL check and the per-article timer of `scrape_article_full`.
+
+    Shared by `scrape_article_full` and the NLP scraper in `helpers.py`,
+    which runs the quality gate and NLP on the result. Parameters as in
+    `scrape_article_full`; `parser` is the BeautifulSoup parser.
+    """
+    detector = detector or get_detector()
+    canonicaliser = canonicaliser or get_canonicaliser()
     try:
-        res = requests.get(url, headers=headers, timeout=10)
-
-        if "text/html" not in res.headers.get("Content-Type", ""):
-            print(f"Non-HTML content for {url}")
-            return None
-
-        res.encoding = res.apparent_encoding
-        soup = BeautifulSoup(res.text, "html.parser")
-        paragraphs = soup.find_all("p")
-
-        if len(paragraphs) < 5:
-            print(f"Too few paragraphs at {url}")
-            return None
-
-        text = " ".join(p.get_text() for p in paragraphs).strip()
-        if not text:
-            print(f"No text extracted from {url}")
-            return None
-
-        text = " ".join(p.get_text() for p in paragraphs)
-        date = extract_meta_data(soup=soup) or extract_jsonld_date(
-            soup=soup) or extract_year_from_url(url=url)
-        year = date.split("-")[0] if date else None
-        domain = urlparse(url).netloc
-        source_site = domain.replace("www.", "")
-        headline = extract_headline(soup=soup)
-        word_count = len(text.split())
+        profile = profile_for(url)
+        with phase("fetch"):
+            # Streams the body after checking status, Content-Type and size, up to the end of
+            # the profile's body container
+            page = fetch_html(url, headers=headers, timeout=10, stop_marker=profile.body_end_marker,
+                              start_marker=profile.body_start_marker)
+
+        with phase("decode"):
+            html = page.text()
+
+        with phase("parse"):
+            soup = BeautifulSoup(html, parser)
+            # rel=canonical lets later runs skip other spellings of this article before fetching
+            canonicaliser.learn_from_soup(url, soup)
+
+        with phase("extract"):
+            paragraphs = profile.paragraphs(soup)
+
+            if len(paragraphs) < 5:
+                print(f"Too few paragraphs at {url}")
+                return None
+
+            domain = urlparse(url).netloc
+            source_site = domain.replace("www.", "")
+            # Paragraphs repeated across the site (newsletter, cookie, bio, "Lest auch"
+            # blocks) are dropped here, so no downstream stage sees them
+            body = [p.get_text() for p in paragraphs]
+            texts = detector.strip(source_site, body)
+            # Links inside the body paragraphs, for the quality gate's link-heavy check
+            links = sum(len(p.find_all("a")) for p in paragraphs)
+            text = " ".join(texts)
+            if not text.strip():
+                print(f"No text extracted from {url}")
+                return None
+
+            date = extract_date(soup, url, profile)
+            year = date.split("-")[0] if date else None
+            headline = extract_headline(soup=soup)
+            word_count = len(text.split())
 
         return {
+            "article_id": make_article_id(url),
+            "content_hash": content_hash(text),
             "url": url,
             "source_site": source_site,
             "domain": domain.split(".")[0],
@@ -80,9 +164,20 @@ def scrape_article_full(url: str) -> Optional[dict]:
             "text": text,
             "headline": headline,
             "word_count": word_count,
-            "paragraphs": len(paragraphs)
+            # Body paragraphs before stripping; the content paragraphs are the difference
+            "paragraphs": len(paragraphs),
+            "boilerplate_paragraphs": len(paragraphs) - len(texts),
+            "links": links
         }
 
-    except (requests.RequestException, AttributeError, ValueError) as e:
+    except FetchRejected as e:
+        print(f"Skipping {url}: {e}")
+        return None
+    except requests.RequestException as e:
+        if raise_errors:
+            raise
+        print(f"Error scraping {url}: {e}")
+        return None
+    except (AttributeError, ValueError) as e:
         print(f"Error scraping {url}: {e}")
         return None
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+# === CONFIGURATION ===
+# Media, galleries and live tickers are never articles, on any site
+NON_ARTICLE_PAGES = ["/video/", "/videos/", ".jpg", ".jpeg", ".png", ".gif",
+                     "/bilder/", "/photo/", "/live/", "/fotostrecke/"]
+DATE_SOURCES = ("meta", "jsonld", "url")
+# Campaign and share parameters the news sites append to their own links; ordinary
+# names elsewhere, so they are only stripped from URLs of registered sites
+NEWS_TRACKING_PARAMS = ["ref", "share", "cmp", "amp", "icid", "ocid", "ito", "outputtype"]
+# URLs of hosts without a registered profile are not articles unless a caller
+# opts in (e.g. the load test against the local replay server)
+ALLOW_UNKNOWN_SITES = False
+
+
+@dataclass
+class SiteProfile:
+    """
+    How to crawl and extract one outlet.
+
+    Attributes:
+        name (str): Short name, used as `source_site` label in reports.
+        domains (list[str]): Hosts of the site (without "www.").
+        sitemap_index (str, optional): Sitemap index URL for URL discovery.
+        sitemap_filter (str): Substring selecting the article sitemaps in the index.
+        allow_patterns (list[str]): Regexes an article URL must match (any); empty allows all.
+        deny_patterns (list[str]): Substrings that exclude a URL.
+        tracking_params (list[str]): Query parameters (lower-case) that only track
+            the visit on this site; `url_canon` drops them on top of its global list.
+        paragraph_selector (str): CSS selector for the body paragraphs.
+        date_sources (tuple): Date extractors to try in order ("meta", "jsonld", "time", "url").
+        body_start_marker (str, optional): Markup opening the article body container;
+            `body_end_marker` only counts after it, so teasers placed before the body
+            (e.g. an earlier <article>) do not end the fetch.
+        body_end_marker (str, optional): Markup closing the article body; the fetch
+            stops reading there (None reads the whole page).
+        crawl_delay (float): Minimum seconds between requests to one host
+            (robots.txt Crawl-delay wins if larger).
+        max_concurrency (int): Requests in flight per host.
+    """
+    name: str
+    domains: list[str]
+    sitemap_index: Optional[str] = None
+    sitemap_filter: str = "post-sitemap"
+    allow_patterns: list[str] = field(default_factory=list)
+    deny_patterns: list[str] = field(default_factory=lambda: list(NON_ARTICLE_PAGES))
+    tracking_params: list[str] = field(default_factory=lambda: list(NEWS_TRACKING_PARAMS))
+    paragraph_selector: str = "p"
+    date_sources: tuple = DATE_SOURCES
+    body_start_marker: Optional[str] = None
+    body_end_marker: Optional[str] = None
+    crawl_delay: float = 1.0
+    max_concurrency: int = 2
+
+    def __post_init__(self):
+        self._allow = [re.compile(p) for p in self.allow_patterns]
+
+    def is_article(self, url: str, allow_unknown_sites: Optional[bool] = None) -> bool:
+        """
+        True if the URL belongs to this site and passes its URL filters.
+
+        A profile without domains (`DEFAULT_PROFILE`) only accepts URLs if
+        `allow_unknown_sites` (default `ALLOW_UNKNOWN_SITES`) is set.
+        """
+        if not self.domains:
+            if not (ALLOW_UNKNOWN_SITES if allow_unknown_sites is None else allow_unknown_sites):
+                return False
+        elif host_of(url) not in self.domains:
+            return False
+        if any(pattern in url for pattern in self.deny_patterns):
+            return False
+        return not self._allow or any(p.search(url) for p in self._allow)
+
+    def paragraphs(self, soup: BeautifulSoup) -> list:
+        """
+        Returns the body paragraph elements, falling back to all <p> if the selector finds none.
+        """
+        if self.paragraph_selector == "p":
+            return soup.find_all("p")
+        return soup.select(self.paragraph_selector) or soup.find_all("p")
+
+
+def host_of(url: str) -> str:
+    """
+    Returns the lowercase host of a URL without a leading "www.".
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+# Selectors and sitemap filters are starting points; check them against a few
+# pages (e.g. with scraping_benchmark on recorded fixtures) before a long crawl.
+SITE_PROFILES: dict[str, SiteProfile] = {}
+_by_domain: dict[str, SiteProfile] = {}
+
+# Sites without a profile: all <p>, the default date sources; their URLs are
+# only accepted as articles with ALLOW_UNKNOWN_SITES
+DEFAULT_PROFILE = SiteProfile(name="default", domains=[], tracking_params=[])
+
+
+def register_profile(profile: SiteProfile) -> SiteProfile:
+    """
+    Adds (or replaces) a site profile; its domains are used for lookup.
+    """
+    SITE_PROFILES[profile.name] = profile
+    _by_domain.update({domain: profile for domain in profile.domains})
+    return profile
+
+
+def profile_for(url: str) -> SiteProfile:
+    """
+    Returns the profile of the site a URL belongs to, or `DEFAULT_PROFILE`.
+    """
+    host = host_of(url)
+    while host:
+        if host in _by_domain:
+            return _by_domain[host]
+        # Subdomains (e.g. "m.spiegel.de") fall back to their parent domain
+        host = host.partition(".")[2] if host.count(".") > 1 else ""
+    return DEFAULT_PROFILE
+
+
+def is_valid_article_url(url: str, allow_unknown_sites: Optional[bool] = None) -> bool:
+    """
+    Checks a URL against the profile of its site; hosts without a profile are
+    rejected unless `allow_unknown_sites` (default `ALLOW_UNKNOWN_SITES`) is set.
+    """
+    return profile_for(url).is_article(url, allow_unknown_sites)
+
+
+register_profile(SiteProfile(
+    name="businessinsider.de",
+    domains=["businessinsider.de"],
+    sitemap_index="https://www.businessinsider.de/sitemap_index.xml",
+    # Articles end in ".html"; section, author and tag pages do not
+    allow_patterns=[r"html$"],
+    # Meta tags and JSON-LD are in <head>; teasers and footer follow the article.
+    # Teaser <article>s can precede the body, so only the one around the body counts;
+    # related-story <article>s nested inside it do not end the fetch (see fetch.py)
+    body_start_marker='class="article-body"',
+    body_end_marker="</article>",
+))
+register_profile(SiteProfile(
+    name="spiegel.de",
+    domains=["spiegel.de"],
+    sitemap_index="https://www.spiegel.de/sitemap.xml",
+    sitemap_filter="sitemap-",
+    allow_patterns=[r"-a-[0-9a-f-]+$"],
+    paragraph_selector="div[data-area='text'] p",
+    date_sources=("meta", "time", "jsonld"),
+))
+register_profile(SiteProfile(
+    name="zeit.de",
+    domains=["zeit.de"],
+    sitemap_index="https://www.zeit.de/gsitemaps/index.xml",
+    sitemap_filter="gsitemaps",
+    allow_patterns=[r"/20\d{2}-\d{2}/"],
+    paragraph_selector="p.article__item",
+    date_sources=("jsonld", "time", "meta"),
+))
+register_profile(SiteProfile(
+    name="t3n.de",
+    domains=["t3n.de"],
+    sitemap_index="https://t3n.de/sitemap.xml",
+    sitemap_filter="sitemap",
+    allow_patterns=[r"/news/"],
+    date_sources=("jsonld", "meta", "time"),
+))
+register_profile(SiteProfile(
+    name="handelsblatt.com",
+    domains=["handelsblatt.com"],
+    sitemap_index="https://www.handelsblatt.com/sitemap.xml",
+    sitemap_filter="sitemap",
+    allow_patterns=[r"\.html$"],
+    date_sources=("jsonld", "meta"),
+    crawl_delay=2.0,
+    max_concurrency=1,
+))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import re
+import threading
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from site_profiles import DEFAULT_PROFILE, host_of, profile_for
+
+# === CONFIGURATION ===
+CANONICAL_MAP_PATH = "canonical_urls.parquet"
+# Query parameters that only track the visit, on any host; site-specific ones
+# (e.g. "ref", "share") are in the site's profile (`SiteProfile.tracking_params`)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref_src", "xtor", "_ga", "xing_share", "sara_ref",
+}
+TRACKING_PREFIXES = ("utm_", "wt_", "at_", "pk_", "mtm_")
+# Registered sites (`site_profiles.py`) serve https; http links in old sitemaps and
+# articles point to the same page. Unknown hosts keep their scheme.
+FORCE_HTTPS = True
+
+_PERCENT = re.compile(r"%[0-9a-fA-F]{2}")
+_SLASHES = re.compile(r"/{2,}")
+# https://www-example-de.cdn.ampproject.org/c/s/www.example.de/path -> https://www.example.de/path
+_AMP_CACHE = re.compile(r"^/[cv]/(?:s/)?(?P<rest>.+)$")
+
+
+def _is_tracking(name: str, site_params: list[str]) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES) or name in site_params
+
+
+def _amp_path(path: str) -> str:
+    # /amp/<path>, <path>/amp, <path>.amp.html, <path>.amp; a trailing slash is kept
+    slash = "/" if path.endswith("/") else ""
+    path = path.rstrip("/")
+    if path.startswith("/amp/"):
+        path = path[4:]
+    if path.endswith("/amp"):
+        path = path[:-4]
+    if path.endswith(".amp.html"):
+        path = path[:-9] + ".html"
+    elif path.endswith(".amp"):
+        path = path[:-4]
+    return (path + slash) or "/"
+
+
+def normalise_url(url: str) -> str:
+    """
+    Rule-based canonical form of a URL.
+
+    - scheme: https for registered sites (see `FORCE_HTTPS`), host
+      lower-cased, default port and fragment dropped
+    - AMP: Google AMP cache URLs, "amp." hosts and /amp, .amp.html variants
+      map to the regular page
+    - path: duplicate slashes removed, percent-escapes upper-cased and
+      non-ASCII characters percent-encoded (as requests sends them); a
+      trailing slash is kept, since the runners fetch this form
+    - query: tracking parameters (utm_*, fbclid, wt_mc, ... and the site
+      profile's `tracking_params`) removed, the rest sorted
+
+    Parameters:
+        url (str): The URL as found in a sitemap or link.
+
+    Returns:
+        str: The normalised URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    path = parts.path
+
+    if host.endswith(".cdn.ampproject.org"):
+        match = _AMP_CACHE.match(path)
+        if match:
+            return normalise_url(("https://" if "/s/" in path[:5] else "http://") + match.group("rest"))
+    if host.startswith("amp."):
+        host = "www." + host[4:]
+
+    profile = profile_for(f"//{host}")
+    if FORCE_HTTPS and scheme == "http" and profile is not DEFAULT_PROFILE:
+        scheme = "https"
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+
+    path = _amp_path(_SLASHES.sub("/", path))
+    path = quote(_PERCENT.sub(lambda m: m.group(0).upper(), path), safe="/%:@!$&'()*+,;=-._~")
+
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(k, profile.tracking_params))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class URLCanonicaliser:
+    """
+    Maps every spelling of an article URL to one canonical URL.
+
+    Rules (`normalise_url`) handle scheme, host, path, AMP and tracking
+    parameters. On top, `<link rel="canonical">` mappings learned from
+    fetched pages resolve what rules cannot (e.g. renamed slugs or print
+    pages). Only same-site mappings are learned, so syndication canonicals to
+    other outlets never hide an article.
+    """
+
+    def __init__(self, mapping: Optional[dict[str, str]] = None):
+        self._lock = threading.Lock()
+        self.mapping: dict[str, str] = dict(mapping or {})
+
+    def canonicalise(self, url: str) -> str:
+        normalised = normalise_url(url)
+        return self.mapping.get(normalised, normalised)
+
+    def learn(self, url: str, canonical: Optional[str]) -> bool:
+        """
+        Records that `url` declares `canonical` as its canonical URL.
+
+        Returns:
+            bool: True if a new mapping was learned.
+        """
+        if not canonical:
+            return False
+        source, target = normalise_url(url), normalise_url(canonical)
+        if source == target or host_of(source) != host_of(target):
+            return False
+        with self._lock:
+            target = self.mapping.get(target, target)
+            if self.mapping.get(source) == target:
+                return False
+            self.mapping[source] = target
+            return True
+
+    def learn_from_soup(self, url: str, soup: BeautifulSoup) -> bool:
+        """
+        Learns the `<link rel="canonical">` of a parsed page.
+        """
+        link = soup.find("link", rel="canonical", href=True)
+        return self.learn(url, link["href"]) if link else False
+
+    def dedupe(self, urls: Iterable[str], done_urls: Iterable[str] = ()) -> list[str]:
+        """
+        Canonicalises a URL list in bulk and drops duplicates and already scraped articles.
+
+        Parameters:
+            urls (Iterable[str]): Candidate URLs (any spelling).
+            done_urls (Iterable[str]): URLs already scraped (any spelling).
+
+        Returns:
+            list[str]: Unique canonical URLs not yet scraped, in first-seen order.
+        """
+        seen = {self.canonicalise(u) for u in done_urls}
+        unique = []
+        for url in urls:
+            canonical = self.canonicalise(url)
+            if canonical not in seen:
+                seen.add(canonical)
+                unique.append(canonical)
+        return unique
+
+    # === PERSISTENCE ===
+
+    def save(self, path: str = CANONICAL_MAP_PATH) -> None:
+        with self._lock:
+            df = pd.DataFrame({"url": list(self.mapping), "canonical": list(self.mapping.values())})
+        tmp = f"{path}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = CANONICAL_MAP_PATH) -> "URLCanonicaliser":
+        df = pd.read_parquet(path)
+        return cls(dict(zip(df["url"], df["canonical"])))
+
+
+_canonicaliser: Optional[URLCanonicaliser] = None
+_canonicaliser_lock = threading.Lock()
+
+
+def get_canonicaliser(path: str = CANONICAL_MAP_PATH) -> URLCanonicaliser:
+    """
+    The process-wide canonicaliser, with the learned mappings from `path` if it exists.
+    """
+    global _canonicaliser
+    with _canonicaliser_lock:
+        if _canonicaliser is None:
+            _canonicaliser = URLCanonicaliser.load(path) if os.path.exists(path) else URLCanonicaliser()
+        return _canonicaliser
+
+
+def dedupe_urls(urls: Iterable[str], done_urls: Iterable[str] = ()) -> list[str]:
+    """
+    Bulk canonicalisation and de-duplication with the process-wide canonicaliser.
+    """
+    return get_canonicaliser().dedupe(urls, done_urls)
+
+
+def save_canonical_map(path: str = CANONICAL_MAP_PATH) -> None:
+    """
+    Persists the learned rel=canonical mappings, if any; for the end of a scrape run.
+    """
+    if _canonicaliser is not None and _canonicaliser.mapping:
+        _canonicaliser.save(path)
+
+
+def merge_canonical_maps(paths: list[str], path: str = CANONICAL_MAP_PATH) -> URLCanonicaliser:
+    """
+    Folds the mappings saved by several workers into the shared map at `path`
+    and deletes the worker files.
+    """
+    merged = URLCanonicaliser.load(path) if os.path.exists(path) else URLCanonicaliser()
+    for worker_path in paths:
+        part = URLCanonicaliser.load(worker_path)
+        for url, canonical in part.mapping.items():
+            merged.learn(url, canonical)
+    merged.save(path)
+    for worker_path in paths:
+        os.remove(worker_path)
+    return merged
+
+
+if __name__ == "__main__":
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "article_urls.txt"
+    target = sys.argv[2] if len(sys.argv) > 2 else source
+    with open(source, encoding="utf-8") as f:
+        raw = [line.strip() for line in f if line.strip()]
+    unique_urls = dedupe_urls(raw)
+    with open(target, "w", encoding="utf-8") as f:
+        f.write("\n".join(unique_urls) + "\n")
+    print(f"✅ {len(raw)} URLs -> {len(unique_urls)} canonical URLs in {target}")
@@ -0,0 +1,480 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from glob import glob
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+import requests
+
+from boilerplate import BOILERPLATE_PATH, BoilerplateDetector, merge_boilerplate
+from url_canon import CANONICAL_MAP_PATH, URLCanonicaliser, dedupe_urls, merge_canonical_maps
+
+# === CONFIGURATION ===
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+BATCH_SIZE = 20
+WORKER_THREADS = 5
+# Seconds an idle worker waits before polling again while other workers hold leases
+POLL_SECONDS = 10
+STATUSES = ["pending", "leased", "done", "failed"]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class MemoryURLQueue:
+    """
+    In-process lease queue with the same interface as `SQLiteURLQueue`.
+
+    For tests and single-machine runs: threads of one process share it, and
+    leases expire and are reclaimed exactly like in the SQLite backend.
+    """
+
+    def __init__(self, lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # url -> [status, attempts, owner, lease_expires, last_error]
+        self._rows: dict[str, list] = {}
+
+    def add(self, urls: Iterable[str]) -> int:
+        with self._lock:
+            before = len(self._rows)
+            for url in urls:
+                self._rows.setdefault(url, ["pending", 0, None, 0.0, None])
+            return len(self._rows) - before
+
+    def claim(self, worker: str, n: int = BATCH_SIZE) -> list[str]:
+        now = time.time()
+        claimed = []
+        with self._lock:
+            for url, row in self._rows.items():
+                if row[0] == "leased" and row[3] < now:
+                    if row[1] >= self.max_attempts:
+                        row[0], row[4] = "failed", "lease expired"
+                        continue
+                    row[0] = "pending"
+                if row[0] == "pending" and len(claimed) < n:
+                    row[0], row[2], row[3] = "leased", worker, now + self.lease_seconds
+                    row[1] += 1
+                    claimed.append(url)
+        return claimed
+
+    def extend(self, worker: str, urls: Iterable[str]) -> int:
+        expires = time.time() + self.lease_seconds
+        with self._lock:
+            rows = [self._rows[u] for u in urls if u in self._rows]
+            owned = [r for r in rows if r[0] == "leased" and r[2] == worker]
+            for row in owned:
+                row[3] = expires
+            return len(owned)
+
+    def complete(self, worker: str, urls: Iterable[str]) -> int:
+        with self._lock:
+            rows = [self._rows[u] for u in urls if u in self._rows and self._rows[u][0] != "done"]
+            for row in rows:
+                row[0], row[2], row[4] = "done", worker, None
+            return len(rows)
+
+    def fail(self, worker: str, url: str, error: str) -> str:
+        with self._lock:
+            row = self._rows[url]
+            if row[0] == "done":
+                return row[0]
+            row[0] = "failed" if row[1] >= self.max_attempts else "pending"
+            row[2], row[4] = worker, error
+            return row[0]
+
+    def release(self, worker: str) -> int:
+        with self._lock:
+            rows = [r for r in self._rows.values() if r[0] == "leased" and r[2] == worker]
+            for row in rows:
+                row[0], row[1] = "pending", row[1] - 1
+            return len(rows)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict.fromkeys(STATUSES, 0)
+            for row in self._rows.values():
+                counts[row[0]] += 1
+            return counts
+
+    def failures(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame([{"url": u, "attempts": r[1], "last_error": r[4]}
+                                 for u, r in self._rows.items() if r[0] == "failed"],
+                                columns=["url", "attempts", "last_error"])
+
+
+class SQLiteURLQueue:
+    """
+    Lease-based URL queue in one SQLite file, shared by processes and machines.
+
+    Workers `claim` batches of URLs with a lease that expires after
+    `lease_seconds`, and report each URL with `complete` or `fail`. If a worker
+    dies, its leases expire and the URLs are handed out again on the next
+    claim. Claiming happens in one write transaction (BEGIN IMMEDIATE), so no
+    URL is leased twice. A URL is marked failed after `max_attempts`.
+
+    On a network filesystem keep `journal_mode="DELETE"` (the default): WAL
+    needs shared memory and only works for processes on one machine, where it
+    lets readers such as `stats()` run without blocking the claims.
+
+    Usage:
+        queue = SQLiteURLQueue("/mnt/shared/crawl_queue.sqlite")
+        queue.add(dedupe_urls(urls))
+        run_worker(queue, output_dir="/mnt/shared/scraped")   # on every machine
+        merge_worker_state("/mnt/shared/scraped")              # once all are done
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+        journal_mode: str = "DELETE",
+        timeout: float = 60.0
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.journal_mode = journal_mode
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._transaction() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_expires REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    updated REAL
+                )""")
+            con.execute("CREATE INDEX IF NOT EXISTS urls_status ON urls (status, lease_expires)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            con.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two claims never read the same rows
+        con = self._connection()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        con.execute("COMMIT")
+
+    def add(self, urls: Iterable[str]) -> int:
+        """
+        Adds URLs as pending; URLs already in the queue (in any state) are ignored.
+
+        Returns:
+            int: Number of new URLs.
+        """
+        now = time.time()
+        with self._transaction() as con:
+            before = con.total_changes
+            con.executemany("INSERT OR IGNORE INTO urls (url, updated) VALUES (?, ?)",
+                            ((url, now) for url in urls))
+            return con.total_changes - before
+
+    def claim(self, worker: str, n: int = BATCH_SIZE) -> list[str]:
+        """
+        Leases up to `n` pending URLs (including ones whose lease expired) to `worker`.
+        """
+        now = time.time()
+        with self._transaction() as con:
+            # Expired leases that used up their attempts are given up on
+            con.execute("""UPDATE urls SET status = 'failed', last_error = 'lease expired', updated = ?
+                           WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                        (now, now, self.max_attempts))
+            urls = [row[0] for row in con.execute(
+                """SELECT url FROM urls
+                   WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                   ORDER BY attempts, rowid LIMIT ?""", (now, n))]
+            con.executemany("""UPDATE urls SET status = 'leased', owner = ?, lease_expires = ?,
+                               attempts = attempts + 1, updated = ? WHERE url = ?""",
+                            ((worker, now + self.lease_seconds, now, url) for url in urls))
+        return urls
+
+    def extend(self, worker: str, urls: Iterable[str]) -> int:
+        """
+        Renews the leases `worker` still holds on `urls` (heartbeat for long batches).
+        """
+        now = time.time()
+        with self._transaction() as con:
+            before = con.total_changes
+            con.executemany("""UPDATE urls SET lease_expires = ?, updated = ?
+                               WHERE url = ? AND owner = ? AND status = 'leased'""",
+                            ((now + self.lease_seconds, now, url, worker) for url in urls))
+            return con.total_changes - before
+
+    def complete(self, worker: str, urls: Iterable[str]) -> int:
+        """
+        Marks URLs as done (also if their lease had expired meanwhile).
+        """
+        now = time.time()
+        with self._transaction() as con:
+            before = con.total_changes
+            con.executemany("""UPDATE urls SET status = 'done', owner = ?, last_error = NULL, updated = ?
+                               WHERE url = ? AND status != 'done'""",
+                            ((worker, now, url) for url in urls))
+            return con.total_changes - before
+
+    def fail(self, worker: str, url: str, error: str) -> str:
+        """
+        Reports a failed attempt; the URL goes back to pending until `max_attempts`.
+
+        Returns:
+            str: The new status ("pending" or "failed").
+        """
+        with self._transaction() as con:
+            con.execute("""UPDATE urls SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                           owner = ?, last_error = ?, updated = ? WHERE url = ? AND status != 'done'""",
+                        (self.max_attempts, worker, error[:500], time.time(), url))
+            row = con.execute("SELECT status FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else "failed"
+
+    def release(self, worker: str) -> int:
+        """
+        Returns the URLs leased by `worker` to pending, without counting the attempt.
+        """
+        with self._transaction() as con:
+            before = con.total_changes
+            con.execute("""UPDATE urls SET status = 'pending', attempts = attempts - 1, updated = ?
+                           WHERE status = 'leased' AND owner = ?""", (time.time(), worker))
+            return con.total_changes - before
+
+    def stats(self) -> dict[str, int]:
+        counts = dict(self._connection().execute("SELECT status, COUNT(*) FROM urls GROUP BY status"))
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+    def failures(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT url, attempts, last_error FROM urls WHERE status = 'failed'",
+                                 self._connection())
+
+
+def _worker_state(
+    output_dir: str,
+    worker_id: str,
+    boilerplate_path: str,
+    canonical_map_path: str
+) -> tuple[BoilerplateDetector, URLCanonicaliser, str, str]:
+    """
+    The worker's own boilerplate detector and URL canonicaliser.
+
+    The detector resumes the worker's file, if any, and gets the shared
+    learned paragraphs and counted pages, so it strips known boilerplate but
+    only counts pages nobody counted yet. The canonicaliser starts from the
+    shared map. Both are saved to per-worker files that `merge_worker_state`
+    folds into the shared files.
+    """
+    detector_path = os.path.join(output_dir, f"boilerplate_{worker_id}.parquet")
+    map_path = os.path.join(output_dir, f"canonical_urls_{worker_id}.parquet")
+
+    # Tracks the paragraph hashes of its pages, so the merge counts pages several workers scraped once
+    detector = BoilerplateDetector.load(detector_path, track_pages=True) if os.path.exists(detector_path) \
+        else BoilerplateDetector(track_pages=True)
+    if os.path.exists(boilerplate_path):
+        shared = BoilerplateDetector.load(boilerplate_path)
+        for site, learned in shared.learned.items():
+            detector.learned.setdefault(site, {}).update(learned)
+        for site, seen in shared.seen.items():
+            detector.seen.setdefault(site, set()).update(seen)
+
+    canonicaliser = URLCanonicaliser.load(canonical_map_path) if os.path.exists(canonical_map_path) \
+        else URLCanonicaliser()
+    if os.path.exists(map_path):
+        canonicaliser.mapping.update(URLCanonicaliser.load(map_path).mapping)
+    return detector, canonicaliser, detector_path, map_path
+
+
+def merge_worker_state(
+    output_dir: str,
+    boilerplate_path: str = BOILERPLATE_PATH,
+    canonical_map_path: str = CANONICAL_MAP_PATH
+) -> None:
+    """
+    Folds the per-worker boilerplate and canonical URL files of `output_dir`
+    into the shared files; run it once the workers are done.
+    """
+    detectors = [p for p in glob(os.path.join(output_dir, "boilerplate_*.parquet"))
+                 if not p.endswith(".pages.parquet")]
+    maps = glob(os.path.join(output_dir, "canonical_urls_*.parquet"))
+    if detectors:
+        merged = merge_boilerplate(detectors, boilerplate_path)
+        print(f"✅ Merged boilerplate of {len(detectors)} workers ({sum(merged.pages.values())} pages) "
+              f"-> {boilerplate_path}")
+    if maps:
+        merged = merge_canonical_maps(maps, canonical_map_path)
+        print(f"✅ Merged {len(merged.mapping)} canonical URL mappings of {len(maps)} workers -> {canonical_map_path}")
+
+
+def run_worker(
+    queue,
+    scrape_func: Optional[Callable[[str], Optional[dict]]] = None,
+    output_dir: str = "scraped",
+    worker_id: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    threads: int = WORKER_THREADS,
+    wait_for_others: bool = True,
+    boilerplate_path: str = BOILERPLATE_PATH,
+    canonical_map_path: str = CANONICAL_MAP_PATH
+) -> dict:
+    """
+    Claims batches from the queue and scrapes them until the queue is drained.
+
+    Every worker (process or machine) appends to its own CSV,
+    `<output_dir>/articles_<worker_id>.csv`, so no file is written by two
+    hosts. A heartbeat thread renews the batch's leases while it is being
+    scraped. When nothing is claimable but other workers still hold leases,
+    the worker polls, so URLs of a crashed worker are picked up once their
+    leases expire.
+
+    Learned boilerplate and canonical URLs go to per-worker files in
+    `output_dir` (see `_worker_state`), so workers never overwrite each
+    other's state; `merge_worker_state` combines them afterwards. The
+    worker's detector and canonicaliser are passed to the default scrape
+    function, so several workers can run in one process; a custom
+    `scrape_func` keeps its own state.
+
+    Parameters:
+        queue (SQLiteURLQueue | MemoryURLQueue): The shared queue.
+        scrape_func (Callable, optional): Scrape function (default `scrape_article_full`);
+            network errors it raises are recorded as the URL's last error.
+        output_dir (str): Directory for the per-worker CSVs.
+        worker_id (str, optional): Unique worker name (default "<hostname>-<pid>").
+        batch_size (int): URLs per claim.
+        threads (int): Scraping threads within this worker.
+        wait_for_others (bool): Keep polling while other workers hold leases.
+        boilerplate_path (str): The shared boilerplate detector (read only).
+        canonical_map_path (str): The shared canonical URL map (read only).
+
+    Returns:
+        dict: Counts of scraped, failed (retry later) and given-up URLs for this worker.
+    """
+    worker_id = worker_id or default_worker_id()
+    os.makedirs(output_dir, exist_ok=True)
+    output_csv = os.path.join(output_dir, f"articles_{worker_id}.csv")
+    counts = {"scraped": 0, "failed": 0, "given_up": 0}
+
+    def scrape(url: str) -> tuple[str, Optional[dict], Optional[str]]:
+        try:
+            result = scrape_func(url)
+            return url, result, None if result else "no article extracted"
+        except (requests.RequestException, ValueError) as e:
+            return url, None, str(e)
+
+    detector, canonicaliser, detector_path, map_path = _worker_state(
+        output_dir, worker_id, boilerplate_path, canonical_map_path)
+    if scrape_func is None:
+        from scraping_pipeline import scrape_article_full
+        scrape_func = partial(scrape_article_full, detector=detector, canonicaliser=canonicaliser,
+                              raise_errors=True)
+
+    print(f"🚀 Worker {worker_id} started")
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            while True:
+                batch = queue.claim(worker_id, batch_size)
+                if not batch:
+                    stats = queue.stats()
+                    if wait_for_others and stats["leased"]:
+                        time.sleep(min(POLL_SECONDS, queue.lease_seconds))
+                        continue
+                    break
+
+                stop = threading.Event()
+                heartbeat = threading.Thread(target=_heartbeat, args=(queue, worker_id, batch, stop), daemon=True)
+                heartbeat.start()
+                results = None
+                try:
+                    results = list(executor.map(scrape, batch))
+                finally:
+                    stop.set()
+                    heartbeat.join()
+                    if results is None:
+                        # Hand the batch back now rather than when its leases expire
+                        queue.release(worker_id)
+
+                articles = [result for _, result, _ in results if result]
+                if articles:
+                    pd.DataFrame(articles).to_csv(output_csv, mode="a", index=False,
+                                                  header=not Path(output_csv).exists())
+                queue.complete(worker_id, [url for url, result, _ in results if result])
+                for url, result, error in results:
+                    if not result:
+                        status = queue.fail(worker_id, url, error)
+                        counts["given_up" if status == "failed" else "failed"] += 1
+                counts["scraped"] += len(articles)
+                print(f"⏱️  {worker_id}: {counts} | queue {queue.stats()}")
+    finally:
+        # Also after a crash, so the pages this worker counted are not lost
+        if detector.pages:
+            detector.save(detector_path)
+        if canonicaliser.mapping:
+            canonicaliser.save(map_path)
+
+    print(f"✅ Worker {worker_id} done: {counts}")
+    return counts
+
+
+def _heartbeat(queue, worker_id: str, urls: list[str], stop: threading.Event) -> None:
+    while not stop.wait(queue.lease_seconds / 3):
+        queue.extend(worker_id, urls)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared URL queue for crawling from several machines.")
+    parser.add_argument("command", choices=["add", "work", "merge", "status", "failures"])
+    parser.add_argument("--db", default="crawl_queue.sqlite", help="Queue file (on a shared filesystem)")
+    parser.add_argument("--urls", help="URL list to add (one per line)")
+    parser.add_argument("--output-dir", default="scraped")
+    parser.add_argument("--worker-id")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=WORKER_THREADS)
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    parser.add_argument("--boilerplate", default=BOILERPLATE_PATH, help="Shared boilerplate detector")
+    parser.add_argument("--canonical-map", default=CANONICAL_MAP_PATH, help="Shared canonical URL map")
+    args = parser.parse_args()
+
+    url_queue = SQLiteURLQueue(args.db, lease_seconds=args.lease)
+    if args.command == "add":
+        with open(args.urls, encoding="utf-8") as f:
+            # Canonical URLs only, so variants of one article are never leased twice
+            added = url_queue.add(dedupe_urls(line.strip() for line in f if line.strip()))
+        print(f"✅ Added {added} new URLs: {url_queue.stats()}")
+    elif args.command == "work":
+        run_worker(url_queue, output_dir=args.output_dir, worker_id=args.worker_id,
+                   batch_size=args.batch_size, threads=args.threads,
+                   boilerplate_path=args.boilerplate, canonical_map_path=args.canonical_map)
+    elif args.command == "merge":
+        merge_worker_state(args.output_dir, args.boilerplate, args.canonical_map)
+    elif args.command == "status":
+        print(url_queue.stats())
+    else:
+        print(url_queue.failures().to_string(index=False))
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The modules live in folders under _functions_ and import each other by plain module name
+FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "_functions_")
+for folder in ("corpus", "scraping", "nlp", "llm", "pipeline"):
+    path = os.path.abspath(os.path.join(FUNCTIONS_DIR, folder))
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from article_ids import assign_article_ids, content_hash, make_article_id, merge_on_id
+
+URL = "https://www.businessinsider.de/tech/startup-meeting-1.html"
+
+
+def test_id_is_deterministic_non_negative_int64():
+    article_id = make_article_id(URL)
+
+    assert article_id == make_article_id(URL)
+    assert 0 <= article_id <= np.iinfo(np.int64).max
+
+
+def test_id_ignores_url_spelling():
+    variants = [
+        "http://www.businessinsider.de/tech/startup-meeting-1.html",
+        "https://WWW.BusinessInsider.de/tech/startup-meeting-1.html?utm_source=x#top",
+        "https://www.businessinsider.de/tech/startup-meeting-1.amp.html",
+    ]
+
+    assert {make_article_id(url) for url in variants} == {make_article_id(URL)}
+    assert make_article_id(URL.replace("-1.html", "-2.html")) != make_article_id(URL)
+
+
+def test_content_hash_only_changes_with_the_words():
+    assert content_hash("Ein  Startup\n im Meeting ") == content_hash("Ein Startup im Meeting")
+    assert content_hash("Ein Startup") != content_hash("Ein Meeting")
+    assert content_hash(None) == content_hash("")
+
+
+def test_assign_matches_the_scraper_id_whatever_the_stored_text():
+    df = pd.DataFrame({"url": [URL, URL], "text": ["Text vor dem Stripping. Lest auch: ...", None]})
+
+    result = assign_article_ids(df)
+
+    assert result["article_id"].dtype == np.int64
+    assert result["article_id"].tolist() == [make_article_id(URL)] * 2
+    assert result["content_hash"].tolist() == [content_hash(df["text"][0]), content_hash("")]
+    assert "article_id" not in df.columns
+
+
+def test_merge_on_id_keeps_the_last_duplicate_and_sorts_by_id():
+    left = pd.DataFrame({"article_id": [30, 10, 20], "text": ["c", "a", "b"]})
+    right = pd.DataFrame({"article_id": [10, 10, 30], "sentiment": ["neutral", "positive", "negative"]})
+
+    joined = merge_on_id(left, right)
+
+    assert joined["article_id"].tolist() == [10, 20, 30]
+    assert joined["sentiment"].tolist()[0] == "positive"
+    assert pd.isna(joined["sentiment"][1])
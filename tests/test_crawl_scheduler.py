@@ -0,0 +1,99 @@
+import pytest
+import requests
+
+from crawl_scheduler import MAX_DELAY, CrawlScheduler, _HostQueue, is_transient, retry_after
+from site_profiles import SITE_PROFILES, is_valid_article_url
+
+URL = "https://www.businessinsider.de/tech/startup-meeting-1.html"
+
+
+def http_error(status: int, headers: dict = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status}", response=response)
+
+
+@pytest.fixture
+def scheduler():
+    return CrawlScheduler(scrape_func=lambda url: None, respect_robots=False, max_retries=3)
+
+
+@pytest.fixture
+def queue():
+    queue = _HostQueue("businessinsider.de", SITE_PROFILES["businessinsider.de"], delay=1.0)
+    queue.in_flight = 1
+    return queue
+
+
+@pytest.mark.parametrize("error, transient", [
+    (requests.Timeout("slow"), True),
+    (requests.ConnectionError("refused"), True),
+    (http_error(429), True),
+    (http_error(503), True),
+    (http_error(404), False),
+    (http_error(410), False),
+    (ValueError("Too few paragraphs"), False),
+])
+def test_is_transient(error, transient):
+    assert is_transient(error) is transient
+
+
+def test_retry_after_seconds_and_dates():
+    assert retry_after(http_error(429, {"Retry-After": "120"})) == 120.0
+    assert retry_after(http_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after(http_error(429, {"Retry-After": "soon"})) is None
+    assert retry_after(requests.Timeout("slow")) is None
+
+
+def test_dead_links_fail_at_once_without_slowing_the_host(scheduler, queue):
+    done = scheduler._finish(queue, URL, None, http_error(404), 0.1)
+
+    assert done
+    assert queue.delay == 1.0
+    assert list(queue.urls) == []
+    assert queue.stats["failed"] == 1
+
+
+def test_transient_errors_back_off_and_retry_until_max_retries(scheduler, queue):
+    for _ in range(2):
+        queue.in_flight = 1
+        assert not scheduler._finish(queue, URL, None, http_error(503), 0.1)
+        assert queue.urls.popleft() == URL
+    queue.in_flight = 1
+
+    assert scheduler._finish(queue, URL, None, requests.Timeout("slow"), 0.1)
+    assert queue.delay == 8.0
+    assert queue.stats["failed"] == 1
+
+
+def test_retry_after_pauses_the_host(scheduler, queue):
+    scheduler._finish(queue, URL, None, http_error(429, {"Retry-After": "30"}), 0.1)
+
+    assert queue.next_time >= 29
+    assert queue.delay == 2.0 <= MAX_DELAY
+
+
+def test_success_recovers_the_delay(scheduler, queue):
+    queue.delay = 10.0
+
+    assert scheduler._finish(queue, URL, {"url": URL}, None, 0.1)
+    assert queue.delay == 8.0
+    assert queue.stats["scraped"] == 1
+
+
+@pytest.mark.parametrize("url, valid", [
+    (URL, True),
+    ("https://www.businessinsider.de/tech/", False),
+    ("https://www.businessinsider.de/author/redaktion/", False),
+    ("https://www.businessinsider.de/video/clip.html", False),
+    ("https://www.spiegel.de/wirtschaft/startup-a-12ab-34cd", True),
+    ("https://example.com/article.html", False),
+])
+def test_article_urls_follow_the_site_profiles(url, valid):
+    assert is_valid_article_url(url) is valid
+
+
+def test_unknown_hosts_need_an_opt_in():
+    assert is_valid_article_url("http://127.0.0.1:8000/tech/a.html", allow_unknown_sites=True)
+    assert not is_valid_article_url("http://127.0.0.1:8000/video/a.html", allow_unknown_sites=True)
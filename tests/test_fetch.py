@@ -0,0 +1,87 @@
+import random
+import re
+from datetime import date
+
+import pytest
+
+import fetch
+from html_fixtures import make_article_html
+from site_profiles import SITE_PROFILES
+
+URL = "https://www.businessinsider.de/tech/startup-meeting-1.html"
+PROFILE = SITE_PROFILES["businessinsider.de"]
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.url = URL
+        self.status_code = 200
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, _):
+        for start in range(0, len(self.body), self.chunk_size):
+            self.read = start + self.chunk_size
+            yield self.body[start:start + self.chunk_size]
+
+
+def fetch_page(monkeypatch, html: str, chunk_size: int, **markers):
+    response = FakeResponse(html.encode("utf-8"), chunk_size)
+    monkeypatch.setattr(fetch.requests, "get", lambda *args, **kwargs: response)
+    return fetch.fetch_html(URL, **markers)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 16 * 1024])
+def test_nested_article_does_not_cut_the_body_short(monkeypatch, chunk_size):
+    html = make_article_html(URL, random.Random(3), date(2021, 5, 4))
+    assert 'class="related-card"' in html
+
+    page = fetch_page(monkeypatch, html, chunk_size, stop_marker=PROFILE.body_end_marker,
+                      start_marker=PROFILE.body_start_marker)
+
+    raw = html.encode("utf-8")
+    body_end = raw.index(b"</div>\n</article>") + len(b"</div>\n</article>")
+    body = html[html.index('<div class="article-body">'):html.index("</div>\n</article>")]
+    assert not page.complete
+    assert all(p in page.text() for p in re.findall(r"<p>.*?</p>", body))
+    # Reading stops in the chunk that closes the body container
+    assert body_end <= len(page.body) < body_end + chunk_size
+
+
+def test_teaser_article_before_the_body_is_ignored(monkeypatch):
+    html = ("<article><a>Teaser</a></article><article><div class=\"article-body\">"
+            "<p>Eins</p><article>Card</article><p>Zwei</p></div></article><footer>Fuß</footer>")
+
+    page = fetch_page(monkeypatch, html, 5, stop_marker="</article>", start_marker='class="article-body"')
+
+    assert "<p>Zwei</p>" in page.text()
+    assert "Fuß" not in page.text()
+
+
+def test_without_start_marker_the_outermost_article_ends_the_body(monkeypatch):
+    html = "<article><p>Eins</p><article>Card</article><p>Zwei</p></article><footer>Fuß</footer>"
+
+    page = fetch_page(monkeypatch, html, 3, stop_marker="</article>")
+
+    assert "<p>Zwei</p>" in page.text()
+    assert "Fuß" not in page.text()
+
+
+def test_without_marker_the_whole_page_is_read(monkeypatch):
+    html = "<article><p>Eins</p></article><footer>Fuß</footer>"
+
+    page = fetch_page(monkeypatch, html, 4)
+
+    assert page.complete
+    assert page.text() == html
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from llm_benchmark import LOANWORD_POOL, make_synthetic_articles, summarise_latencies, track_csv_writes
+
+
+def test_synthetic_articles_are_reproducible():
+    first = make_synthetic_articles(n_articles=5, words_per_article=(20, 40), seed=7)
+    second = make_synthetic_articles(n_articles=5, words_per_article=(20, 40), seed=7)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first["article_id"].tolist() == list(range(5))
+    assert all(w in LOANWORD_POOL for words in first["loanwords"] for w in words)
+
+
+def test_summarise_latencies_reports_percentiles_in_ms():
+    summary = summarise_latencies([i / 1000 for i in range(1, 101)], wall_seconds=2.0)
+
+    assert summary["requests"] == 100
+    assert summary["requests_per_sec"] == 50.0
+    assert summary["p50_ms"] == 51.0
+    assert summary["p95_ms"] == 95.0
+    assert summary["p99_ms"] == 99.0
+    assert summary["max_ms"] == 100.0
+
+
+def test_summarise_latencies_without_requests():
+    assert summarise_latencies([], wall_seconds=1.0) == {"requests": 0, "requests_per_sec": 0.0}
+
+
+def test_track_csv_writes_times_writes_and_restores_to_csv(tmp_path):
+    original = pd.DataFrame.to_csv
+
+    with track_csv_writes() as writes:
+        pd.DataFrame({"a": [1]}).to_csv(tmp_path / "a.csv")
+        pd.DataFrame({"a": [2]}).to_csv(tmp_path / "b.csv")
+
+    assert len(writes) == 2
+    assert pd.DataFrame.to_csv is original
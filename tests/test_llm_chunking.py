@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import llm_helpers
+from llm_helpers import LLM_ERROR, map_reduce_ask, split_into_chunks
+
+
+@pytest.fixture(autouse=True)
+def one_char_per_token(monkeypatch):
+    # Token budgets become character budgets, independent of recorded calls
+    monkeypatch.setattr(llm_helpers, "observed_chars_per_token", lambda *args, **kwargs: 1.0)
+
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("Ein kurzer Text.", max_tokens=100) == ["Ein kurzer Text."]
+
+
+def test_paragraphs_are_packed_greedily_in_order():
+    paragraphs = ["A" * 30, "B" * 30, "C" * 30, "D" * 30]
+
+    chunks = split_into_chunks("\n\n".join(paragraphs), max_tokens=70)
+
+    assert chunks == [f"{'A' * 30} {'B' * 30}", f"{'C' * 30} {'D' * 30}"]
+
+
+def test_long_paragraphs_split_at_sentences_then_words():
+    sentences = [f"Satz {i} über das Startup im Meeting." for i in range(20)]
+    overlong = " ".join(["Homeoffice"] * 30)
+    text = " ".join(sentences) + "\n" + overlong
+
+    chunks = split_into_chunks(text, max_tokens=80)
+
+    assert all(len(chunk) <= 80 for chunk in chunks)
+    # No word is cut in half and nothing is lost
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_map_reduce_reduces_once(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_ask(prompt, task=None, **kwargs):
+        with lock:
+            calls.append(task)
+        return "kurz" if task == "map" else "Zusammenfassung"
+
+    monkeypatch.setattr(llm_helpers, "ask_ollama", fake_ask)
+    text = "\n\n".join("Absatz " * 20 for _ in range(6))
+
+    answer = map_reduce_ask(text, "Fasse zusammen:", "Kombiniere:", "map", "reduce",
+                            max_tokens=200, chunk_tokens=150)
+
+    assert answer == "Zusammenfassung"
+    assert calls.count("reduce") == 1
+    assert calls.count("map") == len(split_into_chunks(text, max_tokens=150))
+
+
+def test_map_reduce_fails_if_any_chunk_fails(monkeypatch):
+    calls = []
+
+    def fake_ask(prompt, task=None, **kwargs):
+        calls.append(task)
+        return LLM_ERROR if "Absatz 3" in prompt else "kurz"
+
+    monkeypatch.setattr(llm_helpers, "ask_ollama", fake_ask)
+    text = "\n\n".join(f"Absatz {i} " + "Text " * 30 for i in range(6))
+
+    assert map_reduce_ask(text, "Fasse zusammen:", "Kombiniere:", "map", "reduce",
+                          max_tokens=200, chunk_tokens=160, max_workers=1) == LLM_ERROR
+    assert "reduce" not in calls
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from loanword_index import LoanwordIndex
+
+CORPUS = pd.DataFrame({
+    "article_id": [101, 102, 103],
+    "year": [2020, 2021, None],
+    "topic": ["tech", "politik", "tech"],
+    "sentiment": ["positive", None, "negative"],
+    # Stringified lists, as read from the CSVs
+    "loanwords": ["['startup', 'meeting', 'startup']", "['meeting']", "['startup', 'team']"],
+})
+
+
+def test_postings_hold_sorted_documents_and_counts():
+    index = LoanwordIndex.from_frame(CORPUS)
+
+    docs, counts = index.postings("startup")
+    assert docs.tolist() == [0, 2]
+    assert counts.tolist() == [2, 1]
+    assert index.articles_with("meeting").tolist() == [101, 102]
+    assert index.postings("cloud")[0].tolist() == []
+
+
+def test_filtered_queries():
+    index = LoanwordIndex.from_frame(CORPUS)
+
+    assert index.term_frequency("startup") == 3
+    assert index.term_frequency("startup", topic="tech", sentiment="positive") == 2
+    assert index.document_frequency("meeting", year=(2021, 2030)) == 1
+    assert index.document_frequency("meeting", topic="unknown") == 0
+    assert index.term_frequency_by_year("startup").to_dict() == {2020: 2}
+    assert index.top_k(2).values.tolist() == [["startup", 3], ["meeting", 2]]
+    assert index.top_k(1, by="documents", topic="tech").values.tolist() == [["startup", 2]]
+
+
+def test_save_and_load_round_trip_the_delta_encoded_postings(tmp_path):
+    index = LoanwordIndex.from_frame(CORPUS)
+    index.append(pd.DataFrame({"article_id": [104], "year": [2022], "loanwords": [["team", "startup", "cloud"]]}))
+    path = str(tmp_path / "index.npz")
+
+    index.save(path)
+    loaded = LoanwordIndex.load(path)
+
+    assert loaded.vocab == index.vocab
+    np.testing.assert_array_equal(loaded.term_offsets, index.term_offsets)
+    np.testing.assert_array_equal(loaded.post_docs, index.post_docs)
+    np.testing.assert_array_equal(loaded.post_counts, index.post_counts)
+    np.testing.assert_array_equal(loaded.article_ids, index.article_ids)
+    assert loaded.articles_with("startup").tolist() == [101, 103, 104]
+    # Stored as per-term gaps: the second posting of "startup" is 2 documents after the first
+    stored = np.load(path)["doc_deltas"]
+    start = index.term_offsets[index.term_lookup["startup"]]
+    assert stored[start:start + 3].tolist() == [0, 2, 1]
+
+
+def test_empty_index_round_trips(tmp_path):
+    path = str(tmp_path / "index.npz")
+
+    LoanwordIndex().save(path)
+
+    assert LoanwordIndex.load(path).n_docs == 0
+
+
+def test_append_skips_indexed_and_repeated_articles():
+    index = LoanwordIndex.from_frame(CORPUS)
+
+    added = index.append(pd.DataFrame({
+        "article_id": [101, 105, 105],
+        "loanwords": [["cloud"], ["cloud", "team"], ["cloud"]],
+    }))
+
+    assert added == 1
+    assert index.n_docs == 4
+    assert index.articles_with("cloud").tolist() == [105]
+    assert index.articles_with("team").tolist() == [103, 105]
+    assert index.years[-1] == -1
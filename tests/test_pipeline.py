@@ -0,0 +1,54 @@
+from contextlib import nullcontext
+
+import pandas as pd
+import pytest
+
+import llm_helpers
+from llm_helpers import LLM_ERROR
+from orchestrator import Pipeline, Stage
+from stages import llm_enrichment_stage, loanword_cleaning_stage
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """A fake LLM whose answer for "Text 2" fails until `healthy` is set."""
+    state = {"healthy": False}
+
+    def failing(text: str) -> bool:
+        return "2" in text and not state["healthy"]
+
+    monkeypatch.setattr(llm_helpers, "ENRICHMENT_TASKS", {
+        "classify_topic": ("topic", lambda text: LLM_ERROR if failing(text) else "tech")})
+    monkeypatch.setattr(llm_helpers, "detect_unwanted_loanwords",
+                        lambda text, loanwords: [LLM_ERROR] if failing(text) else ["update"])
+    monkeypatch.setattr(llm_helpers, "keep_models_resident", lambda models: nullcontext())
+    return state
+
+
+def pipeline(tmp_path, stage) -> Pipeline:
+    source = tmp_path / "accepted.parquet"
+    pd.DataFrame({"article_id": [1, 2, 3], "text": ["Text 1", "Text 2", "Text 3"],
+                  "loanwords": [["update", "team"]] * 3}).to_parquet(source)
+    return Pipeline({"accepted": str(source)}, [stage], workdir=str(tmp_path / "work"))
+
+
+@pytest.mark.parametrize("stage", [
+    Stage("llm_enrichment", llm_enrichment_stage, ["accepted"], fingerprint_columns=["text"],
+          retry_missing=True),
+    Stage("loanword_cleaning", loanword_cleaning_stage, ["accepted"], fingerprint_columns=["text", "loanwords"],
+          retry_missing=True),
+])
+def test_failed_llm_calls_are_not_stored_and_are_retried(tmp_path, llm, stage):
+    runner = pipeline(tmp_path, stage)
+
+    runner.run_stage(stage.name)
+    first = runner.read(stage.name)
+    assert first["article_id"].tolist() == [1, 3]
+    assert not first.drop(columns="article_id").astype(str).eq(LLM_ERROR).any().any()
+
+    llm["healthy"] = True
+    report = runner.run_stage(stage.name)
+
+    assert report["recomputed"] == 1
+    assert runner.read(stage.name)["article_id"].tolist() == [1, 2, 3]
+    assert runner.run_stage(stage.name)["recomputed"] == 0
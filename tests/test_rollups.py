@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from rollups import build_rollups, compute_rollups, load_rollups, slice_rollups, update_rollups
+
+CORPUS = pd.DataFrame({
+    "article_id": [1, 2, 3, 4],
+    "year": [2020, 2020, 2021, None],
+    "topic": ["tech", "tech", "politik", "tech"],
+    "sentiment": ["positive", "negative", "neutral", "positive"],
+    "source_site": ["businessinsider.de"] * 4,
+    "loanword_density": [0.02, 0.04, 0.01, 0.03],
+    "loanword_count": [2, 4, 1, 3],
+    "word_count": [100, 100, 100, 100],
+})
+
+
+def canonical(rollups: pd.DataFrame) -> pd.DataFrame:
+    return rollups.sort_values(["year", "topic", "sentiment", "source_site"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "rollups.parquet")
+    build_rollups(CORPUS, path)
+    return path
+
+
+def test_slice_matches_a_groupby_on_the_corpus():
+    stats = slice_rollups(compute_rollups(CORPUS), "topic").set_index("topic")
+    expected = CORPUS.groupby("topic")["loanword_density"].agg(["mean", "count", "std"])
+
+    pd.testing.assert_series_equal(stats["mean"], expected["mean"], check_names=False)
+    assert stats["count"].tolist() == expected["count"].tolist()
+    assert stats.loc["tech", "std"] == pytest.approx(expected.loc["tech", "std"])
+    assert stats.loc["tech", "pooled_density"] == pytest.approx(9 / 300)
+
+
+def test_update_equals_a_rebuild(path):
+    changed = pd.DataFrame({"article_id": [2], "sentiment": ["positive"]})
+
+    updated = update_rollups(added=changed, path=path)
+
+    corpus = CORPUS.assign(sentiment=["positive", "positive", "neutral", "positive"])
+    pd.testing.assert_frame_equal(canonical(updated), canonical(compute_rollups(corpus)), check_dtype=False)
+
+
+def test_update_is_idempotent(path):
+    changed = pd.DataFrame({"article_id": [1, 3], "topic": ["politik", "tech"]})
+
+    once = update_rollups(added=changed, path=path)
+    twice = update_rollups(added=changed, path=path)
+
+    pd.testing.assert_frame_equal(canonical(once), canonical(twice))
+    assert once["count"].sum() == len(CORPUS)
+
+
+def test_removed_articles_leave_their_group(path):
+    updated = update_rollups(removed=pd.DataFrame({"article_id": [3]}), path=path)
+
+    assert "politik" not in set(updated["topic"])
+    assert updated["count"].sum() == len(CORPUS) - 1
+
+
+def test_partial_entry_counts_once_its_density_is_known(path):
+    update_rollups(added=pd.DataFrame({"article_id": [5], "topic": ["tech"]}), path=path)
+    assert load_rollups(path)["count"].sum() == len(CORPUS)
+
+    updated = update_rollups(added=pd.DataFrame({
+        "article_id": [5], "year": [2021], "sentiment": ["neutral"], "source_site": ["businessinsider.de"],
+        "loanword_density": [0.05], "loanword_count": [5], "word_count": [100]}), path=path)
+
+    row = updated[(updated["year"] == 2021) & (updated["topic"] == "tech")]
+    assert row["count"].tolist() == [1]
+    assert row["sum"].tolist() == [pytest.approx(0.05)]
+
+
+def test_update_without_stored_rollups_does_nothing(tmp_path):
+    path = str(tmp_path / "missing.parquet")
+
+    assert update_rollups(added=pd.DataFrame({"article_id": [1], "topic": ["tech"]}), path=path) is None
+    assert load_rollups(path) is None
+
+
+def test_update_needs_article_ids(path):
+    with pytest.raises(ValueError):
+        update_rollups(added=pd.DataFrame({"topic": ["tech"]}), path=path)
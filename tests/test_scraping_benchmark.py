@@ -0,0 +1,33 @@
+from scraping_benchmark import check_regressions
+
+
+def run(**sections):
+    return {"timestamp": "2026-01-01T00:00:00", **sections}
+
+
+def test_slowdowns_beyond_the_threshold_are_reported():
+    history = [run(parse={"html.parser_ms": 10.0}, scrape={"articles_per_sec": 100.0}),
+               run(parse={"html.parser_ms": 12.0}, scrape={"articles_per_sec": 100.0}),
+               run(parse={"html.parser_ms": 11.0}, scrape={"articles_per_sec": 100.0}),
+               run(parse={"html.parser_ms": 15.0}, scrape={"articles_per_sec": 80.0})]
+
+    regressions = check_regressions(history, threshold=0.2)
+
+    assert [r["metric"] for r in regressions] == ["parse.html.parser_ms", "scrape.articles_per_sec"]
+    # Baseline is the median of the previous runs
+    assert regressions[0]["baseline"] == 11.0
+    assert regressions[0]["change"] == round(15 / 11 - 1, 3)
+    assert regressions[1]["change"] == 0.25
+
+
+def test_speedups_small_changes_and_counts_are_not_regressions():
+    history = [run(parse={"html.parser_ms": 10.0, "articles": 200}, scrape={"articles_per_sec": 100.0}),
+               run(parse={"html.parser_ms": 5.0, "articles": 400}, scrape={"articles_per_sec": 90.0})]
+
+    assert check_regressions(history, threshold=0.2) == []
+
+
+def test_new_metrics_and_single_runs_are_skipped():
+    assert check_regressions([run(parse={"html.parser_ms": 10.0})]) == []
+    history = [run(parse={"html.parser_ms": 10.0}), run(parse={"html.parser_ms": 10.0, "lxml_ms": 50.0})]
+    assert check_regressions(history) == []
@@ -0,0 +1,61 @@
+import pytest
+
+from url_canon import URLCanonicaliser, normalise_url
+
+BI = "https://www.businessinsider.de"
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Scheme, host case, default port, fragment
+    ("http://WWW.BusinessInsider.de:443/tech/a.html#comments", f"{BI}/tech/a.html"),
+    # AMP variants map to the regular page
+    (f"{BI}/tech/a.amp.html", f"{BI}/tech/a.html"),
+    ("https://amp.businessinsider.de/tech/a.html", f"{BI}/tech/a.html"),
+    ("https://www-businessinsider-de.cdn.ampproject.org/c/s/www.businessinsider.de/tech/a.html",
+     f"{BI}/tech/a.html"),
+    # Global tracking keys go, the rest is sorted
+    (f"{BI}/tech/a.html?utm_source=x&b=2&fbclid=1&a=1", f"{BI}/tech/a.html?a=1&b=2"),
+    # Duplicate slashes go, a trailing slash is kept
+    (f"{BI}//tech//a/", f"{BI}/tech/a/"),
+    (f"{BI}/tech/a/amp/", f"{BI}/tech/a/"),
+    # Non-ASCII is percent-encoded, escapes upper-cased
+    (f"{BI}/tech/m%c3%bcnchen-ä.html", f"{BI}/tech/m%C3%BCnchen-%C3%A4.html"),
+])
+def test_normalise_url(url, expected):
+    assert normalise_url(url) == expected
+
+
+def test_site_specific_params_are_only_stripped_on_registered_sites():
+    assert normalise_url(f"{BI}/tech/a.html?ref=home&share=1") == f"{BI}/tech/a.html"
+    assert normalise_url("https://example.com/page?ref=abc&share=1") == "https://example.com/page?ref=abc&share=1"
+
+
+def test_unknown_hosts_keep_their_scheme():
+    assert normalise_url("http://example.com/page") == "http://example.com/page"
+
+
+def test_normalise_url_is_idempotent():
+    url = normalise_url("http://amp.businessinsider.de/tech//a.amp.html?utm_medium=x&z=1&a=2")
+
+    assert normalise_url(url) == url
+
+
+def test_dedupe_keeps_first_seen_order_and_skips_done_urls():
+    canonicaliser = URLCanonicaliser()
+    urls = [f"{BI}/b.html", f"{BI}/a.html?utm_source=x", "http://www.businessinsider.de/b.html",
+            f"{BI}/c.html", f"{BI}/a.amp.html"]
+
+    unique = canonicaliser.dedupe(urls, done_urls=[f"{BI}/c.html#top"])
+
+    assert unique == [f"{BI}/b.html", f"{BI}/a.html"]
+
+
+def test_learned_canonicals_resolve_and_stay_on_site():
+    canonicaliser = URLCanonicaliser()
+
+    assert canonicaliser.learn(f"{BI}/print/a.html", f"{BI}/tech/a.html")
+    assert not canonicaliser.learn(f"{BI}/print/a.html", f"{BI}/tech/a.html")
+    # Syndication canonicals to another outlet are not followed
+    assert not canonicaliser.learn(f"{BI}/tech/b.html", "https://www.spiegel.de/b-a-123")
+    assert canonicaliser.canonicalise(f"{BI}/print/a.html?utm_source=x") == f"{BI}/tech/a.html"
+    assert canonicaliser.dedupe([f"{BI}/tech/a.html", f"{BI}/print/a.html"]) == [f"{BI}/tech/a.html"]
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+import url_queue
+from url_queue import MemoryURLQueue, SQLiteURLQueue
+
+URLS = [f"https://www.businessinsider.de/tech/a-{i}.html" for i in range(5)]
+
+
+class Clock:
+    """Stands in for the `time` module, so leases expire without sleeping."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(url_queue, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path, clock):
+    if request.param == "memory":
+        queue = MemoryURLQueue(lease_seconds=60, max_attempts=2)
+    else:
+        queue = SQLiteURLQueue(str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=2)
+    queue.add(URLS)
+    return queue
+
+
+def test_add_ignores_known_urls(queue):
+    assert queue.add(URLS[:2] + ["https://www.businessinsider.de/tech/new.html"]) == 1
+    assert queue.stats()["pending"] == len(URLS) + 1
+
+
+def test_a_url_is_leased_to_one_worker_at_a_time(queue):
+    first = queue.claim("w1", n=3)
+    second = queue.claim("w2", n=3)
+
+    assert len(first) == 3
+    assert second == [u for u in URLS if u not in first]
+    assert queue.claim("w3") == []
+    assert queue.stats()["leased"] == len(URLS)
+
+
+def test_expired_leases_are_handed_out_again(queue, clock):
+    claimed = queue.claim("w1", n=len(URLS))
+
+    clock.now += 61
+    assert sorted(queue.claim("w2", n=len(URLS))) == sorted(claimed)
+
+
+def test_extend_keeps_the_lease_alive(queue, clock):
+    claimed = queue.claim("w1", n=2)
+
+    clock.now += 50
+    assert queue.extend("w1", claimed) == 2
+    assert queue.extend("w2", claimed) == 0
+    clock.now += 50
+    assert queue.claim("w2", n=2) == [u for u in URLS if u not in claimed][:2]
+
+
+def test_expired_leases_fail_after_max_attempts(queue, clock):
+    queue.claim("w1", n=len(URLS))
+    clock.now += 61
+    assert len(queue.claim("w2", n=len(URLS))) == len(URLS)
+    clock.now += 61
+
+    assert queue.claim("w3", n=len(URLS)) == []
+    failures = queue.failures()
+    assert sorted(failures["url"]) == sorted(URLS)
+    assert set(failures["last_error"]) == {"lease expired"}
+
+
+def test_fail_retries_until_max_attempts(queue):
+    url = queue.claim("w1", n=1)[0]
+    assert queue.fail("w1", url, "timeout") == "pending"
+
+    assert url in queue.claim("w1", n=len(URLS))
+    assert queue.fail("w1", url, "timeout") == "failed"
+    assert queue.stats()["failed"] == 1
+
+
+def test_complete_wins_over_a_late_failure(queue, clock):
+    url = queue.claim("w1", n=1)[0]
+    clock.now += 61
+    queue.claim("w2", n=1)
+
+    assert queue.complete("w1", [url]) == 1
+    assert queue.fail("w2", url, "timeout") == "done"
+    assert queue.complete("w2", [url]) == 0
+    assert queue.stats()["done"] == 1
+
+
+def test_release_does_not_count_the_attempt(queue):
+    url = queue.claim("w1", n=1)[0]
+    assert queue.release("w1") == 1
+
+    # Two more failures are still allowed (max_attempts=2)
+    assert url in queue.claim("w2", n=len(URLS))
+    assert queue.fail("w2", url, "timeout") == "pending"
+
+
+def test_concurrent_claims_never_share_a_url(tmp_path):
+    queue = SQLiteURLQueue(str(tmp_path / "queue.sqlite"))
+    urls = [f"https://www.businessinsider.de/tech/b-{i}.html" for i in range(200)]
+    queue.add(urls)
+    claimed = []
+    lock = threading.Lock()
+
+    def work(worker):
+        while batch := queue.claim(worker, n=7):
+            with lock:
+                claimed.extend(batch)
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(urls)